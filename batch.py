@@ -0,0 +1,225 @@
+"""Headless batch rendering of a manifest of inscriptions.
+
+    python batch.py plaques.jsonl --out-dir out --workers 16
+
+The manifest is JSONL or CSV with the fields glyphs, direction, shen and
+filename (seed and encoder are optional; a .webp filename implies the webp
+encoder). Jobs are rendered across a process pool whose workers load the
+font once, and each worker encodes and writes one image on a helper thread
+while it renders the next. Failed jobs are reported and the run carries on.
+With --cache-dir, workers share a content-addressed render cache, so rows
+repeated within or across runs are copied instead of re-rendered. With
+--profile, every job is timed per pipeline stage, one JSON line per job goes
+to the given file and the report gains an aggregate.
+"""
+import argparse
+import contextvars
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+
+from encoding import encode_image
+from glyph_cache import get_glyph_cache
+from glyph_input import PROFILE_SUFFIXES, output_filename
+from inscription import PADDING, SIZE, load_font, render_inscription
+from profiling import Profiler, aggregate, stage
+from render_cache import RenderCache
+
+# --- Manifest ---
+
+def parse_direction(value) -> str:
+    """Accept V/H as at the prompt, or the full direction name."""
+    value = str(value or "H").strip().lower()
+    if value in ("v", "vertical"):
+        return "vertical"
+    if value in ("h", "horizontal"):
+        return "horizontal"
+    raise ValueError(f"Unknown direction '{value}', expected V or H.")
+
+def parse_flag(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in ("1", "y", "yes", "true")
+
+def read_manifest(path):
+    """Yield (line_number, row) for every job in a JSONL or CSV manifest."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            for i, row in enumerate(csv.DictReader(f), start=2):
+                yield i, row
+        else:
+            for i, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                # Report a bad row as a failed job instead of aborting the run
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield i, {"_invalid": str(e)}
+                    continue
+                if not isinstance(row, dict):
+                    row = {"_invalid": f"expected a JSON object, got {type(row).__name__}"}
+                yield i, row
+
+# --- Workers ---
+
+_worker = {}
+
+def _init_worker(size, atlas=None, cache_dir=None, profile_memory=False):
+    # Warm the font cache so every job in this process reuses the handle
+    load_font(size)
+    if atlas:
+        get_glyph_cache().load_atlas(atlas)
+    _worker["cache"] = RenderCache(cache_dir) if cache_dir else None
+    _worker["profile_memory"] = profile_memory
+    _worker["writer"] = ThreadPoolExecutor(max_workers=1)  # encodes while the next job renders
+
+def _render_row(row, out_dir, size, padding, encoder):
+    """Validate and render one row. Returns (output file, write) where write() encodes and saves it."""
+    if "_invalid" in row:
+        raise ValueError(f"Invalid manifest row: {row['_invalid']}")
+    name, encoder = output_filename(str(row.get("filename", "")), row.get("encoder") or encoder)
+    seed = row.get("seed")
+    args = (row["glyphs"], parse_direction(row.get("direction")), size, padding, parse_flag(row.get("shen")),
+            int(seed) if seed not in (None, "") else None)
+    output_file = os.path.join(out_dir, name)
+    cache = _worker.get("cache")
+    if cache is not None:
+        data = cache.render(*args, encoder=encoder)
+
+        def write():
+            with stage("write"), open(output_file, "wb") as f:
+                f.write(data)
+    else:
+        img = render_inscription(*args)
+
+        def write():
+            encode_image(img, output_file, encoder)
+    return output_file, write
+
+def render_chunk(jobs):
+    """Render a list of jobs. Returns [(line, filename, error, profile report or None)] in order.
+
+    Each image is handed to the worker's writer thread as soon as it is
+    rendered; Pillow's encoders and file writes release the GIL, so encoding
+    overlaps the next render.
+    """
+    writer = _worker.get("writer")
+    started = []
+    for line, row, out_dir, size, padding, encoder, profile in jobs:
+        prof = Profiler(memory=_worker.get("profile_memory", False), label=line) if profile else None
+        filename, future, error = row.get("filename", ""), None, None
+        with prof or nullcontext():
+            try:
+                filename, write = _render_row(row, out_dir, size, padding, encoder)
+                if writer is None:
+                    write()
+                else:
+                    # Run under a copy of this context so the write is timed by this job's profiler
+                    future = writer.submit(contextvars.copy_context().run, write)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        started.append((line, filename, error, future, prof))
+
+    results = []
+    for line, filename, error, future, prof in started:
+        if future is not None:
+            try:
+                future.result()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        results.append((line, filename, error, prof.report() if prof else None))
+    return results
+
+def render_job(job):
+    """Render and save one job tuple. Returns (line, filename, error, profile report or None)."""
+    return render_chunk([job])[0]
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def run_batch(manifest, out_dir=".", workers=None, size=SIZE, padding=PADDING, chunksize=4, atlas=None,
+              cache_dir=None, profile=None, profile_memory=False, encoder=None):
+    """Render every job in the manifest and return a report dict.
+
+    profile may be a path (or open text file) that receives one JSON line per
+    job. encoder names the encoding.py profile for rows that don't set one
+    (default: from each filename's suffix).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = ((line, row, out_dir, size, padding, encoder, bool(profile)) for line, row in read_manifest(manifest))
+    failures = []
+    profiles = []
+    done = 0
+    start = time.perf_counter()
+    log = open(profile, "w", encoding="utf-8") if isinstance(profile, str) else profile
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(size, atlas, cache_dir, profile_memory)) as pool:
+            for chunk in pool.map(render_chunk, chunked(jobs, chunksize)):
+                for line, filename, error, report in chunk:
+                    done += 1
+                    if error:
+                        failures.append({"line": line, "filename": filename, "error": error})
+                    if report is not None:
+                        profiles.append(report)
+                        log.write(json.dumps(report, ensure_ascii=False, separators=(",", ":")) + "\n")
+    finally:
+        if log is not profile:
+            log.close()
+
+    elapsed = time.perf_counter() - start
+    report = {
+        "jobs": done,
+        "rendered": done - len(failures),
+        "failed": len(failures),
+        "seconds": round(elapsed, 3),
+        "images_per_second": round(done / elapsed, 2) if elapsed else 0.0,
+        "failures": failures,
+    }
+    if profile:
+        report["profile"] = aggregate(profiles)
+    return report
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a manifest of inscriptions without prompts.")
+    parser.add_argument("manifest", help="JSONL or CSV file with glyphs, direction, shen, filename")
+    parser.add_argument("--out-dir", default=".", help="directory the images are written to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--size", type=int, default=SIZE, help="glyph height in pixels")
+    parser.add_argument("--padding", type=int, default=PADDING, help="space around glyphs")
+    parser.add_argument("--chunksize", type=int, default=4, help="jobs handed to a worker at a time")
+    parser.add_argument("--encoder", choices=tuple(PROFILE_SUFFIXES),
+                        help="encoder profile for rows without one (default: from the filename suffix)")
+    parser.add_argument("--atlas", help="glyph mask atlas (.npz) preloaded by every worker")
+    parser.add_argument("--cache-dir", help="render cache directory shared by the workers")
+    parser.add_argument("--profile", help="time every job per stage and write one JSON line per job here")
+    parser.add_argument("--profile-memory", action="store_true", help="also trace peak memory (slower)")
+    parser.add_argument("--report", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_batch(args.manifest, args.out_dir, args.workers, args.size, args.padding, args.chunksize,
+                       args.atlas, args.cache_dir, args.profile, args.profile_memory,
+                       args.encoder)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    print(f"Rendered {report['rendered']}/{report['jobs']} in {report['seconds']}s "
+          f"({report['images_per_second']} images/s), {report['failed']} failed", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
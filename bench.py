@@ -0,0 +1,276 @@
+"""Benchmarks for every rendering stage and for end-to-end renders.
+
+    python bench.py --suite quick --save baseline.json
+    python bench.py --suite quick --compare baseline.json
+
+Everything runs offline against the bundled font with fixed glyphs and
+seeds. Each case is timed over several repeats (best and median wall time,
+throughput in megapixels per second), then run once more under tracemalloc
+for its peak memory. Cases that render nothing, like the layout queries, are
+reported as latency only. --compare fails (exit 1) when a case's throughput
+drops (or latency grows) or its peak memory grows past the thresholds.
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from cartouche import shen_mask
+from carving import carve, coverage_mask
+from encoding import PROFILES, encode_image
+from glyph_cache import GlyphMaskCache
+from height_map import apply_depth_shading, height_map, render_height_mapped
+from inscription import (BG, PADDING, SIZE, carve_colors, layout_glyphs, plan_inscription, region_coverage,
+                         render_inscription)
+from metrics import glyph_layout
+from profiling import Profiler
+from stream import stream_inscription
+from texture import sandstone_strip, sandstone_texture, sandstone_tile
+
+# --- Parameters ---
+SAMPLE = "𓏙𓋹𓎃𓊽𓃀𓂋𓈖𓇳𓆣𓅓𓄿𓀀𓁹𓂝𓃭𓄂𓅱𓆑𓇋𓈎"  # cycled to build inscriptions of any length
+REPEATS = 5                  # timed runs per case (fewer for slow cases, see MIN_SECONDS)
+MIN_SECONDS = 2.0            # stop repeating a case once this much time is spent on it
+TIME_THRESHOLD = 0.15        # fail if throughput drops by more than this fraction
+MEMORY_THRESHOLD = 0.20      # fail if peak memory grows by more than this fraction
+
+def sample_glyphs(n):
+    return [SAMPLE[i % len(SAMPLE)] for i in range(n)]
+
+class _Discard(io.RawIOBase):
+    """A file that throws away what is written, so streamed renders measure rendering and encoding only."""
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return len(data)
+
+# --- Cases ---
+# Each case is (name, run, pixels): run() does the timed work and pixels is
+# the canvas size used for throughput, or None for latency-only cases.
+
+def stage_cases(size):
+    """Micro-benchmarks of each pipeline stage on a short inscription at this size."""
+    glyphs = sample_glyphs(8)
+    plan = plan_inscription(glyphs, size=size, shen=True)
+    region = (0, 0, plan.W, plan.H)
+    pixels = plan.W * plan.H
+    shadow, highlight, _ = carve_colors(BG)
+
+    def rasterize():
+        cache = GlyphMaskCache()
+        for g in glyphs:
+            cache.get(g, size)
+
+    def texture_cold():
+        sandstone_tile.cache_clear()
+        sandstone_strip.cache_clear()
+        sandstone_texture((plan.W, plan.H), BG, region=region)
+
+    def layout():
+        layout_glyphs(glyphs, [bbox for _, bbox in plan.masks], "horizontal", PADDING)
+
+    def coverage():
+        coverage_mask(plan.placements, plan.masks, region)
+
+    def shen():
+        shen_mask.cache_clear()
+        shen_mask(plan.direction, plan.W, plan.H, plan.line_width, plan.padding)
+
+    canvas = sandstone_texture((plan.W, plan.H), BG)
+    mask = region_coverage(plan, region)
+
+    def carving():
+        carve(canvas.copy(), mask, shadow, highlight, BG)
+
+    height = height_map(plan)
+
+    def shading():
+        apply_depth_shading(canvas, height)
+
+    image = render_inscription(glyphs, size=size, shen=True)
+
+    return [
+        (f"stage/rasterize/size={size}", rasterize, pixels),
+        (f"stage/layout/size={size}", layout, pixels),
+        (f"stage/texture_cold/size={size}", texture_cold, pixels),
+        (f"stage/texture/size={size}", lambda: sandstone_texture((plan.W, plan.H), BG, region=region), pixels),
+        (f"stage/coverage/size={size}", coverage, pixels),
+        (f"stage/shen_ring/size={size}", shen, pixels),
+        (f"stage/carve/size={size}", carving, pixels),
+        (f"stage/height_map/size={size}", lambda: height_map(plan), pixels),
+        (f"stage/depth_shading/size={size}", shading, pixels),
+    ] + [
+        (f"stage/encode_{profile}/size={size}", lambda profile=profile: encode_image(image, io.BytesIO(), profile),
+         pixels)
+        for profile in PROFILES
+    ]
+
+def render_case(count, size, direction, shen):
+    glyphs = sample_glyphs(count)
+    plan = plan_inscription(glyphs, direction, size, shen=shen)
+    name = f"render/{direction[0]}/glyphs={count}/size={size}/shen={int(shen)}"
+    return name, lambda: render_inscription(glyphs, direction, size, shen=shen, output="bytes"), plan.W * plan.H
+
+def stream_case(count, size, direction, shen):
+    glyphs = sample_glyphs(count)
+    plan = plan_inscription(glyphs, direction, size, shen=shen)
+    name = f"stream/{direction[0]}/glyphs={count}/size={size}/shen={int(shen)}"
+    return name, lambda: stream_inscription(glyphs, _Discard(), direction, size, shen=shen), plan.W * plan.H
+
+def height_case(count, size, direction):
+    glyphs = sample_glyphs(count)
+    plan = plan_inscription(glyphs, direction, size)
+    name = f"height/{direction[0]}/glyphs={count}/size={size}"
+    return name, lambda: render_height_mapped(glyphs, direction, size, output="bytes"), plan.W * plan.H
+
+def query_case(count, size):
+    """A sweep of editor clicks and tile-sized rect queries along a long layout; latency only."""
+    layout = glyph_layout(sample_glyphs(count), "horizontal", size, shen=True)
+    xs = np.linspace(0, layout.W - 1, 1000).astype(int).tolist()
+
+    def run():
+        for x in xs:
+            layout.glyph_at(x, layout.H // 2)
+            layout.query((x, 0, x + 256, 256))
+
+    return f"query/glyphs={count}/size={size}", run, None
+
+def build_suite(suite):
+    """Return the list of (name, run, pixels) cases for a suite name; pixels is None for latency-only cases."""
+    cases = []
+    sizes = (64, SIZE) if suite == "quick" else (64, SIZE, 1024)
+    for size in sizes:
+        cases += stage_cases(size)
+    for direction in ("horizontal", "vertical"):
+        for shen in (False, True):
+            counts = (1, 10) if suite == "quick" else (1, 10, 100)
+            for count in counts:
+                for size in sizes:
+                    cases.append(render_case(count, size, direction, shen))
+        cases.append(height_case(10, SIZE, direction))
+        if suite == "full":
+            cases.append(height_case(10, 1024, direction))
+    # Long friezes go through the band streamer, as they would in use
+    counts = (1000,) if suite == "quick" else (1000, 5000)
+    for count in counts:
+        cases.append(stream_case(count, 64, "horizontal", True))
+    if suite == "full":
+        cases.append(stream_case(1000, SIZE, "horizontal", True))
+        cases.append(stream_case(1000, 64, "vertical", True))
+    for count in (20000,) if suite == "quick" else (20000, 100000):
+        cases.append(query_case(count, 64))
+    return cases
+
+# --- Measurement ---
+
+def measure(run, pixels, repeats=REPEATS):
+    """Time run() and trace its peak memory. Returns a result dict; no throughput when pixels is None."""
+    run()  # warm caches and imports, as a long-lived process would be
+    times = []
+    spent = time.perf_counter()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - spent > MIN_SECONDS:
+            break
+
+    tracemalloc.start()
+    try:
+        with Profiler() as prof:
+            run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "repeats": len(times),
+        "best_ms": round(best * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "megapixels_per_second": round(pixels / best / 1e6, 3) if pixels is not None else None,
+        "peak_bytes": peak,
+        "stages_ms": {name: entry["wall_ms"] for name, entry in prof.report()["stages"].items()},
+    }
+
+def run_suite(suite="quick", match=None, repeats=REPEATS, out=sys.stderr):
+    results = {}
+    for name, run, pixels in build_suite(suite):
+        if match and match not in name:
+            continue
+        results[name] = measure(run, pixels, repeats)
+        r = results[name]
+        speed = f"{r['megapixels_per_second']:9.2f} MP/s" if r["megapixels_per_second"] is not None else " " * 14
+        print(f"{name:48s} {r['best_ms']:10.2f} ms {speed} {r['peak_bytes'] / 2**20:8.1f} MiB", file=out)
+    return {
+        "suite": suite,
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "platform": platform.platform(), "processor": platform.processor()},
+        "results": results,
+    }
+
+def compare(current, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """Return a list of regression messages (empty when nothing regressed)."""
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        if base.get("megapixels_per_second") is None or now.get("megapixels_per_second") is None:
+            # Latency-only case: compare best times, the same threshold read as a speed drop
+            speed = base["best_ms"] / now["best_ms"] if now["best_ms"] else 1
+            if speed < 1 - time_threshold:
+                regressions.append(f"{name}: latency {now['best_ms']} ms vs {base['best_ms']} ms "
+                                   f"({now['best_ms'] / base['best_ms'] - 1:+.0%})")
+        else:
+            speed = now["megapixels_per_second"] / base["megapixels_per_second"] if base["megapixels_per_second"] else 1
+            if speed < 1 - time_threshold:
+                regressions.append(f"{name}: throughput {now['megapixels_per_second']} MP/s vs "
+                                   f"{base['megapixels_per_second']} MP/s ({speed - 1:+.0%})")
+        if base["peak_bytes"] and now["peak_bytes"] > base["peak_bytes"] * (1 + memory_threshold):
+            growth = now["peak_bytes"] / base["peak_bytes"] - 1
+            regressions.append(f"{name}: peak memory {now['peak_bytes']} B vs {base['peak_bytes']} B "
+                               f"({growth:+.0%})")
+    return regressions
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the inscription renderer.")
+    parser.add_argument("--suite", choices=("quick", "full"), default="quick",
+                        help="quick: sizes 64/240 and up to 1000 glyphs; full: up to size 1024 and 5000 glyphs")
+    parser.add_argument("--match", help="only run cases whose name contains this")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed runs per case")
+    parser.add_argument("--save", help="write the results here as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD,
+                        help="allowed throughput drop as a fraction")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD,
+                        help="allowed peak memory growth as a fraction")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.suite, args.match, args.repeats)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.time_threshold, args.memory_threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
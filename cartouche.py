@@ -0,0 +1,86 @@
+"""Shen ring (cartouche) geometry and signed-distance rasterizer.
+
+The ring is a rounded rectangle with a rounded-rectangle hole, plus the
+crossbar tied across one end. It is evaluated as a signed-distance field
+with numpy at the target resolution, giving an anti-aliased coverage mask
+that the carving compositor treats like any glyph.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# --- Parameters ---
+MAX_CACHED_PIXELS = 1 << 24   # larger canvases are never memoized whole
+
+# --- Geometry ---
+
+def shen_geometry(direction, W, H, line_width, padding):
+    """Return the ring as plain shapes in canvas pixels.
+
+    outer and inner are (x0, y0, x1, y1, radius) rounded rectangles, bar is an
+    (x0, y0, x1, y1) box. The ring sits in the middle of the padding around
+    the glyphs; the extra padding already in W or H leaves room on the main
+    axis for the round ends and the crossbar. The bar is tied across the hole
+    one line width in from the right end (the bottom when vertical), and is
+    clipped to the outer shape where it meets the ring.
+    """
+    if direction not in ("horizontal", "vertical"):
+        raise ValueError("direction must be 'horizontal' or 'vertical'")
+    inset = max((padding - line_width) // 2, 0)
+    x0, y0, x1, y1 = inset, inset, W - inset, H - inset
+
+    # Corners round off a quarter of the short side, so the ends clear the first and last glyph
+    radius = min(x1 - x0, y1 - y0) // 4
+    if direction == "horizontal":
+        bar = (x1 - 3 * line_width, y0, x1 - 2 * line_width, y1)
+    else:
+        bar = (x0, y1 - 3 * line_width, x1, y1 - 2 * line_width)
+
+    outer = (x0, y0, x1, y1, radius)
+    inner = (x0 + line_width, y0 + line_width, x1 - line_width, y1 - line_width, max(radius - line_width, 0))
+    return {"outer": outer, "inner": inner, "bar": bar}
+
+# --- Signed distance ---
+
+def rounded_box_sdf(px, py, box):
+    """Signed distance from points to a rounded rectangle (negative inside)."""
+    x0, y0, x1, y1, radius = box
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    qx = np.abs(px - cx) - ((x1 - x0) / 2 - radius)
+    qy = np.abs(py - cy) - ((y1 - y0) / 2 - radius)
+    outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+    return outside + np.minimum(np.maximum(qx, qy), 0) - radius
+
+def shen_sdf(geometry, region):
+    """Signed distance to the whole shen (ring plus crossbar) at pixel centres of region."""
+    x0, y0, x1, y1 = region
+    px = np.arange(x0, x1, dtype=np.float32)[None, :] + 0.5
+    py = np.arange(y0, y1, dtype=np.float32)[:, None] + 0.5
+    outer = rounded_box_sdf(px, py, geometry["outer"])
+    ring = np.maximum(outer, -rounded_box_sdf(px, py, geometry["inner"]))
+    bar = np.maximum(rounded_box_sdf(px, py, (*geometry["bar"], 0)), outer)
+    return np.minimum(ring, bar)
+
+def shen_region_mask(direction, W, H, line_width, padding, region):
+    """Return the uint8 shen coverage for region=(x0, y0, x1, y1) of the canvas.
+
+    Only a whole-canvas region uses the memoized mask; bands and tiles
+    evaluate the field over their own pixels, so a streamed render never
+    holds a full-canvas mask.
+    """
+    if tuple(region) == (0, 0, W, H) and W * H <= MAX_CACHED_PIXELS:
+        return shen_mask(direction, W, H, line_width, padding)
+    geometry = shen_geometry(direction, W, H, line_width, padding)
+    return sdf_coverage(shen_sdf(geometry, region))
+
+def sdf_coverage(distance):
+    """Anti-aliased 0-255 coverage: a pixel is half covered where the distance crosses 0."""
+    return np.rint(np.clip(0.5 - distance, 0, 1) * 255).astype(np.uint8)
+
+@lru_cache(maxsize=32)
+def shen_mask(direction, W, H, line_width, padding):
+    """Return the memoized full-canvas uint8 shen coverage mask."""
+    geometry = shen_geometry(direction, W, H, line_width, padding)
+    mask = sdf_coverage(shen_sdf(geometry, (0, 0, W, H)))
+    mask.setflags(write=False)
+    return mask
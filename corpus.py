@@ -0,0 +1,232 @@
+"""Streaming parser and page renderer for large transliterated corpora.
+
+    python corpus.py book.txt --out-dir pages --per-page 120 --shen
+
+A corpus is read line by line and may mix pasted glyphs, Unicode hex codes
+(13000, 1340D) and Manuel de Codage sign codes (A1, Aa15, N35, G17-Z1:D21).
+MdC joiners and brackets are treated as separators, so structure is read as
+a plain sign sequence. Bad tokens (and undecodable bytes, as U+FFFD) are
+recorded with their line and column and parsing carries on. Glyphs come out
+in chunks, so a page is laid out and rendered while the rest of the file is
+still unread.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+from glyph_input import GLYPH_RANGE, PROFILE_SUFFIXES, output_filename
+
+# --- Parameters ---
+CHUNK_GLYPHS = 120           # glyphs per chunk (one rendered page)
+MAX_ERRORS = 1000            # errors kept; later ones are only counted
+SEPARATORS = " \t\r\n-:*&()!<>^./#"  # whitespace plus MdC joiners, brackets and shading marks
+
+_HEX_TOKEN = re.compile(r"[0-9A-Fa-f]{4,6}")
+_TOKENS = re.compile(f"[^{re.escape(SEPARATORS)}]+")
+# Deletes every glyph and separator: a line that translates to "" needs no tokenizing
+_PLAIN_LINE = str.maketrans(dict.fromkeys([*GLYPH_RANGE, *map(ord, SEPARATORS)]))
+
+class CorpusError(NamedTuple):
+    line: int       # 1-based
+    column: int     # 1-based, in characters
+    text: str       # the rejected token
+    message: str
+
+# --- Sign codes ---
+
+def mdc_code(name):
+    """MdC code for a Unicode sign name's Gardiner number: A001 -> A1, AA015 -> Aa15, A014A -> A14a."""
+    m = re.fullmatch(r"([A-Z]+)0*(\d+)([A-Z]*)", name)
+    if m is None:
+        return None
+    prefix, number, variant = m.groups()
+    prefix = "Aa" if prefix == "AA" else prefix
+    return f"{prefix}{number}{variant.lower()}"
+
+@lru_cache(maxsize=1)
+def mdc_codes() -> dict:
+    """Lower-cased MdC code -> glyph for every sign in the font's block."""
+    codes = {}
+    for code_point in GLYPH_RANGE:
+        name = unicodedata.name(chr(code_point), "")
+        if name.startswith("EGYPTIAN HIEROGLYPH "):
+            code = mdc_code(name.removeprefix("EGYPTIAN HIEROGLYPH "))
+            if code is not None:
+                codes[code.lower()] = chr(code_point)
+    return codes
+
+@lru_cache(maxsize=1)
+def mdc_trie() -> dict:
+    """Character trie of mdc_codes, for codes run together with glyphs or each other.
+
+    Each node is a dict of next characters; the "" key of a node holds the
+    glyph whose code ends there.
+    """
+    trie = {}
+    for code, glyph in mdc_codes().items():
+        node = trie
+        for char in code:
+            node = node.setdefault(char, {})
+        node[""] = glyph
+    return trie
+
+def match_code(token, start, trie):
+    """Longest MdC code in token at start. Returns (glyph, end) or (None, start)."""
+    node, glyph, end = trie, None, start
+    for i in range(start, len(token)):
+        node = node.get(token[i].lower())
+        if node is None:
+            break
+        if "" in node:
+            glyph, end = node[""], i + 1
+    return glyph, end
+
+# --- Parsing ---
+
+class CorpusParser:
+    """Turns lines of corpus text into glyph chunks, collecting errors as it goes."""
+
+    def __init__(self, chunk_size=CHUNK_GLYPHS, max_errors=MAX_ERRORS):
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.errors = []
+        self.error_count = 0
+        self.glyph_count = 0
+        self.lines = 0
+
+    def _error(self, line, column, text, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(CorpusError(line, column, text, message))
+
+    def parse_line(self, text, line_number) -> list[str]:
+        """Return the glyphs of one line, recording bad tokens."""
+        if not text.translate(_PLAIN_LINE):
+            # Only glyphs and separators: the common case for pasted corpora
+            return [c for c in text if ord(c) in GLYPH_RANGE]
+        glyphs = []
+        codes, trie = mdc_codes(), mdc_trie()
+        for m in _TOKENS.finditer(text):
+            token = m.group()
+            glyph = codes.get(token.lower())
+            if glyph is not None:  # a token that is exactly one code
+                glyphs.append(glyph)
+                continue
+            if _HEX_TOKEN.fullmatch(token) and int(token, 16) in GLYPH_RANGE:
+                glyphs.append(chr(int(token, 16)))
+                continue
+            i = 0
+            while i < len(token):
+                if ord(token[i]) in GLYPH_RANGE:
+                    glyphs.append(token[i])
+                    i += 1
+                    continue
+                glyph, end = match_code(token, i, trie)
+                # A code must end at a glyph or the token end: "A1b" is no code followed by junk
+                if glyph is None or (end < len(token) and ord(token[end]) not in GLYPH_RANGE):
+                    rest = token[i:]
+                    if _HEX_TOKEN.fullmatch(token):
+                        message = f"Unicode hex U+{token.upper()} is not an Egyptian hieroglyph"
+                    elif len(rest) == 1 and not rest.isalnum():
+                        message = f"Unexpected character '{rest}' (U+{ord(rest):X})"
+                    else:
+                        message = "Unknown sign code"
+                    self._error(line_number, m.start() + i + 1, rest, message)
+                    break
+                glyphs.append(glyph)
+                i = end
+        return glyphs
+
+    def iter_lines(self, lines):
+        """Yield the glyph list of each line from an iterable of lines (a text file works)."""
+        for line_number, text in enumerate(lines, 1):
+            self.lines = line_number
+            glyphs = self.parse_line(text, line_number)
+            self.glyph_count += len(glyphs)
+            yield glyphs
+
+    def chunks(self, lines):
+        """Yield lists of chunk_size glyphs (the last may be shorter); only one is held at a time."""
+        chunk = []
+        for glyphs in self.iter_lines(lines):
+            chunk += glyphs
+            while len(chunk) >= self.chunk_size:
+                yield chunk[:self.chunk_size]
+                chunk = chunk[self.chunk_size:]
+        if chunk:
+            yield chunk
+
+    def report(self) -> dict:
+        return {"lines": self.lines, "glyphs": self.glyph_count, "error_count": self.error_count,
+                "errors": [e._asdict() for e in self.errors]}
+
+def read_glyph_file(path, encoding="utf-8") -> list[str]:
+    """Parse a whole file into one glyph list; raises ValueError naming the first bad positions."""
+    parser = CorpusParser()
+    with open(path, encoding=encoding, errors="replace") as f:
+        glyphs = [g for line in parser.iter_lines(f) for g in line]
+    if parser.errors:
+        listed = "; ".join(f"{e.line}:{e.column} {e.message}: {e.text}" for e in parser.errors[:5])
+        more = f" (+{parser.error_count - 5} more)" if parser.error_count > 5 else ""
+        raise ValueError(f"{path}: {listed}{more}")
+    return glyphs
+
+# --- Rendering ---
+
+def render_pages(path, out_dir=".", per_page=CHUNK_GLYPHS, direction="horizontal", size=None, shen=False,
+                 seed=None, encoder="default", name="page") -> dict:
+    """Render a corpus file as numbered pages of up to per_page glyphs. Returns a report dict."""
+    from encoding import encode_image
+    from inscription import SIZE, render_inscription
+
+    os.makedirs(out_dir, exist_ok=True)
+    parser = CorpusParser(per_page)
+    files = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for number, chunk in enumerate(parser.chunks(f), 1):
+            file_name, _ = output_filename(f"{name}_{number:04d}", encoder)
+            output_file = os.path.join(out_dir, file_name)
+            encode_image(render_inscription(chunk, direction, size or SIZE, shen=shen, seed=seed), output_file,
+                         encoder)
+            files.append(output_file)
+    return {**parser.report(), "pages": files}
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a large glyph / hex / MdC text file page by page.")
+    parser.add_argument("corpus", help="UTF-8 text file")
+    parser.add_argument("--out-dir", default=".", help="directory the pages are written to")
+    parser.add_argument("--name", default="page", help="page file name prefix")
+    parser.add_argument("--per-page", type=int, default=CHUNK_GLYPHS, help="glyphs per page")
+    parser.add_argument("--direction", default="H", choices=("H", "V"), help="horizontal or vertical")
+    parser.add_argument("--shen", action="store_true", help="draw the shen ring around each page")
+    parser.add_argument("--size", type=int, help="glyph height in pixels")
+    parser.add_argument("--seed", type=int, help="stone texture seed")
+    parser.add_argument("--encoder", choices=tuple(PROFILE_SUFFIXES), default="default", help="encoder profile")
+    parser.add_argument("--check", action="store_true", help="only parse and report errors, render nothing")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        corpus = CorpusParser(args.per_page)
+        with open(args.corpus, encoding="utf-8", errors="replace") as f:
+            for _ in corpus.chunks(f):
+                pass
+        report = corpus.report()
+    else:
+        direction = "vertical" if args.direction == "V" else "horizontal"
+        report = render_pages(args.corpus, args.out_dir, args.per_page, direction, args.size, args.shen,
+                              args.seed, args.encoder, args.name)
+    json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    for e in report["errors"][:20]:
+        print(f"{args.corpus}:{e['line']}:{e['column']}: {e['message']}: {e['text']}", file=sys.stderr)
+    return 1 if report["error_count"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
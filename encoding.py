@@ -0,0 +1,72 @@
+"""Output encoders with selectable profiles.
+
+    default   PNG at Pillow's default zlib level
+    fastest   PNG at zlib level 1, palette-indexed when the image allows it
+    smallest  palette PNG with optimize (adaptive quantization past 256 colours)
+    webp      lossless WebP
+
+A carved inscription uses only a few dozen colours (the stone shades and
+the carving blends), so the palette profiles keep every pixel exact while
+writing one byte per pixel instead of three.
+"""
+import numpy as np
+from PIL import Image
+
+from profiling import stage
+
+# --- Parameters ---
+PROFILES = {  # profile -> (Pillow format, save options, palette-index first)
+    "default": ("PNG", {}, False),
+    "fastest": ("PNG", {"compress_level": 1}, True),
+    "smallest": ("PNG", {"optimize": True}, True),
+    # On this stone, higher WebP effort is slower and rarely smaller until method 6 (~50x slower)
+    "webp": ("WEBP", {"lossless": True, "quality": 0, "method": 0}, False),
+}
+CONTENT_TYPES = {"PNG": "image/png", "WEBP": "image/webp"}
+
+# --- Palette ---
+
+def exact_palette(img):
+    """Return img as a "P" image with the same pixels, or None if it has over 256 colours."""
+    colors = img.getcolors(256)
+    if colors is None:
+        return None
+    palette = np.array(sorted(rgb for _, rgb in colors), dtype=np.uint8)
+    keys = (palette[:, 0].astype(np.uint32) << 16) | (palette[:, 1].astype(np.uint32) << 8) | palette[:, 2]
+
+    # Pillow's own palette mapping rounds colours, so look every pixel up exactly
+    rgb = np.asarray(img)
+    pixels = (rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8)
+    pixels |= rgb[..., 2]
+    indexed = Image.fromarray(np.searchsorted(keys, pixels).astype(np.uint8), mode="P")
+    indexed.putpalette(palette.tobytes())
+    return indexed
+
+def adaptive_palette(img, colors=256):
+    """Median-cut quantization to at most `colors` colours (lossy, no dithering)."""
+    return img.quantize(colors, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+
+# --- Encoding ---
+
+def profile_format(profile) -> str:
+    """Pillow format name written by a profile."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}', expected one of {', '.join(PROFILES)}.")
+    return PROFILES[profile][0]
+
+def content_type(profile) -> str:
+    return CONTENT_TYPES[profile_format(profile)]
+
+def encode_image(img, file, profile="default"):
+    """Encode an image (PIL Image or HxWx3 uint8 array) to a path or binary file object."""
+    format = profile_format(profile)
+    _, options, indexed = PROFILES[profile]
+    if isinstance(img, np.ndarray):
+        img = Image.fromarray(img, mode="RGB")
+    with stage("encode"):
+        if indexed and img.mode == "RGB":
+            paletted = exact_palette(img)
+            if paletted is None and profile == "smallest":
+                paletted = adaptive_palette(img)
+            img = paletted or img
+        img.save(file, format=format, **options)
@@ -0,0 +1,185 @@
+"""Resident pre-warmed render process behind a Unix socket.
+
+    python fork_server.py &            # start once; imports, font and texture warm up
+    python inscribe.py out.png --glyphs "𓏙𓋹𓎃" --shen
+
+The server imports the renderer, loads the font and renders a throwaway
+inscription so every cache is hot, then waits on a Unix socket. Each
+request forks a copy of that warm process, which renders, writes the file
+and exits, so a CLI call costs the render and nothing else. This module
+imports nothing heavy at the top: clients use it too.
+
+Requests and replies are one JSON object per line. A request holds glyphs
+(a list), direction, shen, seed, size, encoder (a profile from encoding.py) and output
+(an absolute path with the profile's suffix); the reply holds file, width
+and height, or error. {"command": "stop"} shuts the server down. Unix only.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+
+# --- Parameters ---
+DEFAULT_SOCKET = os.environ.get("INSCRIPTION_SOCKET") or os.path.join(
+    tempfile.gettempdir(), f"inscription-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+REQUEST_TIMEOUT = 5.0      # seconds a client gets to send its request line
+MAX_REQUEST = 1 << 20      # longest request line accepted
+
+# --- Client ---
+
+def _send(payload, socket_path, timeout):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(payload, ensure_ascii=False).encode() + b"\n")
+        reply = conn.makefile("rb").readline()
+    if not reply:
+        raise ConnectionError("Fork server closed the connection without replying.")
+    return json.loads(reply)
+
+def request_render(glyphs, output, direction="horizontal", shen=False, seed=None, size=None, encoder="default",
+                   socket_path=DEFAULT_SOCKET, timeout=60.0) -> dict:
+    """Have a running server render glyphs into the image file output.
+
+    Raises OSError when no server is listening (callers fall back to rendering
+    in-process) and RuntimeError when the server reports a failed render.
+    """
+    payload = {"glyphs": list(glyphs), "direction": direction, "shen": bool(shen), "seed": seed,
+               "size": size, "encoder": encoder, "output": os.path.abspath(output)}
+    reply = _send(payload, socket_path, timeout)
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply
+
+def stop_server(socket_path=DEFAULT_SOCKET, timeout=5.0):
+    return _send({"command": "stop"}, socket_path, timeout)
+
+# --- Server ---
+
+def warm_up(size):
+    """Import the renderer and fill its caches; everything forked afterwards starts hot."""
+    from inscription import load_font, render_inscription
+
+    load_font(size)
+    render_inscription("𓏙𓋹𓎃", size=size, shen=True, output="bytes")
+
+def handle_render(conn, request):
+    """Runs in the forked child: render the request and reply."""
+    from encoding import encode_image
+    from glyph_input import PROFILE_SUFFIXES
+    from inscription import SIZE, render_inscription
+
+    try:
+        output = request["output"]
+        encoder = request.get("encoder") or "default"
+        suffix = PROFILE_SUFFIXES.get(encoder)
+        if suffix is None:
+            raise ValueError(f"Unknown encoder '{encoder}'")
+        if not os.path.isabs(output) or not output.lower().endswith(suffix):
+            raise ValueError(f"output must be an absolute {suffix} path")
+        img = render_inscription(request["glyphs"], request.get("direction", "horizontal"),
+                                 request.get("size") or SIZE, shen=bool(request.get("shen")),
+                                 seed=request.get("seed"))
+        encode_image(img, output, encoder)
+        reply = {"file": output, "width": img.width, "height": img.height}
+    except Exception as e:
+        reply = {"error": f"{type(e).__name__}: {e}"}
+    conn.sendall(json.dumps(reply, ensure_ascii=False).encode() + b"\n")
+
+def _read_request(conn):
+    conn.settimeout(REQUEST_TIMEOUT)
+    line = conn.makefile("rb").readline(MAX_REQUEST)
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError(f"expected a JSON object, got {type(request).__name__}")
+    return request
+
+def _bind(socket_path):
+    if os.path.exists(socket_path):
+        # A leftover socket from a server that died is removed; a live one is left alone
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            raise RuntimeError(f"A fork server is already listening on {socket_path}")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # only this user may connect
+    try:
+        listener.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    listener.listen(64)
+    return listener
+
+def serve(socket_path=DEFAULT_SOCKET, size=None, idle_timeout=None):
+    """Warm up, then fork one child per render request until stopped."""
+    if not hasattr(os, "fork"):
+        raise RuntimeError("The fork server needs os.fork (Unix).")
+    from inscription import SIZE
+
+    warm_up(size or SIZE)
+    listener = _bind(socket_path)
+    listener.settimeout(idle_timeout)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # children are reaped automatically
+    print(f"Fork server ready on {socket_path}", file=sys.stderr)
+    try:
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                break
+            with conn:
+                try:
+                    request = _read_request(conn)
+                except ValueError as e:
+                    # Not JSON, or not an object: answer it and keep serving
+                    try:
+                        conn.sendall(json.dumps({"error": f"Bad request: {e}"}).encode() + b"\n")
+                    except OSError:
+                        pass
+                    continue
+                except OSError:
+                    continue
+                if request.get("command") == "stop":
+                    conn.sendall(b'{"stopped": true}\n')
+                    break
+                if os.fork() == 0:
+                    # Child: render with the warm state, reply and leave without running cleanups
+                    code = 0
+                    try:
+                        listener.close()
+                        conn.settimeout(None)
+                        handle_render(conn, request)
+                    except BaseException:
+                        code = 1
+                    finally:
+                        os._exit(code)
+    finally:
+        listener.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a warm render process for fast CLI calls.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--size", type=int, help="glyph size to warm up")
+    parser.add_argument("--idle-timeout", type=float, help="exit after this many seconds without a request")
+    parser.add_argument("--stop", action="store_true", help="stop the server listening on --socket")
+    args = parser.parse_args(argv)
+    if args.stop:
+        stop_server(args.socket)
+        return
+    try:
+        serve(args.socket, args.size, args.idle_timeout)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
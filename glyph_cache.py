@@ -0,0 +1,104 @@
+"""Pre-rasterized glyph masks keyed by (codepoint, size).
+
+Each glyph is rasterized by FreeType once per size into an 8-bit coverage
+mask cropped to its ink bbox. Masks live in a byte-bounded LRU and can be
+saved to / loaded from an .npz atlas so warm processes skip FreeType.
+"""
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from inscription import FONT_PATH, load_font
+from profiling import count
+
+# --- Parameters ---
+MAX_BYTES = 64 * 1024 * 1024  # memory bound for cached masks
+
+class GlyphMaskCache:
+    def __init__(self, max_bytes=MAX_BYTES, font_path=FONT_PATH):
+        self.max_bytes = max_bytes
+        self.font_path = font_path
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._masks = OrderedDict()
+
+    def __len__(self):
+        return len(self._masks)
+
+    def get(self, glyph, size):
+        """Return (mask, bbox) for a glyph; mask is HxW uint8 covering bbox."""
+        key = (ord(glyph), size)
+        entry = self._masks.get(key)
+        if entry is not None:
+            self._masks.move_to_end(key)
+            self.hits += 1
+            count("glyph_cache_hits")
+            return entry
+        self.misses += 1
+        count("glyph_cache_misses")
+        entry = rasterize_glyph(glyph, size, self.font_path)
+        self._put(key, entry)
+        return entry
+
+    def _put(self, key, entry):
+        old = self._masks.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[0].nbytes
+        self._masks[key] = entry
+        self.nbytes += entry[0].nbytes
+        while self.nbytes > self.max_bytes and len(self._masks) > 1:
+            _, (mask, _) = self._masks.popitem(last=False)
+            self.nbytes -= mask.nbytes
+
+    def clear(self):
+        self._masks.clear()
+        self.nbytes = 0
+
+    def warm(self, glyphs, size):
+        """Rasterize every glyph at this size ahead of time."""
+        for glyph in glyphs:
+            self.get(glyph, size)
+
+    def save_atlas(self, path):
+        """Pack every cached mask into one .npz: a flat pixel buffer plus an index."""
+        keys = list(self._masks)
+        masks = [self._masks[k][0] for k in keys]
+        bboxes = np.array([self._masks[k][1] for k in keys], dtype=np.int32).reshape(-1, 4)
+        shapes = np.array([m.shape for m in masks], dtype=np.int32).reshape(-1, 2)
+        offsets = np.zeros(len(masks) + 1, dtype=np.int64)
+        np.cumsum([m.size for m in masks], out=offsets[1:])
+        pixels = np.concatenate([m.ravel() for m in masks]) if masks else np.zeros(0, np.uint8)
+        np.savez(path, keys=np.array(keys, dtype=np.int64).reshape(-1, 2), bboxes=bboxes,
+                 shapes=shapes, offsets=offsets, pixels=pixels)
+
+    def load_atlas(self, path):
+        """Load masks saved by save_atlas into the cache. Returns the number loaded."""
+        with np.load(path) as atlas:
+            keys, bboxes, shapes = atlas["keys"], atlas["bboxes"], atlas["shapes"]
+            offsets, pixels = atlas["offsets"], atlas["pixels"]
+        for i, (codepoint, size) in enumerate(keys):
+            mask = pixels[offsets[i]:offsets[i + 1]].reshape(shapes[i])
+            self._put((int(codepoint), int(size)), (mask, tuple(int(v) for v in bboxes[i])))
+        return len(keys)
+
+def rasterize_glyph(glyph, size, font_path=FONT_PATH):
+    """Rasterize one glyph with FreeType, cropped to its ink bbox."""
+    font = load_font(size, font_path)
+    bbox = font.getbbox(glyph)
+    w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    if w <= 0 or h <= 0:
+        return np.zeros((0, 0), dtype=np.uint8), bbox
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), glyph, fill=255, font=font)
+    return np.asarray(mask), bbox
+
+_caches = {}
+
+def get_glyph_cache(font_path=FONT_PATH):
+    """Return the process-wide mask cache for a font file."""
+    cache = _caches.get(font_path)
+    if cache is None:
+        cache = _caches[font_path] = GlyphMaskCache(font_path=font_path)
+    return cache
@@ -0,0 +1,70 @@
+"""Input parsing shared by the renderer and the command-line tools.
+
+Kept free of numpy and Pillow so front ends can validate input before
+paying for the renderer's imports.
+"""
+import re
+
+# --- Parameters ---
+GLYPH_RANGE = range(0x13000, 0x13430)  # Egyptian Hieroglyphs block
+PROFILE_SUFFIXES = {          # output profile -> file suffix (see encoding.py)
+    "default": ".png",
+    "fastest": ".png",
+    "smallest": ".png",
+    "webp": ".webp",
+}
+SUFFIX_PROFILES = {".png": "default", ".webp": "webp"}  # profile implied by a bare suffix
+
+# --- Functions ---
+
+def parse_glyph_input(raw_input: str) -> list[str]:
+    """Parse user input: supports pasted glyphs or Unicode hex codes."""
+    glyphs = []
+    for part in raw_input.strip().split():
+        if re.fullmatch(r"[0-9A-Fa-f]{4,6}", part):  # Hex input
+            try:
+                glyphs.append(chr(int(part, 16)))
+            except ValueError:
+                raise ValueError(f"Invalid Unicode hex: {part}")
+        else:
+            for char in part:
+                code = ord(char)
+                if code in GLYPH_RANGE:
+                    glyphs.append(char)
+                else:
+                    raise ValueError(f"Unexpected character '{char}' (U+{code:X})")
+    return glyphs
+
+def is_valid_filename(name: str) -> tuple[bool, str]:
+    """Ensure filename is safe, properly formatted, and within length limits."""
+    if not name or len(name) > 100:
+        return False, "Filename must be between 1 and 100 characters."
+    if not re.fullmatch(r"^[\w\- ]+$", name):
+        return False, "Only letters, numbers, underscores, dashes, and spaces allowed."
+    return True, ""
+
+def split_image_name(name: str) -> tuple[str, str | None]:
+    """Lower-case a file name and split off a known image suffix (None when it has none)."""
+    name = name.strip().lower()
+    for suffix in SUFFIX_PROFILES:
+        if name.endswith(suffix):
+            return name.removesuffix(suffix), suffix
+    return name, None
+
+def output_filename(name: str, encoder: str | None = None) -> tuple[str, str]:
+    """Validate a file name and pick its encoder profile. Returns (file name, encoder).
+
+    Without an encoder the suffix decides (.png when there is none); with one,
+    its suffix is added and a different suffix on the name is refused.
+    """
+    file_base, suffix = split_image_name(name)
+    valid, msg = is_valid_filename(file_base)
+    if not valid:
+        raise ValueError(f"Invalid file name: {msg}")
+    if encoder is None:
+        encoder = SUFFIX_PROFILES[suffix or ".png"]
+    if encoder not in PROFILE_SUFFIXES:
+        raise ValueError(f"Unknown encoder '{encoder}', expected one of {', '.join(PROFILE_SUFFIXES)}.")
+    if suffix is not None and suffix != PROFILE_SUFFIXES[encoder]:
+        raise ValueError(f"Encoder '{encoder}' writes {PROFILE_SUFFIXES[encoder]} files, not {suffix}.")
+    return file_base + PROFILE_SUFFIXES[encoder], encoder
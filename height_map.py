@@ -0,0 +1,134 @@
+"""Height-map carving: V-cut depth from a distance transform, lit by surface normals.
+
+The height map is built from the exact layout of the colour pass at native
+resolution, so it never needs resampling. Each ink pixel is cut as deep as
+its distance to the nearest glyph edge (a V-groove, capped at the chisel's
+cut radius), and the stone is shaded from the normals of that surface.
+"""
+import io
+import math
+
+import numpy as np
+from PIL import Image
+
+from carving import LIGHT_ANGLE
+from inscription import BG, OUTPUTS, PADDING, SIZE, plan_inscription, region_coverage
+from profiling import stage
+from texture import sandstone_texture
+
+# --- Parameters ---
+LIGHT_ELEVATION = 45.0   # degrees above the stone surface
+MIN_LIGHT = 0.6          # darkest shading factor (as the old apply_depth_shading clip)
+MAX_LIGHT = 1.2          # brightest shading factor on walls facing the light
+
+# --- Functions ---
+
+def default_cut_radius(size) -> int:
+    """How far (px) the V-cut keeps deepening from the edge; scales with glyph size."""
+    return max(2, round(size / 40))
+
+def distance_to_edge(inside, radius):
+    """Euclidean distance from each True pixel to the nearest False pixel, capped at radius.
+
+    A truncated two-pass distance transform: the row pass finds the nearest
+    outside pixel along each row, the column pass combines those with every
+    vertical offset up to the radius. Each pass is a handful of whole-array
+    numpy operations per offset.
+    """
+    cap = radius + 1
+    far = np.float32(cap * cap)
+
+    # Row pass: squared horizontal distance to the nearest outside pixel
+    row = np.where(inside, far, np.float32(0))
+    for k in range(1, cap):
+        k2 = np.float32(k * k)
+        left = np.ones_like(inside)
+        left[:, k:] = inside[:, :-k]
+        right = np.ones_like(inside)
+        right[:, :-k] = inside[:, k:]
+        hit = ~(left & right) & inside
+        np.minimum(row, np.where(hit, k2, far), out=row)
+
+    # Column pass: min over vertical offsets j of row[y + j] + j^2
+    dist = row.copy()
+    for j in range(1, cap):
+        j2 = np.float32(j * j)
+        np.minimum(dist[:-j], row[j:] + j2, out=dist[:-j])
+        np.minimum(dist[j:], row[:-j] + j2, out=dist[j:])
+    return np.minimum(np.sqrt(dist), np.float32(radius))
+
+def height_map(plan, region=None, cut_radius=None):
+    """Return the (h, w) float32 surface height (0 = stone face, negative = cut) for a region."""
+    x0, y0, x1, y1 = region if region is not None else (0, 0, plan.W, plan.H)
+    radius = cut_radius or default_cut_radius(plan.size)
+
+    # The distance transform and the gradients need pixels past the region edge
+    halo = radius + 1
+    ex0, ey0 = max(x0 - halo, 0), max(y0 - halo, 0)
+    ex1, ey1 = min(x1 + halo, plan.W), min(y1 + halo, plan.H)
+    coverage = region_coverage(plan, (ex0, ey0, ex1, ey1))
+
+    # The pixel grid puts the edge up to a pixel off; the coverage supplies the sub-pixel part
+    depth = np.maximum(distance_to_edge(coverage >= 128, radius) - 1, 0) + coverage * np.float32(1 / 255)
+    height = -np.minimum(depth, np.float32(radius))
+    return height[y0 - ey0:y1 - ey0, x0 - ex0:x1 - ex0]
+
+def shade_from_height(height, light_angle=LIGHT_ANGLE, elevation=LIGHT_ELEVATION):
+    """Return a (h, w) float32 lighting factor from the height map's surface normals.
+
+    light_angle matches the carving compositor: at 45 the light falls from the
+    upper left, darkening the upper-left walls of each groove. A flat face
+    gets exactly 1.0.
+    """
+    dz_dy, dz_dx = np.gradient(height)
+    a, e = math.radians(light_angle), math.radians(elevation)
+    lx, ly, lz = -math.cos(a) * math.cos(e), -math.sin(a) * math.cos(e), math.sin(e)
+
+    # n = (-dz/dx, -dz/dy, 1) / |n|; compare against the flat-face response lz
+    norm = np.sqrt(dz_dx * dz_dx + dz_dy * dz_dy + 1)
+    lambert = (-dz_dx * lx - dz_dy * ly + lz) / norm
+    return np.clip(lambert / lz, MIN_LIGHT, MAX_LIGHT).astype(np.float32)
+
+def apply_depth_shading(texture, height, light_angle=LIGHT_ANGLE, elevation=LIGHT_ELEVATION):
+    """Shade a texture (H, W, C uint8) with a same-sized height map; no resampling."""
+    if texture.shape[:2] != height.shape:
+        raise ValueError(f"Height map {height.shape} does not match texture {texture.shape[:2]}")
+    light = shade_from_height(height, light_angle, elevation)
+    shaded = texture * light[..., None]
+    return np.clip(shaded + 0.5, 0, 255).astype(np.uint8)
+
+def render_height_region(plan, region, cut_radius=None, elevation=LIGHT_ELEVATION):
+    """Render the window region=(x0, y0, x1, y1) with height-map shading."""
+    x0, y0, x1, y1 = region
+    radius = cut_radius or default_cut_radius(plan.size)
+    # One extra pixel each side keeps np.gradient exact at the region edge
+    ex0, ey0 = max(x0 - 1, 0), max(y0 - 1, 0)
+    ex1, ey1 = min(x1 + 1, plan.W), min(y1 + 1, plan.H)
+    with stage("height_map"):
+        height = height_map(plan, (ex0, ey0, ex1, ey1), radius)
+    with stage("texture"):
+        texture = sandstone_texture((plan.W, plan.H), plan.base_color, seed=plan.seed,
+                                    region=(ex0, ey0, ex1, ey1))
+    with stage("depth_shading"):
+        shaded = apply_depth_shading(texture, height, plan.light_angle, elevation)
+    return shaded[y0 - ey0:y1 - ey0, x0 - ex0:x1 - ex0]
+
+def render_height_mapped(glyphs, direction="horizontal", size=SIZE, padding=PADDING, seed=None, output="image",
+                         format="PNG", base_color=BG, light_angle=LIGHT_ANGLE, elevation=LIGHT_ELEVATION,
+                         cut_radius=None):
+    """Render an inscription as V-cut carving lit from the height map; outputs as render_inscription."""
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {', '.join(OUTPUTS)}")
+    plan = plan_inscription(glyphs, direction, size, padding, seed=seed, base_color=base_color,
+                            light_angle=light_angle)
+    canvas = render_height_region(plan, (0, 0, plan.W, plan.H), cut_radius, elevation)
+
+    if output == "array":
+        return canvas
+    img = Image.fromarray(canvas, mode="RGB")
+    if output == "bytes":
+        buffer = io.BytesIO()
+        with stage("encode"):
+            img.save(buffer, format=format)
+        return buffer.getvalue()
+    return img
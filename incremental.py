@@ -0,0 +1,193 @@
+"""Incremental re-rendering for interactive editing.
+
+IncrementalRenderer keeps the last canvas and, per glyph, its carving as a
+stone-independent layer (see carving.carve_layer). After an edit it diffs
+the new layout against the old one: glyphs that kept their place are left
+alone, glyphs that moved or appeared are laid from their cached layer onto
+fresh stone, vacated tiles get bare stone back, and anything where layers
+interact (touching tiles, the shen ring) is re-rendered exactly with
+render_region. The result is pixel-identical to a full render.
+
+The stone's shading follows the canvas height, so an edit that changes the
+height (a taller sign horizontally, almost any vertical edit) repaints the
+whole canvas.
+"""
+import numpy as np
+
+from carving import CARVE_DEPTH, LIGHT_ANGLE, apply_carve_layer, carve_halo, carve_layer
+from cartouche import rounded_box_sdf, shen_geometry
+from inscription import (BG, EXTRA_PADDING, FONT_PATH, LINE_WIDTH, PADDING, SIZE, carve_colors,
+                         glyphs_in_range, plan_inscription, render_region)
+from texture import sandstone_texture
+
+# --- Helpers ---
+
+def glyph_tiles(plan, halo):
+    """Return [(glyph, (x0, y0, x1, y1))] for every glyph: its ink box grown by the carve halo."""
+    tiles = plan.layout.rows["ink"] + np.array([-halo, -halo, halo, halo])
+    return [(glyph, tuple(rect)) for glyph, rect in zip(plan.layout.glyphs, tiles.tolist())]
+
+def touches_neighbour(plan, index, halo):
+    """True if another glyph's carving can reach into glyph index's tile."""
+    start, stop = int(plan.layout.starts[index]), int(plan.layout.ends[index])
+    first, last = glyphs_in_range(plan, start - 2 * halo, stop + 2 * halo)
+    return last - first > 1
+
+def glyphs_reaching(plan, rect, halo):
+    """Return the indexes of the glyphs whose carving can reach into rect."""
+    axis = 0 if plan.direction == "horizontal" else 1
+    return range(*glyphs_in_range(plan, rect[axis] - halo, rect[2 + axis] + halo))
+
+def ring_changes(old, new, halo):
+    """Return the rects of new's canvas where the shen ring differs from old's, or None for all of it.
+
+    When only the main-axis length changed, the ring's straight sides match up
+    to the far corner, so only the far end needs repainting.
+    """
+    if not old.shen and not new.shen:
+        return []
+    if old.shen != new.shen:
+        return None
+    a = shen_geometry(old.direction, old.W, old.H, old.line_width, old.padding)
+    b = shen_geometry(new.direction, new.W, new.H, new.line_width, new.padding)
+    if a == b:
+        return []
+    axis = 0 if new.direction == "horizontal" else 1
+    # Everything but the far edge (x1 or y1) of each shape must match
+    same = all(a[k][i] == b[k][i] for k in ("outer", "inner") for i in range(5) if i != 2 + axis)
+    same = same and all(a["bar"][i] == b["bar"][i] for i in range(4) if i % 2 != axis)
+    if not same:
+        return None
+    # The far corner starts a radius before the shorter ring's end, the crossbar may start earlier
+    end = min(a["outer"][2 + axis], b["outer"][2 + axis])
+    start = max(min(end - b["outer"][4], a["bar"][axis], b["bar"][axis]) - halo - 1, 0)
+    if axis == 0:
+        return [(start, 0, new.W, new.H)]
+    return [(0, start, new.W, new.H)]
+
+def clip(rect, W, H):
+    x0, y0, x1, y1 = rect
+    return max(x0, 0), max(y0, 0), min(x1, W), min(y1, H)
+
+# --- Renderer ---
+
+class IncrementalRenderer:
+    """Re-render an inscription after each edit, repainting only what changed."""
+
+    def __init__(self, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None, base_color=BG,
+                 line_width=LINE_WIDTH, extra_padding=EXTRA_PADDING, font_path=FONT_PATH,
+                 light_angle=LIGHT_ANGLE, carve_depth=CARVE_DEPTH):
+        self.options = dict(direction=direction, size=size, padding=padding, shen=shen, seed=seed,
+                            base_color=base_color, line_width=line_width, extra_padding=extra_padding,
+                            font_path=font_path, light_angle=light_angle, carve_depth=carve_depth)
+        self.halo = carve_halo(light_angle, carve_depth)
+        self.plan = None
+        self.canvas = None
+        self._tiles = []
+        self._layers = {}   # glyph -> carve layer over its tile, reusable wherever the glyph lands
+
+    def render(self, glyphs):
+        """Update to glyphs and return the canvas (H, W, 3 uint8); later updates modify it in place."""
+        self.update(glyphs)
+        return self.canvas
+
+    def glyph_at(self, x, y):
+        """Index of the glyph whose ink box holds canvas pixel (x, y), or None; for editor clicks."""
+        return None if self.plan is None else self.plan.layout.glyph_at(x, y)
+
+    def update(self, glyphs):
+        """Update to glyphs. Returns the list of (x0, y0, x1, y1) rects that were repainted."""
+        plan = plan_inscription(glyphs, **self.options)
+        old = self.plan
+        # The stone's shading is laid out over the canvas height, and the cross axis centres every glyph
+        if old is None or old.H != plan.H or (plan.direction == "vertical" and old.W != plan.W):
+            return self._full(plan)
+        ring = ring_changes(old, plan, self.halo)
+        if ring is None:
+            return self._full(plan)
+
+        canvas = self.canvas
+        dirty = list(ring)
+        if (old.W, old.H) != (plan.W, plan.H):
+            canvas = np.empty((plan.H, plan.W, 3), dtype=np.uint8)
+            h, w = min(old.H, plan.H), min(old.W, plan.W)
+            canvas[:h, :w] = self.canvas[:h, :w]
+            if plan.W > w:
+                dirty.append((w, 0, plan.W, plan.H))
+            if plan.H > h:
+                dirty.append((0, h, plan.W, plan.H))
+
+        tiles = glyph_tiles(plan, self.halo)
+        kept = set(self._tiles) & set(tiles)
+        repainted = []
+
+        # Vacated tiles go back to bare stone; moved and new glyphs are painted over that
+        # afterwards, so only a kept glyph or the ring reaching in needs an exact repaint
+        for glyph, rect in self._tiles:
+            if (glyph, rect) in kept:
+                continue
+            rect = clip(rect, plan.W, plan.H)
+            if rect[0] >= rect[2] or rect[1] >= rect[3]:
+                continue
+            if (any(tiles[j] in kept for j in glyphs_reaching(plan, rect, self.halo))
+                    or self._ring_reaches(plan, rect)):
+                dirty.append(rect)
+            else:
+                x0, y0, x1, y1 = rect
+                sandstone_texture((plan.W, plan.H), plan.base_color, seed=plan.seed, region=rect,
+                                  out=canvas[y0:y1, x0:x1])
+                repainted.append(rect)
+
+        # Moved or new glyphs are laid from their cached layer when nothing else touches them
+        for i, (glyph, rect) in enumerate(tiles):
+            if (glyph, rect) in kept:
+                continue
+            if (clip(rect, plan.W, plan.H) != rect or touches_neighbour(plan, i, self.halo)
+                    or self._ring_reaches(plan, rect)):
+                dirty.append(clip(rect, plan.W, plan.H))
+                continue
+            x0, y0, x1, y1 = rect
+            tile = sandstone_texture((plan.W, plan.H), plan.base_color, seed=plan.seed, region=rect)
+            canvas[y0:y1, x0:x1] = apply_carve_layer(tile, self._layer(plan, i))
+            repainted.append(rect)
+
+        for rect in dirty:
+            x0, y0, x1, y1 = rect
+            canvas[y0:y1, x0:x1] = render_region(plan, rect)
+        self.plan, self.canvas, self._tiles = plan, canvas, tiles
+        return repainted + dirty
+
+    def _full(self, plan):
+        self.canvas = np.ascontiguousarray(render_region(plan, (0, 0, plan.W, plan.H)))
+        self.plan = plan
+        self._tiles = glyph_tiles(plan, self.halo)
+        return [(0, 0, plan.W, plan.H)]
+
+    def _ring_reaches(self, plan, rect):
+        """True if the shen ring's carving can reach into rect."""
+        if not plan.shen:
+            return False
+        # The hole is convex: a rect (grown by the halo and a pixel of anti-aliasing)
+        # whose corners all sit inside it is clear of the ring; the crossbar crosses the hole
+        geometry = shen_geometry(plan.direction, plan.W, plan.H, plan.line_width, plan.padding)
+        grow = self.halo + 1
+        x0, y0, x1, y1 = rect[0] - grow, rect[1] - grow, rect[2] + grow, rect[3] + grow
+        bx0, by0, bx1, by1 = geometry["bar"]
+        if x0 < bx1 and bx0 < x1 and y0 < by1 and by0 < y1:
+            return True
+        px = np.array([x0, x1, x0, x1], dtype=np.float32)
+        py = np.array([y0, y0, y1, y1], dtype=np.float32)
+        return bool((rounded_box_sdf(px, py, geometry["inner"]) > 0).any())
+
+    def _layer(self, plan, index):
+        glyph = plan.placements[index][0]
+        layer = self._layers.get(glyph)
+        if layer is None:
+            mask, _ = plan.masks[index]
+            h = self.halo
+            coverage = np.zeros((mask.shape[0] + 2 * h, mask.shape[1] + 2 * h), dtype=np.uint8)
+            coverage[h:h + mask.shape[0], h:h + mask.shape[1]] = mask
+            shadow, highlight, _ = carve_colors(plan.base_color)
+            layer = self._layers[glyph] = carve_layer(coverage, shadow, highlight, plan.base_color,
+                                                      plan.light_angle, plan.carve_depth)
+        return layer
@@ -0,0 +1,74 @@
+"""Fast-start command line renderer.
+
+    python inscribe.py cartouche.png --glyphs "𓏙𓋹𓎃 132BD" --shen
+    python inscribe.py cartouche.webp --glyphs "𓏙𓋹𓎃" --encoder webp
+    python inscribe.py cleopatra.png --name Cleopatra --shen
+
+Arguments are checked before anything heavy is imported. If a fork server
+(fork_server.py) is listening, the render is handed to a warm copy of it;
+otherwise numpy, Pillow and the font are loaded here as usual.
+"""
+import argparse
+import socket
+import sys
+
+from fork_server import DEFAULT_SOCKET, request_render
+from glyph_input import PROFILE_SUFFIXES, output_filename, parse_glyph_input
+from phonetic import name_to_glyphs
+
+# --- Functions ---
+
+def render_file(glyphs, direction, output_file, shen=False, seed=None, size=None, encoder="default",
+                socket_path=DEFAULT_SOCKET, use_server=True) -> str:
+    """Render glyphs into output_file. Returns "server" or "local", whichever did the work."""
+    if use_server:
+        try:
+            request_render(glyphs, output_file, direction, shen, seed, size, encoder, socket_path)
+            return "server"
+        except socket.timeout:
+            # The server's child may still be writing output_file: a local render would race it
+            raise RuntimeError(f"The fork server did not reply in time; {output_file} may still be written.")
+        except OSError:
+            pass  # no server running: render here
+
+    from encoding import encode_image
+    from inscription import SIZE, render_inscription
+
+    img = render_inscription(glyphs, direction, size or SIZE, shen=shen, seed=seed)
+    encode_image(img, output_file, encoder)
+    return "local"
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render an inscription to a PNG file.")
+    parser.add_argument("output", help="file name (.png or .webp)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--glyphs", help="glyphs or Unicode hex, as at the prompt")
+    source.add_argument("--name", help="a name to spell in uniliteral signs (see phonetic.py)")
+    parser.add_argument("--direction", default="H", choices=("H", "V"), help="horizontal or vertical")
+    parser.add_argument("--shen", action="store_true", help="draw the shen ring")
+    parser.add_argument("--seed", type=int, help="stone texture seed")
+    parser.add_argument("--size", type=int, help="glyph height in pixels")
+    parser.add_argument("--encoder", choices=tuple(PROFILE_SUFFIXES),
+                        help="encoder profile, see encoding.py (default: from the file suffix)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="fork server socket")
+    parser.add_argument("--no-server", action="store_true", help="always render in this process")
+    args = parser.parse_args(argv)
+
+    try:
+        output_file, encoder = output_filename(args.output, args.encoder)
+        glyphs = list(name_to_glyphs(args.name)) if args.name else parse_glyph_input(args.glyphs)
+        if not glyphs:
+            raise ValueError("No glyphs given.")
+        direction = "vertical" if args.direction == "V" else "horizontal"
+        render_file(glyphs, direction, output_file, args.shen, args.seed, args.size, encoder, args.socket,
+                    not args.no_server)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Image saved as {output_file}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
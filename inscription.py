@@ -0,0 +1,167 @@
+import io
+import os
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image, ImageFont
+
+from cartouche import shen_region_mask
+from carving import CARVE_DEPTH, LIGHT_ANGLE, carve, carve_halo, coverage_mask
+from encoding import encode_image
+from glyph_input import parse_glyph_input
+from layout import GlyphLayout
+from profiling import count, stage
+from texture import sandstone_texture
+
+# --- Parameters ---
+BG = (198, 158, 109)  # sandstone base color
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "fonts", "NotoSansEgyptianHieroglyphs-Regular.ttf")
+SIZE = 240            # glyph height approx
+PADDING = 60          # space around glyphs
+EXTRA_PADDING = 30    # Additional padding for Shen ring
+LINE_WIDTH = 10       # Thickness of the Shen ring
+
+OUTPUTS = ("image", "array", "bytes")
+
+_fonts = {}
+
+# --- Functions ---
+
+def load_font(size, font_path=FONT_PATH):
+    """Return a FreeType handle for the font, loading it once per (path, size)."""
+    key = (font_path, size)
+    font = _fonts.get(key)
+    if font is None:
+        with stage("font_load"):
+            font = _fonts[key] = ImageFont.truetype(font_path, size)
+    return font
+
+def carve_colors(base_color):
+    """Return the (shadow, highlight, carved_color) shades derived from the stone color."""
+    shadow = tuple(max(c - 30, 0) for c in base_color)
+    highlight = tuple(min(c + 20, 255) for c in base_color)
+    carved_color = tuple(max(c - 15, 0) for c in base_color)
+    return shadow, highlight, carved_color
+
+def layout_glyphs(glyphs, glyph_bboxes, direction, padding=PADDING, extra_padding=0):
+    """Size the canvas and place each glyph from its ink bbox (as font.getbbox).
+
+    Returns (W, H, placements) where each placement is (glyph, x, y, bbox) and
+    (x, y) is the origin to hand to draw.text. extra_padding widens the main
+    axis only, leaving room for a shen ring. See layout.GlyphLayout for the
+    same layout as arrays.
+    """
+    layout = GlyphLayout.from_bboxes([ord(g) for g in glyphs], glyph_bboxes, direction, padding, extra_padding)
+    return layout.W, layout.H, layout.placements()
+
+class RenderPlan(NamedTuple):
+    """Everything needed to render any region of an inscription."""
+    W: int
+    H: int
+    placements: list  # (glyph, x, y, bbox) from layout_glyphs
+    masks: list       # (mask, bbox) per glyph from the glyph cache
+    direction: str
+    size: int
+    padding: int
+    shen: bool
+    line_width: int
+    extra_padding: int
+    base_color: tuple
+    seed: object
+    light_angle: float
+    carve_depth: float
+    layout: GlyphLayout  # the placements as arrays, for range and hit queries
+
+def plan_inscription(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                     base_color=BG, line_width=LINE_WIDTH, extra_padding=EXTRA_PADDING, font_path=FONT_PATH,
+                     light_angle=LIGHT_ANGLE, carve_depth=CARVE_DEPTH) -> RenderPlan:
+    """Lay out an inscription without drawing anything."""
+    if isinstance(glyphs, str):
+        glyphs = parse_glyph_input(glyphs)
+
+    from glyph_cache import get_glyph_cache
+
+    # Each glyph is rasterized once per size and reused for every pass
+    cache = get_glyph_cache(font_path)
+    with stage("glyph_masks"):
+        masks = [cache.get(g, size) for g in glyphs]
+    with stage("layout"):
+        layout = GlyphLayout.from_bboxes([ord(g) for g in glyphs], [bbox for _, bbox in masks], direction, padding,
+                                         extra_padding if shen else 0)
+        placements = layout.placements()
+    count("glyphs", len(glyphs))
+    return RenderPlan(layout.W, layout.H, placements, masks, direction, size, padding, shen, line_width,
+                      extra_padding, tuple(base_color), seed, light_angle, carve_depth, layout)
+
+def glyphs_in_range(plan, start, stop):
+    """Return the (first, last + 1) glyph indexes whose ink may overlap [start, stop) on the main axis.
+
+    Two binary searches over running bounds of the ink boxes (see GlyphLayout.span).
+    """
+    return plan.layout.span(start, stop)
+
+def region_coverage(plan, region):
+    """Return the uint8 glyph (and shen ring) coverage mask for region=(x0, y0, x1, y1)."""
+    # Only glyphs whose ink box meets the region on both axes: a full-width band skips the rest
+    hits = plan.layout.query(region).tolist()
+    coverage = coverage_mask([plan.placements[i] for i in hits], [plan.masks[i] for i in hits], region)
+    if plan.shen:
+        ring = shen_region_mask(plan.direction, plan.W, plan.H, plan.line_width, plan.padding, region)
+        np.maximum(coverage, ring, out=coverage)
+    return coverage
+
+def render_region(plan, region, out=None):
+    """Render the window region=(x0, y0, x1, y1) of the canvas as an (h, w, 3) array.
+
+    Coverage is taken with a carve halo around the region, so tiling regions
+    reproduces the full render exactly. out may be an (h, w, 3) uint8 array to
+    render into in place, including a view into a larger canvas.
+    """
+    x0, y0, x1, y1 = region
+    halo = carve_halo(plan.light_angle, plan.carve_depth)
+    ex0, ey0 = max(x0 - halo, 0), max(y0 - halo, 0)
+    ex1, ey1 = min(x1 + halo, plan.W), min(y1 + halo, plan.H)
+
+    with stage("texture"):
+        canvas = sandstone_texture((plan.W, plan.H), plan.base_color, seed=plan.seed, region=region, out=out)
+    shadow, highlight, _ = carve_colors(plan.base_color)
+
+    # Carve every glyph and the ring from one coverage mask in a single vectorized pass
+    with stage("coverage"):
+        coverage = region_coverage(plan, (ex0, ey0, ex1, ey1))
+    with stage("carve"):
+        carve(canvas, coverage, shadow, highlight, plan.base_color, plan.light_angle, plan.carve_depth,
+              window=(x0 - ex0, y0 - ey0, x1 - ex0, y1 - ey0))
+    return canvas
+
+def render_inscription(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                       output="image", format="PNG", base_color=BG, line_width=LINE_WIDTH,
+                       extra_padding=EXTRA_PADDING, font_path=FONT_PATH, light_angle=LIGHT_ANGLE,
+                       carve_depth=CARVE_DEPTH, encoder=None):
+    """Render an inscription in memory, with no prompts and no files.
+
+    glyphs may be a list of glyphs or a raw string for parse_glyph_input.
+    output selects the return type: "image" (PIL Image), "array" (HxWx3
+    uint8 ndarray, the render buffer itself) or "bytes" (the image encoded as
+    `format` into a BytesIO, or with the encoding.py profile named by
+    encoder). light_angle and carve_depth tune the bevel.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {', '.join(OUTPUTS)}")
+    plan = plan_inscription(glyphs, direction, size, padding, shen, seed, base_color, line_width,
+                            extra_padding, font_path, light_angle, carve_depth)
+    canvas = render_region(plan, (0, 0, plan.W, plan.H))
+
+    if output == "array":
+        return canvas
+    img = Image.fromarray(canvas, mode="RGB")
+    if output == "bytes":
+        buffer = io.BytesIO()
+        if encoder is not None:
+            encode_image(img, buffer, encoder)
+        else:
+            with stage("encode"):
+                img.save(buffer, format=format)
+        return buffer.getvalue()
+    return img
@@ -0,0 +1,104 @@
+"""Array-backed glyph layout with span, rectangle and point queries.
+
+A GlyphLayout keeps one row per glyph in a numpy structured array: the
+codepoint, the draw.text origin, the ink box relative to it (as
+font.getbbox) and the resulting ink rect on the canvas. Both directions are
+laid out by the same vectorized code. Glyphs advance along the main axis, so
+finding the glyphs in a span, a rectangle or under a pixel is a binary
+search over running bounds of the ink starts and ends, then a check of the
+few candidates: O(log n) however long the inscription.
+"""
+import numpy as np
+
+# --- Parameters ---
+DIRECTIONS = ("horizontal", "vertical")
+
+LAYOUT_DTYPE = np.dtype([
+    ("codepoint", "<u4"),
+    ("x", "<i4"), ("y", "<i4"),   # draw.text origin on the canvas
+    ("bbox", "<i4", (4,)),        # ink box relative to the origin, as font.getbbox
+    ("ink", "<i4", (4,)),         # ink rect on the canvas: (x0, y0, x1, y1)
+])
+
+class GlyphLayout:
+    """Placed glyphs of one inscription, as arrays."""
+
+    def __init__(self, rows, W, H, direction):
+        self.rows = rows
+        self.W = W
+        self.H = H
+        self.direction = direction
+        self.axis = 0 if direction == "horizontal" else 1
+        self.starts = np.ascontiguousarray(rows["ink"][:, self.axis])
+        self.ends = np.ascontiguousarray(rows["ink"][:, 2 + self.axis])
+        # Starts and ends need not grow along the axis (bearings differ); the running maximum of
+        # the ends and the running minimum of the starts from the far end do, and bound the search
+        self._reach = np.maximum.accumulate(self.ends) if len(rows) else self.ends
+        self._first = np.minimum.accumulate(self.starts[::-1])[::-1] if len(rows) else self.starts
+
+    @classmethod
+    def from_bboxes(cls, codepoints, bboxes, direction, padding, extra_padding=0):
+        """Lay glyphs out from their ink bboxes; extra_padding widens the main axis only."""
+        if direction not in DIRECTIONS:
+            raise ValueError("direction must be 'horizontal' or 'vertical'")
+        n = len(bboxes)
+        if not n:
+            raise ValueError("At least one glyph is required.")
+        bbox = np.asarray(bboxes, dtype=np.int64).reshape(n, 4)
+        widths = bbox[:, 2] - bbox[:, 0]
+        heights = bbox[:, 3] - bbox[:, 1]
+
+        # Each glyph starts one padding after the previous one's box along the main axis
+        if direction == "horizontal":
+            W = int(widths.sum() + padding * (n + 1) + extra_padding * 2)
+            H = int(heights.max() + padding * 2)
+            x = padding + extra_padding + np.concatenate(([0], np.cumsum(widths + padding)[:-1]))
+            y = (H - heights) // 2 - bbox[:, 1]  # baseline position adjusted by top bearing
+        else:
+            W = int(widths.max() + padding * 2)
+            H = int(heights.sum() + padding * (n + 1) + extra_padding * 2)
+            x = (W - widths) // 2 - bbox[:, 0]  # horizontally center, adjusted by left bearing
+            y = padding + extra_padding + np.concatenate(([0], np.cumsum(heights + padding)[:-1])) - bbox[:, 1]
+
+        rows = np.zeros(n, dtype=LAYOUT_DTYPE)
+        rows["codepoint"] = codepoints
+        rows["x"], rows["y"], rows["bbox"] = x, y, bbox
+        rows["ink"] = bbox + np.stack([x, y, x, y], axis=1)
+        return cls(rows, W, H, direction)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def glyphs(self) -> list[str]:
+        return [chr(c) for c in self.rows["codepoint"].tolist()]
+
+    def placements(self) -> list:
+        """(glyph, x, y, bbox) per glyph, as layout_glyphs returns them."""
+        return [(glyph, x, y, tuple(bbox)) for glyph, x, y, bbox in
+                zip(self.glyphs, self.rows["x"].tolist(), self.rows["y"].tolist(), self.rows["bbox"].tolist())]
+
+    # --- Queries ---
+
+    def span(self, start, stop) -> tuple[int, int]:
+        """(first, last + 1) of the glyphs whose ink may overlap [start, stop) on the main axis.
+
+        Every glyph that does overlap is in the range; with ink that doesn't
+        reach past its neighbours' (the usual case) exactly those are.
+        """
+        first = int(np.searchsorted(self._reach, start, side="right"))
+        last = int(np.searchsorted(self._first, stop, side="left"))
+        return first, max(first, last)
+
+    def query(self, rect) -> np.ndarray:
+        """Indexes of the glyphs whose ink intersects rect=(x0, y0, x1, y1)."""
+        x0, y0, x1, y1 = rect
+        first, last = self.span(rect[self.axis], rect[2 + self.axis])
+        ink = self.rows["ink"][first:last]
+        hit = (ink[:, 0] < x1) & (ink[:, 2] > x0) & (ink[:, 1] < y1) & (ink[:, 3] > y0)
+        return first + np.flatnonzero(hit)
+
+    def glyph_at(self, x, y):
+        """Index of the glyph whose ink box holds pixel (x, y), or None."""
+        hits = self.query((x, y, x + 1, y + 1))
+        return int(hits[0]) if len(hits) else None
@@ -0,0 +1,157 @@
+"""Precomputed glyph metrics for the Egyptian Hieroglyphs block.
+
+    python metrics.py --sizes 64 240 1024
+
+For each size the bbox, advance and presence of every codepoint that
+parse_glyph_input accepts (U+13000-U+1342F) is measured once from the
+bundled font and stored as a small .npy table. Tables are loaded with mmap,
+so canvas sizing needs neither FreeType nor the TTF.
+
+The size-240 table ships in fonts/metrics/; this script writes more there.
+A size with no table is measured on first use and cached under the user's
+cache directory (INSCRIPTION_CACHE_DIR, else $XDG_CACHE_HOME or ~/.cache),
+never inside the package.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from inscription import EXTRA_PADDING, FONT_PATH, PADDING, SIZE
+from layout import GlyphLayout
+
+# --- Parameters ---
+BLOCK_START = 0x13000
+BLOCK_END = 0x1342F
+METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "metrics")  # shipped tables
+CACHE_DIR = os.path.join(os.environ.get("INSCRIPTION_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "egypt-inscription"), "metrics")
+
+METRICS_DTYPE = np.dtype([
+    ("x0", "<i2"), ("y0", "<i2"),  # ink bbox as returned by font.getbbox
+    ("x1", "<i2"), ("y1", "<i2"),
+    ("advance", "<f4"),            # horizontal advance (font.getlength)
+    ("present", "u1"),             # 0 when the font falls back to .notdef
+])
+
+_tables = {}
+
+# --- Building ---
+
+def build_metrics(size, font_path=FONT_PATH):
+    """Measure every codepoint in the block with FreeType."""
+    from inscription import load_font
+
+    font = load_font(size, font_path)
+    notdef = chr(0xE000)  # private use, never mapped by the Noto font
+    notdef_key = (font.getbbox(notdef), bytes(font.getmask(notdef)))
+
+    table = np.zeros(BLOCK_END - BLOCK_START + 1, dtype=METRICS_DTYPE)
+    for i in range(len(table)):
+        glyph = chr(BLOCK_START + i)
+        bbox = font.getbbox(glyph)
+        table[i] = (*bbox, font.getlength(glyph), 1)
+        if bbox == notdef_key[0] and bytes(font.getmask(glyph)) == notdef_key[1]:
+            table[i]["present"] = 0
+    return table
+
+def metrics_path(size, font_path=FONT_PATH, directory=METRICS_DIR):
+    stem = os.path.splitext(os.path.basename(font_path))[0]
+    return os.path.join(directory, f"{stem}-{size}.npy")
+
+def save_metrics(size, font_path=FONT_PATH, directory=METRICS_DIR):
+    """Build the table for a size and write it to directory. Returns the path."""
+    path = metrics_path(size, font_path, directory)
+    os.makedirs(directory, exist_ok=True)
+    # Write then rename, so a process loading the table never sees half of it
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        np.save(f, build_metrics(size, font_path))
+    os.replace(temp, path)
+    return path
+
+def load_metrics(size, font_path=FONT_PATH, directory=None, build=True):
+    """Return the metrics table for a size, memory-mapped from disk.
+
+    Looks in directory, or by default in METRICS_DIR and then CACHE_DIR.
+    A missing table is built (and saved to directory or CACHE_DIR when
+    writable) unless build is False, in which case FileNotFoundError is raised.
+    """
+    key = (font_path, size)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+    directories = [directory] if directory is not None else [METRICS_DIR, CACHE_DIR]
+    for path in (metrics_path(size, font_path, d) for d in directories):
+        if os.path.exists(path):
+            break
+    else:
+        if not build:
+            raise FileNotFoundError(f"No metrics table for size {size}: {path}")
+        try:
+            path = save_metrics(size, font_path, directories[-1])
+        except OSError:
+            table = _tables[key] = build_metrics(size, font_path)
+            return table
+    table = _tables[key] = np.load(path, mmap_mode="r")
+    return table
+
+# --- Queries ---
+
+def glyph_rows(glyphs, size, font_path=FONT_PATH):
+    """Return the metrics rows for a glyph list as a structured array."""
+    table = load_metrics(size, font_path)
+    codes = np.fromiter((ord(g) for g in glyphs), dtype=np.int64, count=len(glyphs))
+    outside = (codes < BLOCK_START) | (codes > BLOCK_END)
+    if not outside.any():
+        return table[codes - BLOCK_START]
+
+    # Hex input may name codepoints outside the block; measure those directly
+    from inscription import load_font
+
+    font = load_font(size, font_path)
+    rows = np.zeros(len(codes), dtype=METRICS_DTYPE)
+    rows[~outside] = table[codes[~outside] - BLOCK_START]
+    for i in np.flatnonzero(outside):
+        glyph = glyphs[i]
+        rows[i] = (*font.getbbox(glyph), font.getlength(glyph), 1)
+    return rows
+
+def glyph_bboxes(glyphs, size, font_path=FONT_PATH) -> list[tuple]:
+    """Ink bboxes for layout_glyphs, same values as font.getbbox."""
+    rows = glyph_rows(glyphs, size, font_path)
+    return [tuple(int(v) for v in row) for row in rows[["x0", "y0", "x1", "y1"]].tolist()]
+
+def bearings(glyphs, size, font_path=FONT_PATH):
+    """Return (left, top, right) bearings per glyph as int arrays."""
+    rows = glyph_rows(glyphs, size, font_path)
+    right = np.rint(rows["advance"]).astype(np.int32) - rows["x1"]
+    return rows["x0"].astype(np.int32), rows["y0"].astype(np.int32), right
+
+def glyph_layout(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False,
+                 extra_padding=EXTRA_PADDING, font_path=FONT_PATH) -> GlyphLayout:
+    """The GlyphLayout plan_inscription will build, without the TTF."""
+    rows = glyph_rows(glyphs, size, font_path)
+    bboxes = np.stack([rows["x0"], rows["y0"], rows["x1"], rows["y1"]], axis=1)
+    return GlyphLayout.from_bboxes([ord(g) for g in glyphs], bboxes, direction, padding,
+                                   extra_padding if shen else 0)
+
+def canvas_size(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False,
+                extra_padding=EXTRA_PADDING, font_path=FONT_PATH) -> tuple[int, int]:
+    """Return the (W, H) render_inscription will produce, without the TTF."""
+    layout = glyph_layout(glyphs, direction, size, padding, shen, extra_padding, font_path)
+    return layout.W, layout.H
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build glyph metrics tables for the bundled font.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[SIZE], help="glyph sizes to build")
+    parser.add_argument("--font", default=FONT_PATH, help="font file to measure")
+    parser.add_argument("--out-dir", default=METRICS_DIR, help="directory for the .npy tables")
+    args = parser.parse_args(argv)
+    for size in args.sizes:
+        print(save_metrics(size, args.font, args.out_dir))
+
+if __name__ == "__main__":
+    main()
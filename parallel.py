@@ -0,0 +1,67 @@
+"""Render one large inscription on every core.
+
+The canvas lives in a multiprocessing.shared_memory block. Worker processes
+each render bands across the long axis of the canvas (with the carve halo
+handled by render_region) straight into their slice of that block, so
+neither the workers nor the parent copy or stitch bands.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+from inscription import BG, PADDING, SIZE, plan_inscription, render_region
+
+# --- Parameters ---
+BANDS_PER_WORKER = 4   # more bands than workers evens out glyph-dense and empty rows
+
+_worker = {}
+
+def _init_worker(shm_name, plan):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm  # keep the mapping alive for the life of the worker
+    _worker["canvas"] = np.ndarray((plan.H, plan.W, 3), dtype=np.uint8, buffer=shm.buf)
+    _worker["plan"] = plan
+
+def _render_band(region):
+    x0, y0, x1, y1 = region
+    render_region(_worker["plan"], region, out=_worker["canvas"][y0:y1, x0:x1])
+    return region
+
+def split_bands(W, H, bands):
+    """Split the canvas into up to `bands` (x0, y0, x1, y1) bands across its longer side.
+
+    Cutting across the long side keeps each band's halo small relative to it.
+    """
+    length = max(W, H)
+    edges = np.linspace(0, length, min(bands, length) + 1).astype(int)
+    spans = [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+    if W >= H:
+        return [(a, 0, b, H) for a, b in spans]
+    return [(0, a, W, b) for a, b in spans]
+
+def render_parallel(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                    base_color=BG, workers=None, output="image"):
+    """Render an inscription across `workers` processes. Returns an Image or an ndarray."""
+    plan = plan_inscription(glyphs, direction, size, padding, shen, seed, base_color)
+    workers = workers or os.cpu_count() or 1
+    bands = split_bands(plan.W, plan.H, workers * BANDS_PER_WORKER)
+
+    shm = shared_memory.SharedMemory(create=True, size=plan.W * plan.H * 3)
+    canvas = None
+    try:
+        canvas = np.ndarray((plan.H, plan.W, 3), dtype=np.uint8, buffer=shm.buf)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, plan)) as pool:
+            for _ in pool.map(_render_band, bands):
+                pass
+        # The shared block is released below, so hand back a private copy
+        if output == "array":
+            return canvas.copy()
+        return Image.fromarray(canvas, mode="RGB")
+    finally:
+        del canvas
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,131 @@
+"""Offline phonetic name converter: Latin spelling to uniliteral hieroglyphs.
+
+    python phonetic.py Cleopatra "Ramses II"
+    python phonetic.py --file names.txt --manifest names.jsonl    # then: python batch.py names.jsonl
+
+Names are spelled with the uniliteral ("alphabet") signs, the way names are
+put in a cartouche: the lower-cased, accent-stripped name is matched
+longest-first against a trie of letter groups, so "sh", "kh" and "ph" take
+their own signs before single letters do. The table is written in Gardiner
+codes and compiled to glyphs once; conversions are memoized, so repeat
+names cost a dictionary lookup. Nothing here touches the network.
+"""
+import argparse
+import json
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+from corpus import mdc_codes
+
+# --- Parameters ---
+UNILITERALS = {   # spelling -> Gardiner codes, space-separated
+    "a": "G1", "b": "D58", "c": "V31", "d": "D46", "e": "M17", "f": "I9", "g": "W11", "h": "O4",
+    "i": "M17", "j": "I10", "k": "V31", "l": "E23", "m": "G17", "n": "N35", "o": "G43", "p": "Q3",
+    "q": "N29", "r": "D21", "s": "S29", "t": "X1", "u": "G43", "v": "I9", "w": "G43", "x": "V31 S29",
+    "y": "M17a", "z": "O34",
+    # Letter groups with a sign of their own
+    "ch": "V13", "tj": "V13", "dj": "I10", "sh": "N37", "kh": "Aa1", "ph": "I9", "ck": "V31",
+    "qu": "N29 G43", "ee": "M17a", "ie": "M17a", "oo": "G43", "ou": "G43",
+    # A soft c reads as s
+    "ce": "S29 M17", "ci": "S29 M17", "cy": "S29 M17a",
+}
+SEPARATORS = " -'’."       # skipped between name parts
+CACHE_SIZE = 4096
+
+# --- Table ---
+
+@lru_cache(maxsize=1)
+def phoneme_trie() -> dict:
+    """Character trie of UNILITERALS with compiled glyphs; the "" key of a node ends a spelling."""
+    codes = mdc_codes()
+    trie = {}
+    for spelling, gardiner in UNILITERALS.items():
+        node = trie
+        for char in spelling:
+            node = node.setdefault(char, {})
+        node[""] = tuple(codes[code.lower()] for code in gardiner.split())
+    return trie
+
+def normalize_name(name) -> str:
+    """Lower-case and strip accents: "Séti" -> "seti"."""
+    decomposed = unicodedata.normalize("NFKD", name.strip().lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+# --- Conversion ---
+
+@lru_cache(maxsize=CACHE_SIZE)
+def name_to_glyphs(name) -> tuple[str, ...]:
+    """Spell a name in uniliteral signs. Raises ValueError on characters with no sign (digits, symbols)."""
+    text = normalize_name(name)
+    trie = phoneme_trie()
+    glyphs = []
+    i = 0
+    while i < len(text):
+        if text[i] in SEPARATORS:
+            i += 1
+            continue
+        node, match, end = trie, None, i
+        for j in range(i, len(text)):
+            node = node.get(text[j])
+            if node is None:
+                break
+            if "" in node:
+                match, end = node[""], j + 1
+        if match is None:
+            raise ValueError(f"No sign for '{text[i]}' in name {name!r} (position {i + 1})")
+        glyphs.extend(match)
+        i = end
+    if not glyphs:
+        raise ValueError("Name is empty.")
+    return tuple(glyphs)
+
+def convert_names(names):
+    """Bulk mode: yield (name, glyphs or None, error or None) for an iterable of names, skipping blank lines."""
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            yield name, name_to_glyphs(name), None
+        except ValueError as e:
+            yield name, None, str(e)
+
+def name_filename(name) -> str:
+    """A file name (no suffix) that is_valid_filename accepts, made from a name."""
+    return re.sub(r"[^\w\- ]+", "_", normalize_name(name)).strip()[:100] or "name"
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spell names in hieroglyphs, offline.")
+    parser.add_argument("names", nargs="*", help="names to convert")
+    parser.add_argument("--file", help="text file with one name per line")
+    parser.add_argument("--manifest", help="write a batch.py manifest (JSONL, shen on) instead of printing")
+    args = parser.parse_args(argv)
+
+    names = list(args.names)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            names += f.read().splitlines()
+    errors = 0
+    out = open(args.manifest, "w", encoding="utf-8") if args.manifest else sys.stdout
+    try:
+        for name, glyphs, error in convert_names(names):
+            if error:
+                errors += 1
+                print(f"Error: {error}", file=sys.stderr)
+            elif args.manifest:
+                row = {"glyphs": "".join(glyphs), "direction": "horizontal", "shen": True,
+                       "filename": name_filename(name)}
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            else:
+                out.write(f"{name}\t{''.join(glyphs)}\n")
+    finally:
+        if args.manifest:
+            out.close()
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
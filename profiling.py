@@ -0,0 +1,191 @@
+"""Optional per-stage instrumentation of the render pipeline.
+
+    with Profiler(memory=True) as prof:
+        render_inscription("𓏙𓋹𓎃", shen=True, output="bytes")
+    print(prof.to_json())
+
+Pipeline code marks its stages with `with stage("texture"):` and its events
+with `count("glyph_cache_hits")`. With no Profiler active these are a
+context-variable lookup and nothing else. An active Profiler records wall
+time, CPU time and (with memory=True) the tracemalloc peak of each stage,
+plus the process's peak RSS. Reports from many renders are combined with
+aggregate().
+"""
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current = contextvars.ContextVar("profiler", default=None)
+_NULL = nullcontext()
+
+# --- Hooks used by the pipeline ---
+
+def stage(name):
+    """Context manager timing the named stage under the active Profiler, if any."""
+    profiler = _current.get()
+    if profiler is None:
+        return _NULL
+    return profiler.stage(name)
+
+def count(name, n=1):
+    """Add n to the named counter of the active Profiler, if any."""
+    profiler = _current.get()
+    if profiler is not None:
+        profiler.counters[name] = profiler.counters.get(name, 0) + n
+
+def max_rss_bytes():
+    """Peak resident set size of this process, or None where it can't be read."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # macOS reports bytes, Linux KiB
+
+# --- Profiler ---
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        p = self.profiler
+        if p.memory:
+            # Fold the running peak into the enclosing stage before resetting it for this one
+            if p._stack:
+                p._stack[-1].peak = max(p._stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            self.base = tracemalloc.get_traced_memory()[0]
+            self.peak = 0
+            tracemalloc.reset_peak()
+        p._stack.append(self)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        p = self.profiler
+        p._stack.pop()
+        with p._lock:
+            entry = p.stages.get(self.name)
+            if entry is None:
+                entry = p.stages[self.name] = {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0}
+            entry["calls"] += 1
+            entry["wall_ms"] += wall * 1000
+            entry["cpu_ms"] += cpu * 1000
+            if p.memory:
+                peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak - self.base)
+                if p._stack:
+                    p._stack[-1].peak = max(p._stack[-1].peak, peak)
+        return False
+
+class Profiler:
+    """Collects stage timings and counters while active (as a context manager).
+
+    Stages may also run on helper threads given a copy of the caller's
+    context (contextvars.copy_context); each thread nests its own stages.
+    CPU time is the whole process's.
+    """
+
+    def __init__(self, memory=False, label=None):
+        self.memory = memory
+        self.label = label
+        self.stages = {}
+        self.counters = {}
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._token = None
+        self._started_tracing = False
+
+    @property
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _current.set(self)
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_ms += (time.perf_counter() - self._wall) * 1000
+        self.cpu_ms += (time.process_time() - self._cpu) * 1000
+        _current.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def report(self) -> dict:
+        report = {
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "stages": {name: {k: round(v, 3) if isinstance(v, float) else v for k, v in entry.items()}
+                       for name, entry in self.stages.items()},
+            "counters": dict(self.counters),
+            "max_rss_bytes": max_rss_bytes(),
+            "pid": os.getpid(),
+        }
+        if self.label is not None:
+            report["label"] = self.label
+        return report
+
+    def to_json(self) -> str:
+        """The report as one JSON line, for structured logs."""
+        return json.dumps(self.report(), ensure_ascii=False, separators=(",", ":"))
+
+# --- Aggregation ---
+
+def aggregate(reports) -> dict:
+    """Combine per-render reports: summed times and counters, worst peaks, per-stage means."""
+    total = {"renders": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "stages": {}, "counters": {}, "max_rss_bytes": None}
+    rss = {}
+    for report in reports:
+        total["renders"] += 1
+        total["wall_ms"] += report["wall_ms"]
+        total["cpu_ms"] += report["cpu_ms"]
+        for name, entry in report["stages"].items():
+            agg = total["stages"].setdefault(name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            agg["calls"] += entry["calls"]
+            agg["wall_ms"] += entry["wall_ms"]
+            agg["cpu_ms"] += entry["cpu_ms"]
+            if "peak_bytes" in entry:
+                agg["peak_bytes"] = max(agg.get("peak_bytes", 0), entry["peak_bytes"])
+        for name, n in report["counters"].items():
+            total["counters"][name] = total["counters"].get(name, 0) + n
+        if report.get("max_rss_bytes") is not None:
+            rss[report.get("pid")] = max(rss.get(report.get("pid"), 0), report["max_rss_bytes"])
+
+    # Each worker process reports its own peak; the worst one is what a machine must fit
+    total["max_rss_bytes"] = max(rss.values()) if rss else None
+    for entry in total["stages"].values():
+        entry["mean_ms"] = entry["wall_ms"] / entry["calls"] if entry["calls"] else 0.0
+        for key in ("wall_ms", "cpu_ms", "mean_ms"):
+            entry[key] = round(entry[key], 3)
+    total["wall_ms"] = round(total["wall_ms"], 3)
+    total["cpu_ms"] = round(total["cpu_ms"], 3)
+    # Slowest stages first, so the hot path is at the top of the report
+    total["stages"] = dict(sorted(total["stages"].items(), key=lambda kv: -kv[1]["wall_ms"]))
+    return total
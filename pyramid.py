@@ -0,0 +1,164 @@
+"""Image pyramids and deep-zoom tiles from a single render.
+
+    python pyramid.py cartouche.png --glyphs "𓏙𓋹𓎃" --shen --levels 3
+    python pyramid.py frieze.png --glyphs frieze.txt --glyph-file --tiles dzi
+
+The inscription is rendered once at full size and every smaller image comes
+from a chain of 2x box reductions of the one above it, so a thumbnail,
+preview and full image together cost about 4/3 of one render instead of
+three renders. Level k is 1/2**k of the full size (rounded up), and is
+written as <name>_<k> beside the full image. --tiles also cuts the chain
+into a Deep Zoom (.dzi) or XYZ ({z}/{x}/{y}) tile set, with the tiles
+encoded and written on a thread pool.
+"""
+import argparse
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from corpus import read_glyph_file
+from encoding import encode_image
+from glyph_input import PROFILE_SUFFIXES, output_filename, split_image_name
+from inscription import BG, PADDING, SIZE, parse_glyph_input, render_inscription
+from profiling import stage
+
+# --- Parameters ---
+TILE_SIZE = 254              # Deep Zoom's usual tile size; with the overlap a tile is at most 256 wide
+TILE_OVERLAP = 1             # pixels shared with each neighbouring Deep Zoom tile
+XYZ_TILE_SIZE = 256
+TILE_ENCODER = "fastest"     # tiles are many and small; palette PNG at zlib level 1 keeps them quick
+
+# --- Pyramid ---
+
+def downsample_chain(img, levels=None, min_size=1):
+    """Return [img, img/2, img/4, ...], each a 2x box reduction of the one before.
+
+    Stops after `levels` images, or once the longer side is down to min_size.
+    """
+    chain = [img]
+    while (levels is None or len(chain) < levels) and max(chain[-1].size) > min_size:
+        with stage("downsample"):
+            chain.append(chain[-1].reduce(2))
+    return chain
+
+def render_pyramid(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                   base_color=BG, levels=3) -> list:
+    """Render once at `size` and return `levels` PIL images, full size first."""
+    img = render_inscription(glyphs, direction, size, padding, shen, seed, base_color=base_color)
+    return downsample_chain(img, levels)
+
+def level_filename(file_name, level) -> str:
+    """File name of pyramid level `level`; level 0 is file_name itself."""
+    if level == 0:
+        return file_name
+    base, suffix = split_image_name(file_name)
+    return f"{base}_{level}{suffix}"
+
+# --- Tiles ---
+
+def dzi_tiles(width, height, tile_size=TILE_SIZE, overlap=TILE_OVERLAP):
+    """Yield (column, row, box) for one Deep Zoom level of this size."""
+    for row in range(math.ceil(height / tile_size)):
+        for column in range(math.ceil(width / tile_size)):
+            x, y = column * tile_size, row * tile_size
+            yield column, row, (max(x - overlap, 0), max(y - overlap, 0),
+                                min(x + tile_size + overlap, width), min(y + tile_size + overlap, height))
+
+def _write_tiles(jobs, encoder, workers):
+    """Encode and write (image, box, path) jobs on a thread pool; Pillow releases the GIL while encoding."""
+    def write(job):
+        img, box, path = job
+        encode_image(img.crop(box), path, encoder)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(write, jobs):
+            pass
+
+def write_dzi(img, path, tile_size=TILE_SIZE, overlap=TILE_OVERLAP, encoder=TILE_ENCODER, workers=None) -> int:
+    """Write img as a Deep Zoom image: path (the .dzi file) and its <name>_files directory.
+
+    Returns the number of tiles written.
+    """
+    suffix = PROFILE_SUFFIXES[encoder]
+    base = path.removesuffix(".dzi")
+    top = math.ceil(math.log2(max(img.size))) if max(img.size) > 1 else 0
+    chain = downsample_chain(img, top + 1)
+
+    jobs = []
+    for k, level in enumerate(chain):
+        directory = os.path.join(f"{base}_files", str(top - k))
+        os.makedirs(directory, exist_ok=True)
+        for column, row, box in dzi_tiles(*level.size, tile_size, overlap):
+            jobs.append((level, box, os.path.join(directory, f"{column}_{row}{suffix}")))
+    _write_tiles(jobs, encoder, workers)
+
+    with open(base + ".dzi", "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{suffix[1:]}" '
+                f'Overlap="{overlap}" TileSize="{tile_size}">\n'
+                f'  <Size Width="{img.width}" Height="{img.height}"/>\n'
+                '</Image>\n')
+    return len(jobs)
+
+def write_xyz(img, directory, tile_size=XYZ_TILE_SIZE, encoder=TILE_ENCODER, workers=None) -> int:
+    """Write img as {z}/{x}/{y} tiles under directory; zoom 0 fits the whole image in one tile.
+
+    Edge tiles are cropped rather than padded. Returns the number of tiles written.
+    """
+    suffix = PROFILE_SUFFIXES[encoder]
+    top = max(math.ceil(math.log2(max(img.size) / tile_size)), 0)
+    chain = downsample_chain(img, top + 1)
+
+    jobs = []
+    for k, level in enumerate(chain):
+        z = top - k
+        for column, row, box in dzi_tiles(*level.size, tile_size, 0):
+            column_dir = os.path.join(directory, str(z), str(column))
+            os.makedirs(column_dir, exist_ok=True)
+            jobs.append((level, box, os.path.join(column_dir, f"{row}{suffix}")))
+    _write_tiles(jobs, encoder, workers)
+    return len(jobs)
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render once and write a pyramid of sizes and/or zoom tiles.")
+    parser.add_argument("output", help="file name of the full-size image (.png or .webp)")
+    parser.add_argument("--glyphs", required=True, help="glyphs or Unicode hex, as at the prompt")
+    parser.add_argument("--glyph-file", action="store_true", help="treat --glyphs as a text file (glyphs, hex or MdC codes, see corpus.py)")
+    parser.add_argument("--direction", default="H", choices=("H", "V"), help="horizontal or vertical")
+    parser.add_argument("--shen", action="store_true", help="draw the shen ring")
+    parser.add_argument("--size", type=int, default=SIZE, help="glyph height of the full-size image")
+    parser.add_argument("--seed", type=int, help="stone texture seed")
+    parser.add_argument("--levels", type=int, default=3, help="images written, full size first (0: none)")
+    parser.add_argument("--encoder", choices=tuple(PROFILE_SUFFIXES),
+                        help="encoder profile for the images (default: from the file suffix)")
+    parser.add_argument("--tiles", choices=("dzi", "xyz"), help="also write a Deep Zoom or XYZ tile set")
+    parser.add_argument("--tile-encoder", choices=tuple(PROFILE_SUFFIXES), default=TILE_ENCODER,
+                        help="encoder profile for the tiles")
+    parser.add_argument("--workers", type=int, help="tile writer threads")
+    args = parser.parse_args(argv)
+
+    output_file, encoder = output_filename(args.output, args.encoder)
+    if args.glyph_file:
+        glyphs = read_glyph_file(args.glyphs)
+    else:
+        glyphs = parse_glyph_input(args.glyphs)
+    direction = "vertical" if args.direction == "V" else "horizontal"
+
+    img = render_inscription(glyphs, direction, args.size, shen=args.shen, seed=args.seed)
+    for level, image in enumerate(downsample_chain(img, args.levels) if args.levels > 0 else []):
+        name = level_filename(output_file, level)
+        encode_image(image, name, encoder)
+        print(f"Image saved as {name} ({image.width}x{image.height})")
+
+    base = split_image_name(output_file)[0]
+    if args.tiles == "dzi":
+        count = write_dzi(img, base + ".dzi", encoder=args.tile_encoder, workers=args.workers)
+        print(f"Deep Zoom image saved as {base}.dzi ({count} tiles in {base}_files)")
+    elif args.tiles == "xyz":
+        count = write_xyz(img, base + "_tiles", encoder=args.tile_encoder, workers=args.workers)
+        print(f"XYZ tiles saved under {base}_tiles ({count} tiles)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Content-addressed cache of encoded renders.
+
+A render is keyed by a SHA-256 of every input that changes its pixels: the
+glyph codepoints, direction, size, padding, stone colour, shen flag and ring
+geometry, bevel settings, texture seed and a digest of the font file. Hits
+come from a byte-bounded in-memory LRU first, then from a size-capped
+directory of files evicted least recently used first. Processes sharing a
+directory rescan it before evicting and after writing a sixteenth of the
+cap, so together they overshoot it by at most that much each.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+from carving import CARVE_DEPTH, LIGHT_ANGLE
+from inscription import (BG, EXTRA_PADDING, FONT_PATH, LINE_WIDTH, PADDING, SIZE, parse_glyph_input,
+                         render_inscription)
+from profiling import count, stage
+from texture import DEFAULT_SEED
+
+# --- Parameters ---
+MAX_MEMORY_BYTES = 64 * 1024 * 1024    # encoded renders held in memory
+MAX_DISK_BYTES = 1024 * 1024 * 1024    # encoded renders kept in the cache directory
+KEY_VERSION = 1                        # bump when the renderer's output changes for the same inputs
+DISK_SYNC_FRACTION = 1 / 16            # rescan the directory after writing this share of max_disk_bytes
+
+_font_digests = {}
+
+# --- Keys ---
+
+def font_digest(font_path=FONT_PATH) -> str:
+    """SHA-256 of the font file, recomputed only when its size or mtime changes."""
+    stat = os.stat(font_path)
+    key = (os.path.abspath(font_path), stat.st_size, stat.st_mtime_ns)
+    digest = _font_digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(font_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = _font_digests[key] = h.hexdigest()
+    return digest
+
+def render_key(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None, format="PNG",
+               base_color=BG, line_width=LINE_WIDTH, extra_padding=EXTRA_PADDING, font_path=FONT_PATH,
+               light_angle=LIGHT_ANGLE, carve_depth=CARVE_DEPTH, encoder=None) -> str:
+    """Return the hex cache key for a render_inscription call with these arguments."""
+    if isinstance(glyphs, str):
+        glyphs = parse_glyph_input(glyphs)
+    fields = {
+        "v": KEY_VERSION,
+        "glyphs": [ord(g) for g in glyphs],
+        "direction": direction,
+        "size": size,
+        "padding": padding,
+        "shen": bool(shen),
+        # Ring geometry only changes pixels when the ring is drawn
+        "line_width": line_width if shen else None,
+        "extra_padding": extra_padding if shen else None,
+        "seed": DEFAULT_SEED if seed is None else int(seed),
+        "format": format.upper() if encoder is None else f"encoder:{encoder}",
+        "base_color": [int(c) for c in base_color],
+        "light_angle": float(light_angle),
+        "carve_depth": float(carve_depth),
+        "font": font_digest(font_path),
+    }
+    blob = json.dumps(fields, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+# --- Cache ---
+
+class RenderCache:
+    """Two-tier LRU of encoded images: memory, then an optional directory."""
+
+    def __init__(self, cache_dir=None, max_memory_bytes=MAX_MEMORY_BYTES, max_disk_bytes=MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._written = 0              # bytes written since the directory was last scanned
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()   # key -> bytes
+        self._disk = OrderedDict()     # key -> file size, oldest use first
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._sync_disk()
+            self._evict_disk()
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _sync_disk(self):
+        # Recount the directory, which other processes may share. Files this
+        # process has not seen are ordered by modification time (get() touches
+        # files on use) ahead of the ones it has, whose order it knows better.
+        found = {}
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            try:
+                for entry in os.scandir(sub.path):
+                    if entry.is_file() and not entry.name.startswith("."):
+                        stat = entry.stat()
+                        found[entry.name] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue  # removed while we looked
+        known = [(key, found[key][1]) for key in self._disk if key in found]
+        unseen = sorted((mtime, key, nbytes) for key, (mtime, nbytes) in found.items() if key not in self._disk)
+        self._disk = OrderedDict([(key, nbytes) for _, key, nbytes in unseen] + known)
+        self.disk_bytes = sum(self._disk.values())
+        self._written = 0
+
+    def get(self, key):
+        """Return the cached bytes for key, or None."""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            count("render_cache_hits")
+            return data
+        if self.cache_dir:
+            data = self._read_disk(key)
+            if data is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                count("render_cache_hits")
+                self._put_memory(key, data)
+                return data
+        self.misses += 1
+        count("render_cache_misses")
+        return None
+
+    def put(self, key, data):
+        self._put_memory(key, data)
+        if self.cache_dir:
+            self._write_disk(key, data)
+
+    def _put_memory(self, key, data):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= len(old)
+        if len(data) > self.max_memory_bytes:
+            return
+        self._memory[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, old = self._memory.popitem(last=False)
+            self.memory_bytes -= len(old)
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process sharing the directory
+            self._forget_disk(key)
+            return None
+        if key not in self._disk:
+            self.disk_bytes += len(data)
+        self._disk[key] = len(data)
+        self._disk.move_to_end(key)
+        return data
+
+    def _write_disk(self, key, data):
+        if len(data) > self.max_disk_bytes:
+            return
+        directory = os.path.dirname(self._path(key))
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename, so readers in other processes never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._forget_disk(key)
+        self._disk[key] = len(data)
+        self.disk_bytes += len(data)
+        self._written += len(data)
+        if self.disk_bytes > self.max_disk_bytes or self._written > self.max_disk_bytes * DISK_SYNC_FRACTION:
+            self._sync_disk()
+        self._evict_disk()
+
+    def _forget_disk(self, key):
+        nbytes = self._disk.pop(key, None)
+        if nbytes is not None:
+            self.disk_bytes -= nbytes
+
+    def _evict_disk(self):
+        while self.disk_bytes > self.max_disk_bytes and self._disk:
+            key, nbytes = self._disk.popitem(last=False)
+            self.disk_bytes -= nbytes
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Drop the memory tier (the directory is left alone)."""
+        self._memory.clear()
+        self.memory_bytes = 0
+
+    def render(self, glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+               format="PNG", **options):
+        """Return encoded image bytes, rendering and storing them only on a miss.
+
+        Takes the same arguments as render_inscription (output is always bytes).
+        """
+        if isinstance(glyphs, str):
+            glyphs = parse_glyph_input(glyphs)
+        with stage("cache_lookup"):
+            key = render_key(glyphs, direction, size, padding, shen, seed, format, **options)
+            data = self.get(key)
+        if data is None:
+            data = render_inscription(glyphs, direction, size, padding, shen, seed, output="bytes", format=format,
+                                      **options)
+            self.put(key, data)
+        return data
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "memory_entries": len(self._memory), "memory_bytes": self.memory_bytes,
+                "disk_entries": len(self._disk), "disk_bytes": self.disk_bytes}
@@ -0,0 +1,294 @@
+"""Local asyncio HTTP render service.
+
+    python server.py --port 8080 --workers 4
+
+GET  /render?glyphs=𓏙𓋹&direction=H&shen=1   -> image/png
+POST /render  {"glyphs": "...", "direction": "V", "shen": true, "encoder": "webp"}
+GET  /health                                  -> JSON counters
+
+Rendering runs on a bounded process (or thread) pool. Identical requests in
+flight at the same time share one render, and once the render queue is full
+new work is refused with 503 (or 429 for a client over its own limit)
+instead of queueing without bound. With --cache-dir, finished renders are
+kept in a content-addressed cache and repeats skip the pool entirely.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from encoding import PROFILES, content_type
+from inscription import SIZE, load_font, parse_glyph_input, render_inscription
+from render_cache import MAX_DISK_BYTES, MAX_MEMORY_BYTES, RenderCache, render_key
+
+# --- Parameters ---
+MAX_PENDING = 64          # distinct renders queued or running before 503
+MAX_PER_CLIENT = 8        # concurrent requests per client address before 429
+MAX_BODY = 64 * 1024      # request body limit in bytes
+MAX_GLYPHS = 200          # longest inscription accepted per request
+RENDER_TIMEOUT = 30.0     # seconds before a render is answered with 504
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+           503: "Service Unavailable", 504: "Gateway Timeout"}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Rendering ---
+
+def parse_render_params(params) -> tuple:
+    """Validate request fields into a hashable (glyphs, direction, shen, seed, encoder) key."""
+    raw = params.get("glyphs")
+    if not raw or not isinstance(raw, str):
+        raise HTTPError(400, "Missing 'glyphs'.")
+    try:
+        glyphs = parse_glyph_input(raw)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+    if not glyphs:
+        raise HTTPError(400, "Missing 'glyphs'.")
+    if len(glyphs) > MAX_GLYPHS:
+        raise HTTPError(400, f"At most {MAX_GLYPHS} glyphs per request.")
+
+    direction = str(params.get("direction", "H")).strip().upper()
+    if direction not in ("V", "H", "VERTICAL", "HORIZONTAL"):
+        raise HTTPError(400, "Please use 'V' for vertical or 'H' for horizontal.")
+    direction = "vertical" if direction.startswith("V") else "horizontal"
+
+    shen = params.get("shen", False)
+    if not isinstance(shen, bool):
+        shen = str(shen).strip().lower() in ("1", "y", "yes", "true")
+
+    seed = params.get("seed")
+    try:
+        # JSON true would pass int() as 1; a negative seed would fail in the render as a 500
+        if isinstance(seed, bool):
+            raise TypeError
+        seed = int(seed) if seed not in (None, "") else None
+    except (TypeError, ValueError):
+        raise HTTPError(400, "'seed' must be a non-negative integer.")
+    if seed is not None and seed < 0:
+        raise HTTPError(400, "'seed' must be a non-negative integer.")
+
+    encoder = str(params.get("encoder") or "default")
+    if encoder not in PROFILES:
+        raise HTTPError(400, f"'encoder' must be one of {', '.join(PROFILES)}.")
+    return tuple(glyphs), direction, shen, seed, encoder
+
+def render_image(key, size=SIZE) -> bytes:
+    glyphs, direction, shen, seed, encoder = key
+    return render_inscription(list(glyphs), direction, size, shen=shen, seed=seed, output="bytes", encoder=encoder)
+
+def _init_worker(size):
+    load_font(size)
+
+# --- Server ---
+
+class RenderServer:
+    def __init__(self, workers=None, max_pending=MAX_PENDING, max_per_client=MAX_PER_CLIENT, size=SIZE,
+                 use_threads=False, render_timeout=RENDER_TIMEOUT, cache=None):
+        workers = workers or os.cpu_count() or 1
+        if use_threads:
+            self.pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # Plain fork would copy open client sockets into late-started workers
+            # and hold those connections open; forkserver children start clean.
+            context = multiprocessing.get_context("forkserver" if os.name == "posix" else "spawn")
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(size,))
+        self.size = size
+        self.max_pending = max_pending
+        self.max_per_client = max_per_client
+        self.render_timeout = render_timeout
+        self.cache = cache
+        # One thread for cache I/O: keeps disk reads and writes off the event loop, one at a time
+        self.cache_io = ThreadPoolExecutor(max_workers=1) if cache is not None else None
+        self.inflight = {}   # render key -> future shared by every identical request
+        self.clients = {}    # client address -> requests in progress
+        self.stats = {"requests": 0, "renders": 0, "coalesced": 0, "rejected": 0, "errors": 0,
+                      "cached": 0}
+
+    async def render(self, key) -> bytes:
+        """Render key, joining an identical render already in flight."""
+        cache_key = None
+        if self.cache is not None:
+            cache_key, data = await asyncio.get_running_loop().run_in_executor(self.cache_io, self._lookup, key)
+            if data is not None:
+                self.stats["cached"] += 1
+                return data
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if len(self.inflight) >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise HTTPError(503, "Render queue is full, try again shortly.")
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(self.pool, render_image, key, self.size))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+            if cache_key is not None:
+                future.add_done_callback(lambda f: self._store(cache_key, f))
+            self.stats["renders"] += 1
+        try:
+            # shield: one caller timing out must not cancel the render for the others
+            return await asyncio.wait_for(asyncio.shield(future), self.render_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(504, "Render timed out.")
+
+    def _lookup(self, key):
+        """Runs on cache_io. Returns (cache key, cached bytes or None)."""
+        glyphs, direction, shen, seed, encoder = key
+        cache_key = render_key(glyphs, direction, self.size, shen=shen, seed=seed, encoder=encoder)
+        return cache_key, self.cache.get(cache_key)
+
+    def _store(self, cache_key, future):
+        if not future.cancelled() and future.exception() is None:
+            self.cache_io.submit(self.cache.put, cache_key, future.result())
+
+    async def handle(self, method, target, body, client=None):
+        """Answer one request. Returns (status, content_type, body bytes)."""
+        self.stats["requests"] += 1
+        url = urlsplit(target)
+        if url.path == "/health":
+            payload = dict(self.stats, inflight=len(self.inflight))
+            if self.cache is not None:
+                payload["cache"] = self.cache.stats()
+            return 200, "application/json", json.dumps(payload).encode()
+        if url.path != "/render":
+            raise HTTPError(404, "Not found.")
+
+        if method == "GET":
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        elif method == "POST":
+            try:
+                params = json.loads(body or b"{}")
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise HTTPError(400, "Body must be JSON.")
+            if not isinstance(params, dict):
+                raise HTTPError(400, "Body must be a JSON object.")
+        else:
+            raise HTTPError(405, "Use GET or POST.")
+
+        key = parse_render_params(params)
+        active = self.clients.get(client, 0)
+        if client is not None and active >= self.max_per_client:
+            self.stats["rejected"] += 1
+            raise HTTPError(429, "Too many requests from this client.")
+        self.clients[client] = active + 1
+        try:
+            return 200, content_type(key[-1]), await self.render(key)
+        finally:
+            self.clients[client] -= 1
+            if not self.clients[client]:
+                del self.clients[client]
+
+    async def serve_connection(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        client = peer[0] if peer else None
+        try:
+            status, content_type, payload = await self._respond(reader, client)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        headers = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                   f"Content-Type: {content_type}",
+                   f"Content-Length: {len(payload)}",
+                   "Connection: close"]
+        if status in (429, 503):
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Read one request. Returns (method, target, body)."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            parts = request_line.split()
+            if len(parts) != 3:
+                raise HTTPError(400, "Malformed request line.")
+            method, target, _ = parts
+            length = 0
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+        except ValueError:
+            # An over-long line or a Content-Length that isn't a number
+            raise HTTPError(400, "Malformed request.")
+        if length < 0:
+            raise HTTPError(400, "Malformed request.")
+        if length > MAX_BODY:
+            raise HTTPError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method, target, body
+
+    async def _respond(self, reader, client):
+        try:
+            method, target, body = await self._read_request(reader)
+            return await self.handle(method, target, body, client)
+        except HTTPError as e:
+            return e.status, "application/json", json.dumps({"error": str(e)}).encode()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            raise  # the client went away; serve_connection closes without a reply
+        except Exception as e:
+            self.stats["errors"] += 1
+            return 500, "application/json", json.dumps({"error": type(e).__name__}).encode()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        if self.cache_io is not None:
+            self.cache_io.shutdown()
+
+# --- Entry point ---
+
+async def serve(args):
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = RenderCache(args.cache_dir, args.cache_mb << 20, args.cache_disk_mb << 20)
+    app = RenderServer(args.workers, args.max_pending, args.max_per_client, args.size, args.threads, cache=cache)
+    server = await app.start(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}/render")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve inscription renders over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render workers")
+    parser.add_argument("--threads", action="store_true", help="render on threads instead of processes")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING, help="renders queued before 503")
+    parser.add_argument("--max-per-client", type=int, default=MAX_PER_CLIENT, help="requests per client before 429")
+    parser.add_argument("--size", type=int, default=SIZE, help="glyph height in pixels")
+    parser.add_argument("--cache", action="store_true", help="keep finished renders in memory")
+    parser.add_argument("--cache-dir", help="also keep finished renders in this directory (implies --cache)")
+    parser.add_argument("--cache-mb", type=int, default=MAX_MEMORY_BYTES >> 20, help="cache memory in MiB")
+    parser.add_argument("--cache-disk-mb", type=int, default=MAX_DISK_BYTES >> 20, help="cache directory cap in MiB")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Band-by-band rendering for very long friezes.
+
+    python stream.py --direction H --glyphs "𓏙𓋹𓎃 ..." frieze.png
+
+The canvas is rendered in bands of rows (each with its own carve halo, wide
+ones tile by tile) and every band is pushed straight into an incremental PNG
+encoder, so peak memory follows the band size instead of the length of the
+inscription.
+"""
+import argparse
+import struct
+import zlib
+
+import numpy as np
+
+from corpus import read_glyph_file
+from glyph_input import output_filename
+from inscription import BG, PADDING, SIZE, parse_glyph_input, plan_inscription, render_region
+from profiling import stage
+
+# --- Parameters ---
+BAND_ROWS = 1024             # most rows rendered per band
+BAND_PIXELS = 1 << 22        # pixel budget per band; wide friezes get thinner bands
+MIN_BAND_ROWS = 64           # fewest rows per band, so the carve halo stays a small part of each band
+IDAT_BYTES = 1 << 20         # compressed bytes buffered before an IDAT chunk is written
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+class PNGStreamWriter:
+    """Write an 8-bit RGB/greyscale PNG row band by row band."""
+
+    def __init__(self, file, width, height, channels=3, compress_level=6):
+        if channels not in (1, 3, 4):
+            raise ValueError("channels must be 1, 3 or 4")
+        self.file = file
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending = []
+        self._pending_bytes = 0
+
+        color_type = {1: 0, 3: 2, 4: 6}[channels]
+        file.write(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+
+    def _chunk(self, tag, data):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(tag)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+    def _emit(self, data, force=False):
+        if data:
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+        if self._pending_bytes >= IDAT_BYTES or (force and self._pending):
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending.clear()
+            self._pending_bytes = 0
+
+    def write_rows(self, rows):
+        """Append rows, an (n, width, channels) or (n, width) uint8 array."""
+        rows = np.ascontiguousarray(rows, dtype=np.uint8).reshape(len(rows), self.width * self.channels)
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("More rows written than the PNG height.")
+
+        # Sub filter: each byte minus the same channel of the pixel to its left
+        filtered = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 1
+        filtered[:, 1:self.channels + 1] = rows[:, :self.channels]
+        np.subtract(rows[:, self.channels:], rows[:, :-self.channels], out=filtered[:, self.channels + 1:])
+        self._emit(self._compressor.compress(memoryview(filtered).cast("B")))
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG expects {self.height} rows, got {self.rows_written}.")
+        self._emit(self._compressor.flush(), force=True)
+        self._chunk(b"IEND", b"")
+
+def stream_inscription(glyphs, file, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                       base_color=BG, band_rows=None, compress_level=6):
+    """Render an inscription band by band into a PNG file object. Returns (W, H).
+
+    band_rows defaults to as many rows as fit BAND_PIXELS, between MIN_BAND_ROWS and BAND_ROWS.
+    """
+    plan = plan_inscription(glyphs, direction, size, padding, shen, seed, base_color)
+    if band_rows is None:
+        band_rows = max(MIN_BAND_ROWS, min(BAND_ROWS, BAND_PIXELS // plan.W))
+
+    # Wide bands are rendered in tiles of about BAND_PIXELS, so coverage and carving stay that small
+    tile_columns = max(MIN_BAND_ROWS, BAND_PIXELS // band_rows)
+
+    writer = PNGStreamWriter(file, plan.W, plan.H, 3, compress_level)
+    for y in range(0, plan.H, band_rows):
+        y1 = min(y + band_rows, plan.H)
+        band = np.empty((y1 - y, plan.W, 3), dtype=np.uint8)
+        for x in range(0, plan.W, tile_columns):
+            x1 = min(x + tile_columns, plan.W)
+            render_region(plan, (x, y, x1, y1), out=band[:, x:x1])
+        with stage("encode"):
+            writer.write_rows(band)
+    with stage("encode"):
+        writer.close()
+    return plan.W, plan.H
+
+# --- Entry point ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a long inscription with bounded memory.")
+    parser.add_argument("output", help="PNG file name")
+    parser.add_argument("--glyphs", required=True, help="glyphs or Unicode hex, as at the prompt")
+    parser.add_argument("--glyph-file", action="store_true", help="treat --glyphs as a text file (glyphs, hex or MdC codes, see corpus.py)")
+    parser.add_argument("--direction", default="H", choices=("H", "V"), help="horizontal or vertical")
+    parser.add_argument("--shen", action="store_true", help="draw the shen ring")
+    parser.add_argument("--size", type=int, default=SIZE, help="glyph height in pixels")
+    parser.add_argument("--band-rows", type=int, help="rows rendered at a time (default: fit the pixel budget)")
+    parser.add_argument("--seed", type=int, help="stone texture seed")
+    parser.add_argument("--compress-level", type=int, default=6, help="zlib level, 0-9")
+    args = parser.parse_args(argv)
+
+    output_file, encoder = output_filename(args.output)
+    if encoder != "default":
+        raise ValueError("stream.py writes PNG only; use --compress-level to trade size for speed.")
+
+    if args.glyph_file:
+        glyphs = read_glyph_file(args.glyphs)
+    else:
+        glyphs = parse_glyph_input(args.glyphs)
+    direction = "vertical" if args.direction == "V" else "horizontal"
+
+    with open(output_file, "wb") as f:
+        W, H = stream_inscription(glyphs, f, direction, args.size, shen=args.shen, seed=args.seed,
+                                  band_rows=args.band_rows, compress_level=args.compress_level)
+    print(f"Image saved as {output_file} ({W}x{H})")
+
+if __name__ == "__main__":
+    main()
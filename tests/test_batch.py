@@ -0,0 +1,49 @@
+import json
+
+from batch import read_manifest, run_batch
+
+def write_manifest(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+def test_non_object_rows_are_reported_as_failed_jobs(tmp_path):
+    manifest = write_manifest(tmp_path / "jobs.jsonl", [
+        json.dumps({"glyphs": "𓏙𓋹", "direction": "H", "filename": "ok"}),
+        '["x"]',
+        "null",
+        "3",
+        "{not json",
+    ])
+    rows = dict(read_manifest(manifest))
+    assert all(isinstance(row, dict) for row in rows.values())
+    assert "JSON object" in rows[2]["_invalid"] and "list" in rows[2]["_invalid"]
+
+    report = run_batch(manifest, str(tmp_path / "out"), workers=1, size=32)
+    assert report["jobs"] == 5
+    assert report["rendered"] == 1
+    assert sorted(f["line"] for f in report["failures"]) == [2, 3, 4, 5]
+    assert all("Invalid manifest row" in f["error"] for f in report["failures"])
+    assert (tmp_path / "out" / "ok.png").exists()
+
+def test_bad_rows_fail_without_stopping_the_run(tmp_path):
+    manifest = write_manifest(tmp_path / "jobs.jsonl", [
+        json.dumps({"glyphs": "ABC", "filename": "latin"}),
+        json.dumps({"glyphs": "𓏙", "direction": "diagonal", "filename": "sideways"}),
+        json.dumps({"glyphs": "𓏙", "filename": "../escape"}),
+        json.dumps({"filename": "no_glyphs"}),
+        json.dumps({"glyphs": "𓏙𓋹𓎃", "direction": "V", "shen": True, "filename": "cartouche"}),
+    ])
+    report = run_batch(manifest, str(tmp_path / "out"), workers=2, size=32, chunksize=2)
+    assert (report["jobs"], report["rendered"], report["failed"]) == (5, 1, 4)
+    errors = {f["line"]: f["error"] for f in report["failures"]}
+    assert errors[1].startswith("ValueError") and "Unexpected character" in errors[1]
+    assert "direction" in errors[2]
+    assert errors[4].startswith("KeyError")
+    assert (tmp_path / "out" / "cartouche.png").exists()
+
+def test_csv_manifest(tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text("glyphs,direction,shen,filename\n𓏙𓋹,H,yes,first\n𓎃,V,no,second\n", encoding="utf-8")
+    report = run_batch(str(manifest), str(tmp_path), workers=1, size=32)
+    assert report["failed"] == 0, report["failures"]
+    assert (tmp_path / "first.png").exists() and (tmp_path / "second.png").exists()
@@ -0,0 +1,45 @@
+import json
+
+import bench
+
+def result(best_ms, mp_s, peak):
+    return {"repeats": 3, "best_ms": best_ms, "median_ms": best_ms, "megapixels_per_second": mp_s,
+            "peak_bytes": peak, "stages_ms": {}}
+
+def suite(**results):
+    return {"suite": "quick", "machine": {}, "results": results}
+
+def test_compare_flags_throughput_and_memory():
+    baseline = suite(render=result(10.0, 2.0, 1000), other=result(5.0, 4.0, 1000))
+    assert bench.compare(suite(render=result(10.5, 1.9, 1100)), baseline) == []
+    regressions = bench.compare(suite(render=result(20.0, 1.0, 1300), new=result(1.0, 9.0, 1)), baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("render: throughput 1.0 MP/s vs 2.0 MP/s")
+    assert regressions[1].startswith("render: peak memory 1300 B vs 1000 B")
+    assert bench.compare(suite(render=result(20.0, 1.0, 1300)), baseline, time_threshold=0.6,
+                         memory_threshold=0.5) == []
+
+def test_latency_only_cases_compare_on_time():
+    baseline = suite(query=result(10.0, None, 1000))
+    assert bench.compare(suite(query=result(11.0, None, 1000)), baseline) == []
+    assert bench.compare(suite(query=result(20.0, None, 1000)), baseline) == ["query: latency 20.0 ms vs 10.0 ms (+100%)"]
+
+def test_query_cases_report_no_throughput():
+    name, run, pixels = bench.query_case(50, 24)
+    assert name == "query/glyphs=50/size=24" and pixels is None
+    measured = bench.measure(run, pixels, repeats=1)
+    assert measured["megapixels_per_second"] is None and measured["best_ms"] > 0
+
+def test_save_and_compare(tmp_path, monkeypatch, capsys):
+    timings = iter([result(10.0, 2.0, 1000), result(10.0, 2.0, 1000), result(30.0, 0.5, 1000)])
+    monkeypatch.setattr(bench, "build_suite", lambda suite: [("render/x", lambda: None, 100)])
+    monkeypatch.setattr(bench, "measure", lambda run, pixels, repeats: next(timings))
+    baseline = tmp_path / "baseline.json"
+    assert bench.main(["--save", str(baseline)]) == 0
+    saved = json.loads(baseline.read_text(encoding="utf-8"))
+    assert saved["suite"] == "quick" and saved["results"]["render/x"]["best_ms"] == 10.0
+
+    assert bench.main(["--compare", str(baseline)]) == 0
+    assert "No regressions" in capsys.readouterr().err
+    assert bench.main(["--compare", str(baseline)]) == 1
+    assert "REGRESSION render/x: throughput 0.5 MP/s" in capsys.readouterr().err
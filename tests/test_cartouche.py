@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from cartouche import rounded_box_sdf, sdf_coverage, shen_geometry, shen_mask, shen_region_mask
+
+W, H, LINE_WIDTH, PADDING = 284, 162, 10, 60
+
+def canvas(direction):
+    return (W, H) if direction == "horizontal" else (H, W)
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_the_ring_is_hollow(direction):
+    w, h = canvas(direction)
+    mask = shen_mask(direction, w, h, LINE_WIDTH, PADDING)
+    x0, y0, x1, y1, _ = shen_geometry(direction, w, h, LINE_WIDTH, PADDING)["outer"]
+    assert mask.shape == (h, w) and mask.dtype == np.uint8
+
+    # The centre and everything outside the ring is bare
+    cy, cx = h // 2, w // 2
+    assert (mask[cy - 5:cy + 5, cx - 5:cx + 5] == 0).all()
+    assert (mask[:y0 - 1] == 0).all() and (mask[:, :x0 - 1] == 0).all()
+
+    # Mid-line of each straight side is fully covered
+    mid = LINE_WIDTH // 2
+    assert mask[y0 + mid, cx] == 255 and mask[y1 - mid - 1, cx] == 255
+    assert mask[cy, x0 + mid] == 255 and mask[cy, x1 - mid - 1] == 255
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_the_crossbar_spans_the_hole_and_stays_inside_the_ring(direction):
+    w, h = canvas(direction)
+    mask = shen_mask(direction, w, h, LINE_WIDTH, PADDING)
+    geometry = shen_geometry(direction, w, h, LINE_WIDTH, PADDING)
+    bx0, by0, bx1, by1 = geometry["bar"]
+    ix0, iy0, ix1, iy1, _ = geometry["inner"]
+    # The bar's centre line is covered all the way across the hole
+    if direction == "horizontal":
+        assert (mask[iy0:iy1, (bx0 + bx1) // 2] == 255).all()
+    else:
+        assert (mask[(by0 + by1) // 2, ix0:ix1] == 255).all()
+
+    px = np.arange(w, dtype=np.float32)[None, :] + 0.5
+    py = np.arange(h, dtype=np.float32)[:, None] + 0.5
+    outer = sdf_coverage(rounded_box_sdf(px, py, geometry["outer"]))
+    assert (mask <= outer).all()
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_regions_match_the_whole_mask(direction):
+    w, h = canvas(direction)
+    whole = shen_mask(direction, w, h, LINE_WIDTH, PADDING)
+    assert not whole.flags.writeable
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        x0, y0 = int(rng.integers(0, w - 1)), int(rng.integers(0, h - 1))
+        region = (x0, y0, int(rng.integers(x0 + 1, w + 1)), int(rng.integers(y0 + 1, h + 1)))
+        assert (shen_region_mask(direction, w, h, LINE_WIDTH, PADDING, region)
+                == whole[region[1]:region[3], region[0]:region[2]]).all()
+
+def test_unknown_direction():
+    with pytest.raises(ValueError, match="direction"):
+        shen_geometry("diagonal", W, H, LINE_WIDTH, PADDING)
@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pytest
+
+from carving import CARVE_DEPTH, LIGHT_ANGLE, carve, carve_halo, carve_offsets, shift_mask
+
+STONE, SHADOW, HIGHLIGHT, FILL = (100, 100, 100), (10, 10, 10), (250, 250, 250), (60, 60, 60)
+
+def carved_square(light_angle=LIGHT_ANGLE, depth=CARVE_DEPTH, window=None):
+    """A 10x10 glyph at (10, 10) carved into a 30x30 stone."""
+    coverage = np.zeros((30, 30), dtype=np.uint8)
+    coverage[10:20, 10:20] = 255
+    x0, y0, x1, y1 = window or (0, 0, 30, 30)
+    canvas = np.full((y1 - y0, x1 - x0, 3), STONE, dtype=np.uint8)
+    carve(canvas, coverage, SHADOW, HIGHLIGHT, FILL, light_angle, depth, window)
+    return canvas[..., 0]
+
+def test_offsets_follow_the_light():
+    assert carve_offsets() == (2, 2)
+    assert carve_offsets(135) == (-2, 2)
+    assert carve_offsets(225) == (-2, -2)
+    assert carve_offsets(45, 4 * math.sqrt(2)) == (4, 4)
+    assert carve_halo(45, 4 * math.sqrt(2)) == 4
+
+def test_default_light_is_from_the_upper_left():
+    canvas = carved_square()
+    assert (canvas[10:20, 10:20] == FILL[0]).all()
+    # The shadow band sits up and left of the glyph, the highlight down and right
+    assert canvas[8, 8] == SHADOW[0] and canvas[9, 12] == SHADOW[0]
+    assert canvas[21, 21] == HIGHLIGHT[0] and canvas[20, 17] == HIGHLIGHT[0]
+    assert canvas[7, 7] == STONE[0] and canvas[22, 22] == STONE[0]
+
+def test_turning_the_light_swaps_the_sides():
+    canvas = carved_square(225)
+    assert canvas[8, 8] == HIGHLIGHT[0] and canvas[21, 21] == SHADOW[0]
+    canvas = carved_square(135)   # light from the upper right
+    assert canvas[8, 21] == SHADOW[0] and canvas[21, 8] == HIGHLIGHT[0]
+
+def test_depth_widens_the_bands():
+    shallow, deep = carved_square(), carved_square(depth=4 * math.sqrt(2))
+    assert shallow[6, 6] == STONE[0] and deep[6, 6] == SHADOW[0]
+    assert shallow[23, 23] == STONE[0] and deep[23, 23] == HIGHLIGHT[0]
+
+@pytest.mark.parametrize("window", [(0, 0, 15, 30), (5, 7, 26, 22)])
+def test_a_window_carves_its_part_of_the_whole(window):
+    x0, y0, x1, y1 = window
+    assert (carved_square(window=window) == carved_square()[y0:y1, x0:x1]).all()
+
+def test_shift_mask():
+    mask = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    assert shift_mask(mask, 1, 0).tolist() == [[0, 0, 1, 2], [0, 4, 5, 6], [0, 8, 9, 10]]
+    assert shift_mask(mask, 0, -1).tolist() == [[4, 5, 6, 7], [8, 9, 10, 11], [0, 0, 0, 0]]
+    assert not shift_mask(mask, 5, 0).any()
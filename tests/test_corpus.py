@@ -0,0 +1,62 @@
+import unicodedata
+
+import pytest
+
+from corpus import CorpusError, CorpusParser, mdc_code, mdc_codes, read_glyph_file, render_pages
+
+def test_mdc_codes():
+    assert mdc_code("A001") == "A1"
+    assert mdc_code("AA015") == "Aa15"
+    assert mdc_code("A014A") == "A14a"
+    codes = mdc_codes()
+    for code, name in [("a1", "A001"), ("aa15", "AA015"), ("n35", "N035"), ("a14a", "A014A")]:
+        assert codes[code] == unicodedata.lookup(f"EGYPTIAN HIEROGLYPH {name}")
+
+def test_mixed_input_parses_to_glyphs():
+    parser = CorpusParser()
+    assert parser.parse_line("𓏙 13000 A1 G17-Z1:D21 (N35)", 1) == ["𓏙", "𓀀", "𓀀", "𓅓", "𓏤", "𓂋", "𓈖"]
+    assert parser.parse_line("A1𓏙N35", 2) == ["𓀀", "𓏙", "𓈖"]
+    assert parser.errors == []
+
+def test_errors_carry_their_position():
+    parser = CorpusParser()
+    assert parser.parse_line("A1 Q999 𓏙", 3) == ["𓀀", "𓏙"]
+    assert parser.parse_line("  1F600 A1b", 4) == []
+    assert parser.parse_line("𓏙 �", 5) == ["𓏙"]
+    assert parser.errors == [
+        CorpusError(3, 4, "Q999", "Unknown sign code"),
+        CorpusError(4, 3, "1F600", "Unicode hex U+1F600 is not an Egyptian hieroglyph"),
+        CorpusError(4, 9, "A1b", "Unknown sign code"),
+        CorpusError(5, 3, "�", "Unexpected character '�' (U+FFFD)"),
+    ]
+
+def test_errors_past_the_limit_are_only_counted():
+    parser = CorpusParser(max_errors=2)
+    list(parser.iter_lines(["Q999 Q998", "Q997"]))
+    assert parser.error_count == 3 and len(parser.errors) == 2
+    assert parser.report()["error_count"] == 3
+
+def test_chunks_split_across_lines():
+    codes = mdc_codes()
+    parser = CorpusParser(chunk_size=3)
+    chunks = list(parser.chunks(["A1 A2", "A3 A4 A5", "A6 A7"]))
+    assert chunks == [[codes[f"a{i}"] for i in span] for span in ([1, 2, 3], [4, 5, 6], [7])]
+    assert parser.glyph_count == 7 and parser.lines == 3
+
+def test_read_glyph_file_names_the_positions(tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_text("A1 N35\n𓏙\n", encoding="utf-8")
+    assert read_glyph_file(good) == ["𓀀", "𓈖", "𓏙"]
+
+    bad = tmp_path / "bad.txt"
+    bad.write_bytes(b"A1\nN35 Q999\n\xff\n")
+    with pytest.raises(ValueError, match=r"2:5 Unknown sign code: Q999; 3:1 Unexpected character"):
+        read_glyph_file(bad)
+
+def test_render_pages(tmp_path):
+    corpus = tmp_path / "book.txt"
+    corpus.write_text("A1 A2 A3\nA4 Q999\n", encoding="utf-8")
+    report = render_pages(corpus, tmp_path / "pages", per_page=2, size=24)
+    assert [p.rsplit("/", 1)[-1] for p in report["pages"]] == ["page_0001.png", "page_0002.png"]
+    assert report["glyphs"] == 4 and report["error_count"] == 1
+    assert report["errors"][0] == {"line": 2, "column": 4, "text": "Q999", "message": "Unknown sign code"}
@@ -0,0 +1,53 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from encoding import CONTENT_TYPES, PROFILES, content_type, encode_image, exact_palette, profile_format
+from glyph_input import PROFILE_SUFFIXES, SUFFIX_PROFILES, output_filename
+from inscription import render_inscription
+
+def test_every_profile_has_a_suffix_and_content_type():
+    assert PROFILES.keys() == PROFILE_SUFFIXES.keys()
+    for profile in PROFILES:
+        assert PROFILE_SUFFIXES[profile] == "." + profile_format(profile).lower()
+        assert content_type(profile) == CONTENT_TYPES[profile_format(profile)]
+    assert all(SUFFIX_PROFILES[suffix] in PROFILES for suffix in SUFFIX_PROFILES)
+
+@pytest.mark.parametrize("profile", list(PROFILES))
+def test_profiles_are_lossless_on_a_render(profile):
+    img = render_inscription("𓏙𓋹𓎃", size=48, shen=True, seed=1)
+    buffer = io.BytesIO()
+    encode_image(img, buffer, profile)
+    decoded = Image.open(io.BytesIO(buffer.getvalue()))
+    assert decoded.format == profile_format(profile)
+    assert (np.asarray(decoded.convert("RGB")) == np.asarray(img)).all()
+
+def test_exact_palette_keeps_pixels_and_gives_up_past_256_colours():
+    rng = np.random.default_rng(0)
+    colours = rng.integers(0, 256, size=(40, 3), dtype=np.uint8)
+    few = colours[rng.integers(0, 40, size=(20, 30))]
+    indexed = exact_palette(Image.fromarray(few, mode="RGB"))
+    assert indexed.mode == "P"
+    assert (np.asarray(indexed.convert("RGB")) == few).all()
+
+    many = np.zeros((1, 300, 3), dtype=np.uint8)
+    many[0, :, 0] = np.arange(300) % 256
+    many[0, :, 1] = np.arange(300) // 256
+    assert exact_palette(Image.fromarray(many, mode="RGB")) is None
+
+def test_output_filename_picks_and_checks_the_encoder():
+    assert output_filename("Plaque") == ("plaque.png", "default")
+    assert output_filename("plaque.webp") == ("plaque.webp", "webp")
+    assert output_filename("plaque", "fastest") == ("plaque.png", "fastest")
+    with pytest.raises(ValueError, match="writes .png files"):
+        output_filename("plaque.webp", "smallest")
+    with pytest.raises(ValueError, match="Unknown encoder"):
+        output_filename("plaque", "avif")
+    with pytest.raises(ValueError, match="Invalid file name"):
+        output_filename("../plaque.png")
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown profile"):
+        encode_image(np.zeros((2, 2, 3), dtype=np.uint8), io.BytesIO(), "jpeg")
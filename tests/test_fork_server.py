@@ -0,0 +1,96 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import inscribe
+from fork_server import request_render, stop_server
+from inscription import render_inscription
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="the fork server needs os.fork")
+
+@pytest.fixture
+def server(tmp_path):
+    """A fork server on a socket in tmp_path; yields the socket path."""
+    socket_path = str(tmp_path / "s.sock")
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "fork_server.py"), "--socket", socket_path,
+                                "--size", "24"], cwd=ROOT, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + 60
+    while not listening(socket_path):  # the socket file appears at bind, a moment before listen
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail(f"fork server did not start: {process.stderr.read().decode()}")
+        time.sleep(0.05)
+    yield socket_path
+    if process.poll() is None:
+        try:
+            stop_server(socket_path)
+        except OSError:
+            pass  # already stopping
+    process.wait(10)
+    process.stderr.close()
+
+def listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+def send_raw(socket_path, data):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(10)
+        conn.connect(socket_path)
+        conn.sendall(data)
+        return conn.makefile("rb").readline()
+
+def test_renders_and_survives_bad_requests(server, tmp_path):
+    for bad in (b"[]\n", b"42\n", b"not json\n"):
+        assert send_raw(server, bad).startswith(b'{"error": "Bad request')
+    with pytest.raises(RuntimeError, match="absolute .png path"):
+        request_render("𓏙", "relative.webp", socket_path=server, encoder="default", size=24)
+
+    output = tmp_path / "out.png"
+    reply = request_render(["𓏙", "𓋹"], str(output), shen=True, seed=3, size=24, socket_path=server)
+    expected = render_inscription("𓏙𓋹", size=24, shen=True, seed=3, output="array")
+    assert (reply["width"], reply["height"]) == (expected.shape[1], expected.shape[0])
+    assert (np.asarray(Image.open(output)) == expected).all()
+
+    assert stop_server(server) == {"stopped": True}
+    deadline = time.monotonic() + 10
+    while os.path.exists(server) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not os.path.exists(server)
+
+def test_inscribe_uses_the_server(server, tmp_path):
+    output = str(tmp_path / "cartouche.png")
+    assert inscribe.render_file(["𓏙"], "vertical", output, size=24, socket_path=server) == "server"
+    assert Image.open(output).size == render_inscription("𓏙", "vertical", 24).size
+
+def test_inscribe_renders_locally_without_a_server(tmp_path, monkeypatch):
+    output = str(tmp_path / "local.png")
+    assert inscribe.render_file(["𓏙"], "horizontal", output, size=24,
+                                socket_path=str(tmp_path / "missing.sock")) == "local"
+    assert (np.asarray(Image.open(output)) == render_inscription("𓏙", size=24, output="array")).all()
+    monkeypatch.chdir(tmp_path)
+    assert inscribe.main(["cli.webp", "--glyphs", "𓏙", "--size", "24", "--no-server"]) == 0
+    assert Image.open(tmp_path / "cli.webp").format == "WEBP"
+    assert inscribe.main(["bad.png", "--glyphs", "abc", "--no-server"]) == 1
+
+def test_a_timeout_is_not_retried_locally(tmp_path, monkeypatch):
+    def timed_out(*args, **kwargs):
+        raise socket.timeout("timed out")
+
+    monkeypatch.setattr(inscribe, "request_render", timed_out)
+    output = tmp_path / "slow.png"
+    with pytest.raises(RuntimeError, match="did not reply in time"):
+        inscribe.render_file(["𓏙"], "horizontal", str(output), size=24)
+    assert not output.exists()
@@ -0,0 +1,62 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from glyph_cache import GlyphMaskCache, get_glyph_cache, rasterize_glyph
+from inscription import load_font
+
+GLYPHS = "𓏙𓋹𓎃𓀀"
+
+def test_masks_cover_the_ink_box():
+    mask, bbox = rasterize_glyph("𓋹", 40)
+    assert bbox == load_font(40).getbbox("𓋹")
+    assert mask.shape == (bbox[3] - bbox[1], bbox[2] - bbox[0]) and mask.dtype == np.uint8
+    # The same pixels draw.text puts inside the ink box
+    page = Image.new("L", (100, 100), 0)
+    ImageDraw.Draw(page).text((20, 10), "𓋹", fill=255, font=load_font(40))
+    x0, y0, x1, y1 = bbox
+    assert mask.any() and (np.asarray(page)[10 + y0:10 + y1, 20 + x0:20 + x1] == mask).all()
+
+def test_atlas_round_trip(tmp_path):
+    cache = GlyphMaskCache()
+    cache.warm(GLYPHS, 40)
+    cache.warm(GLYPHS[:2], 24)
+    path = tmp_path / "atlas.npz"
+    cache.save_atlas(path)
+
+    loaded = GlyphMaskCache()
+    assert loaded.load_atlas(path) == len(cache) == 6
+    assert loaded.nbytes == cache.nbytes
+    for glyph in GLYPHS:
+        mask, bbox = loaded.get(glyph, 40)
+        expected_mask, expected_bbox = cache.get(glyph, 40)
+        assert bbox == expected_bbox and (mask == expected_mask).all()
+    assert loaded.misses == 0 and loaded.hits == 4
+
+def test_empty_cache_saves_an_empty_atlas(tmp_path):
+    GlyphMaskCache().save_atlas(tmp_path / "empty.npz")
+    assert GlyphMaskCache().load_atlas(tmp_path / "empty.npz") == 0
+
+def test_lru_evicts_the_oldest_past_the_cap():
+    sizes = {g: rasterize_glyph(g, 40)[0].nbytes for g in GLYPHS[:3]}
+    cache = GlyphMaskCache(max_bytes=sizes["𓏙"] + sizes["𓋹"] + sizes["𓎃"] - 1)
+    cache.get("𓏙", 40)
+    cache.get("𓋹", 40)
+    cache.get("𓏙", 40)             # 𓏙 is now the most recent, 𓋹 the oldest
+    cache.get("𓎃", 40)             # over the cap: 𓋹 goes
+    assert [chr(c) for c, _ in cache._masks] == ["𓏙", "𓎃"]
+    assert cache.nbytes == sizes["𓏙"] + sizes["𓎃"] <= cache.max_bytes
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    cache.get("𓋹", 40)
+    assert cache.misses == 4 and len(cache) == 2
+
+def test_a_single_mask_over_the_cap_is_still_kept():
+    cache = GlyphMaskCache(max_bytes=1)
+    cache.get("𓏙", 40)
+    cache.get("𓋹", 40)
+    assert [chr(c) for c, _ in cache._masks] == ["𓋹"]
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+def test_one_cache_per_font():
+    assert get_glyph_cache() is get_glyph_cache()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from height_map import distance_to_edge, height_map, render_height_mapped, render_height_region
+from inscription import plan_inscription
+
+GLYPHS = "𓏙𓋹𓎃𓀀"
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("tile", [17, 40])
+def test_tiled_regions_match_the_full_render(direction, tile):
+    full = render_height_mapped(GLYPHS, direction, 48, seed=2, output="array")
+    plan = plan_inscription(GLYPHS, direction, 48, seed=2)
+    canvas = np.zeros_like(full)
+    for y in range(0, plan.H, tile):
+        for x in range(0, plan.W, tile):
+            region = (x, y, min(x + tile, plan.W), min(y + tile, plan.H))
+            canvas[y:region[3], x:region[2]] = render_height_region(plan, region)
+    assert (canvas == full).all()
+
+def test_height_map_regions_match_the_whole_map():
+    plan = plan_inscription(GLYPHS, size=48, seed=2)
+    whole = height_map(plan)
+    assert whole.shape == (plan.H, plan.W)
+    assert whole.max() == 0 and whole.min() < 0
+    assert (height_map(plan, (20, 10, 90, 40)) == whole[10:40, 20:90]).all()
+
+def test_distance_to_edge_matches_brute_force():
+    rng = np.random.default_rng(4)
+    inside = rng.random((24, 31)) < 0.7
+    radius = 4
+    ys, xs = np.nonzero(~inside)
+    expected = np.zeros(inside.shape, dtype=np.float32)
+    for y, x in zip(*np.nonzero(inside)):
+        nearest = np.sqrt(((ys - y) ** 2 + (xs - x) ** 2).min()) if len(ys) else radius
+        expected[y, x] = min(nearest, radius)
+    assert np.allclose(distance_to_edge(inside, radius), expected)
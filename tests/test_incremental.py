@@ -0,0 +1,32 @@
+import pytest
+
+from incremental import IncrementalRenderer
+from inscription import plan_inscription, render_inscription
+
+EDITS = ["𓏙𓋹𓎃", "𓏙𓋹𓎃𓏙", "𓏙𓎃𓏙", "𓏙𓋹𓋹𓎃𓏙", "𓀀𓋹𓋹𓎃𓏙", "𓀀𓋹𓎃", "𓀀𓋹𓎃𓁐𓃀𓏙", "𓋹"]
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+def test_edits_match_a_full_render(direction, shen):
+    renderer = IncrementalRenderer(direction, 40, shen=shen, seed=6)
+    for glyphs in EDITS:
+        canvas = renderer.render(glyphs)
+        full = render_inscription(glyphs, direction, 40, shen=shen, seed=6, output="array")
+        assert canvas.shape == full.shape, glyphs
+        assert (canvas == full).all(), glyphs
+
+def test_a_small_edit_repaints_only_part_of_the_canvas():
+    renderer = IncrementalRenderer(size=40, seed=6)
+    renderer.render("𓏙𓋹𓎃𓏙𓋹𓎃")
+    W, H = renderer.canvas.shape[1], renderer.canvas.shape[0]
+    rects = renderer.update("𓏙𓋹𓎃𓏙𓋹𓏙")
+    assert rects and sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects) < W * H / 2
+
+def test_glyph_at_follows_the_layout():
+    renderer = IncrementalRenderer(size=40, seed=6)
+    assert renderer.glyph_at(0, 0) is None
+    renderer.render("𓏙𓋹𓎃")
+    plan = plan_inscription("𓏙𓋹𓎃", size=40, seed=6)
+    for i, (x0, y0, x1, y1) in enumerate(plan.layout.rows["ink"].tolist()):
+        assert renderer.glyph_at((x0 + x1) // 2, (y0 + y1) // 2) == i
+    assert renderer.glyph_at(0, 0) is None
@@ -0,0 +1,50 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from inscription import BG, plan_inscription, render_inscription, render_region
+
+def test_outputs_agree():
+    array = render_inscription("𓏙𓋹", size=32, shen=True, seed=8, output="array")
+    img = render_inscription("𓏙𓋹", size=32, shen=True, seed=8)
+    data = render_inscription("𓏙𓋹", size=32, shen=True, seed=8, output="bytes")
+    assert array.dtype == np.uint8 and array.shape[2] == 3
+    assert (np.asarray(img) == array).all()
+    decoded = Image.open(io.BytesIO(data))
+    assert decoded.format == "PNG" and (np.asarray(decoded) == array).all()
+    assert Image.open(io.BytesIO(render_inscription("𓏙", size=32, output="bytes", format="BMP"))).format == "BMP"
+
+def test_renders_are_deterministic_per_seed():
+    a = render_inscription("𓏙", size=32, seed=1, output="array")
+    assert (a == render_inscription(["𓏙"], size=32, seed=1, output="array")).all()
+    assert (a == render_inscription(f"{ord('𓏙'):X}", size=32, seed=1, output="array")).all()
+    assert (a != render_inscription("𓏙", size=32, seed=2, output="array")).any()
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_regions_tile_the_full_render(direction):
+    full = render_inscription("𓏙𓋹𓎃", direction, 40, shen=True, seed=8, output="array")
+    plan = plan_inscription("𓏙𓋹𓎃", direction, 40, shen=True, seed=8)
+    out = np.zeros_like(full)
+    for y in range(0, plan.H, 23):
+        for x in range(0, plan.W, 31):
+            region = (x, y, min(x + 31, plan.W), min(y + 23, plan.H))
+            render_region(plan, region, out=out[y:region[3], x:region[2]])
+    assert (out == full).all()
+
+def test_shen_and_stone_change_the_render():
+    plain = render_inscription("𓏙", size=32, seed=1, output="array")
+    ringed = render_inscription("𓏙", size=32, shen=True, seed=1, output="array")
+    assert ringed.shape[1] > plain.shape[1]
+    dark = render_inscription("𓏙", size=32, seed=1, output="array", base_color=(90, 80, 70))
+    assert dark.mean() < plain.mean()
+    assert abs(plain[0, 0].astype(int) - BG).max() < 60
+
+def test_bad_arguments_are_rejected():
+    with pytest.raises(ValueError, match="output must be one of"):
+        render_inscription("𓏙", size=32, output="svg")
+    with pytest.raises(ValueError, match="direction"):
+        render_inscription("𓏙", "diagonal", 32)
+    with pytest.raises(ValueError, match="Unexpected character"):
+        render_inscription("hello", size=32)
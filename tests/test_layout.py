@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from layout import GlyphLayout
+
+def random_layout(direction, n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    x0 = rng.integers(-8, 6, n)
+    y0 = rng.integers(-4, 10, n)
+    # Uneven bearings and tight padding put some ink ahead of the previous glyph's
+    bboxes = np.stack([x0, y0, x0 + rng.integers(1, 40, n), y0 + rng.integers(1, 50, n)], axis=1)
+    return GlyphLayout.from_bboxes(np.arange(n) + 0x13000, bboxes, direction, padding=2, extra_padding=3)
+
+def brute_force(layout, rect):
+    x0, y0, x1, y1 = rect
+    ink = layout.rows["ink"]
+    return np.flatnonzero((ink[:, 0] < x1) & (ink[:, 2] > x0) & (ink[:, 1] < y1) & (ink[:, 3] > y0))
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_queries_match_brute_force(direction):
+    layout = random_layout(direction)
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        x0, y0 = rng.integers(-20, layout.W + 20), rng.integers(-20, layout.H + 20)
+        rect = (x0, y0, x0 + rng.integers(1, 80), y0 + rng.integers(1, 80))
+        assert layout.query(rect).tolist() == brute_force(layout, rect).tolist(), rect
+        hits = brute_force(layout, (x0, y0, x0 + 1, y0 + 1))
+        assert layout.glyph_at(x0, y0) == (int(hits[0]) if len(hits) else None)
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_span_holds_every_overlapping_glyph(direction):
+    layout = random_layout(direction, seed=2)
+    length = layout.W if direction == "horizontal" else layout.H
+    for start in range(-10, length + 10, 7):
+        first, last = layout.span(start, start + 13)
+        overlapping = np.flatnonzero((layout.starts < start + 13) & (layout.ends > start))
+        assert set(overlapping.tolist()) <= set(range(first, last))
+
+def test_rows_and_placements():
+    layout = GlyphLayout.from_bboxes([0x133D9, 0x1330B], [(2, 5, 30, 45), (0, 1, 20, 50)], "horizontal", 10)
+    assert len(layout) == 2 and layout.glyphs == ["\U000133D9", "\U0001330B"]
+    assert (layout.W, layout.H) == (28 + 20 + 30, 49 + 20)
+    (_, x, y, bbox), _ = layout.placements()
+    assert bbox == (2, 5, 30, 45)
+    assert layout.rows["ink"][0].tolist() == [x + 2, y + 5, x + 30, y + 45]
+    with pytest.raises(ValueError, match="direction"):
+        GlyphLayout.from_bboxes([0x13000], [(0, 0, 1, 1)], "diagonal", 10)
+    with pytest.raises(ValueError, match="At least one"):
+        GlyphLayout.from_bboxes([], [], "horizontal", 10)
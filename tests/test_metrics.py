@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+import metrics
+from inscription import SIZE, load_font, render_inscription
+
+GLYPHS = list("𓏙𓋹𓎃𓀀𓁐𓃀")
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+def test_canvas_size_matches_the_render(direction, shen):
+    # The shipped table, so the test never writes into fonts/metrics
+    img = render_inscription(GLYPHS[:3], direction, SIZE, shen=shen, seed=1)
+    assert metrics.canvas_size(GLYPHS[:3], direction, SIZE, shen=shen) == img.size
+
+def test_bboxes_match_the_font_inside_and_outside_the_block():
+    glyphs = GLYPHS + ["A", "☥"]
+    font = load_font(SIZE)
+    assert metrics.glyph_bboxes(glyphs, SIZE) == [font.getbbox(g) for g in glyphs]
+
+def test_tables_are_saved_and_loaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_tables", {})
+    with pytest.raises(FileNotFoundError, match="size 24"):
+        metrics.load_metrics(24, directory=tmp_path, build=False)
+    path = metrics.save_metrics(24, directory=tmp_path)
+    assert path == metrics.metrics_path(24, directory=tmp_path)
+    table = metrics.load_metrics(24, directory=tmp_path, build=False)
+    assert (table == metrics.build_metrics(24)).all()
+    assert len(table) == metrics.BLOCK_END - metrics.BLOCK_START + 1
+    assert table[ord("𓏙") - metrics.BLOCK_START]["present"] == 1
+
+def test_missing_tables_are_cached_outside_the_package(tmp_path, monkeypatch):
+    shipped, cache = tmp_path / "shipped", tmp_path / "cache"
+    shipped.mkdir()
+    monkeypatch.setattr(metrics, "_tables", {})
+    monkeypatch.setattr(metrics, "METRICS_DIR", str(shipped))
+    monkeypatch.setattr(metrics, "CACHE_DIR", str(cache))
+    table = metrics.load_metrics(24)
+    assert os.listdir(shipped) == []
+    assert os.listdir(cache) == [os.path.basename(metrics.metrics_path(24))]
+    assert (table == metrics.build_metrics(24)).all()
+
+    # A shipped table wins over the cache
+    metrics.save_metrics(32, directory=str(shipped))
+    monkeypatch.setattr(metrics, "_tables", {})
+    assert (metrics.load_metrics(32) == metrics.build_metrics(32)).all()
+    assert not os.path.exists(metrics.metrics_path(32, directory=str(cache)))
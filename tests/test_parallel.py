@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from inscription import render_inscription
+from parallel import render_parallel, split_bands
+
+GLYPHS = "𓏙𓋹𓎃𓀀𓁐𓃀"
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+def test_parallel_matches_full_render(direction, shen):
+    full = render_inscription(GLYPHS, direction, 48, shen=shen, seed=3, output="array")
+    canvas = render_parallel(GLYPHS, direction, 48, shen=shen, seed=3, workers=3, output="array")
+    assert (canvas == full).all()
+
+def test_parallel_image_output():
+    img = render_parallel(GLYPHS, size=32, seed=3, workers=2)
+    assert (np.asarray(img) == render_inscription(GLYPHS, size=32, seed=3, output="array")).all()
+
+@pytest.mark.parametrize("W, H, bands", [(100, 30, 4), (30, 100, 7), (5, 3, 12)])
+def test_bands_cover_the_canvas_once(W, H, bands):
+    covered = np.zeros((H, W), dtype=int)
+    for x0, y0, x1, y1 in split_bands(W, H, bands):
+        covered[y0:y1, x0:x1] += 1
+    assert (covered == 1).all()
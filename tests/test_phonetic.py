@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from batch import read_manifest
+from corpus import mdc_codes
+from phonetic import convert_names, main, name_filename, name_to_glyphs, normalize_name
+
+def signs(gardiner):
+    return tuple(mdc_codes()[code.lower()] for code in gardiner.split())
+
+@pytest.mark.parametrize("name, gardiner", [
+    ("Cleopatra", "V31 E23 M17 G43 Q3 G1 X1 D21 G1"),
+    ("Sheshonq", "N37 M17 N37 G43 N35 N29"),          # letter groups before single letters
+    ("Cyrus", "S29 M17a D21 G43 S29"),                # a soft c
+    ("Djoser", "I10 G43 S29 M17 D21"),
+    ("Max", "G17 G1 V31 S29"),
+])
+def test_names_are_spelled_longest_first(name, gardiner):
+    assert name_to_glyphs(name) == signs(gardiner)
+
+def test_case_accents_and_separators_are_ignored():
+    assert normalize_name("  Séti ") == "seti"
+    assert name_to_glyphs("Séti") == name_to_glyphs("SETI")
+    assert name_to_glyphs("Ramses II") == name_to_glyphs("ramses-ii") == name_to_glyphs("Ramsesii")
+
+def test_unspellable_names_are_rejected():
+    with pytest.raises(ValueError, match=r"No sign for '2' in name 'Ramses 2' \(position 8\)"):
+        name_to_glyphs("Ramses 2")
+    with pytest.raises(ValueError, match="empty"):
+        name_to_glyphs(" - ")
+
+def test_bulk_conversion_reports_each_name():
+    results = list(convert_names(["Cleopatra\n", "", "R2D2"]))
+    assert [(name, error is None) for name, _, error in results] == [("Cleopatra", True), ("R2D2", False)]
+    assert results[1][1] is None
+
+def test_manifest_feeds_the_batch_renderer(tmp_path):
+    names = tmp_path / "names.txt"
+    names.write_text("Cleopatra\nNefertiti\n3rd\n", encoding="utf-8")
+    manifest = tmp_path / "names.jsonl"
+    assert main(["--file", str(names), "--manifest", str(manifest)]) == 1
+    rows = [json.loads(line) for line in manifest.read_text(encoding="utf-8").splitlines()]
+    assert [row["filename"] for row in rows] == ["cleopatra", "nefertiti"]
+    assert rows[0]["glyphs"] == "".join(signs("V31 E23 M17 G43 Q3 G1 X1 D21 G1")) and rows[0]["shen"]
+    assert [row["filename"] for _, row in read_manifest(str(manifest))] == ["cleopatra", "nefertiti"]
+
+def test_name_filename():
+    assert name_filename("Amenhotep III") == "amenhotep iii"
+    assert name_filename("Ptolemy/Cleopatra?") == "ptolemy_cleopatra_"
+    assert name_filename("???") == "_"
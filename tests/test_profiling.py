@@ -0,0 +1,85 @@
+import contextvars
+import json
+import threading
+import time
+
+from inscription import render_inscription
+from profiling import Profiler, _NULL, aggregate, count, stage
+
+def test_nested_stages_and_counters_are_reported():
+    with Profiler(label="job-1") as prof:
+        with stage("outer"):
+            with stage("inner"):
+                time.sleep(0.01)
+            with stage("inner"):
+                count("hits")
+        count("hits", 2)
+        count("misses")
+    report = json.loads(prof.to_json())
+    assert report["label"] == "job-1"
+    assert report["stages"]["outer"]["calls"] == 1 and report["stages"]["inner"]["calls"] == 2
+    assert report["stages"]["outer"]["wall_ms"] >= report["stages"]["inner"]["wall_ms"] >= 10
+    assert report["counters"] == {"hits": 3, "misses": 1}
+    assert report["wall_ms"] >= report["stages"]["outer"]["wall_ms"]
+
+def test_memory_peaks_fold_into_the_enclosing_stage():
+    with Profiler(memory=True) as prof:
+        with stage("outer"):
+            with stage("inner"):
+                block = bytearray(4 << 20)
+                del block
+    stages = prof.report()["stages"]
+    assert stages["inner"]["peak_bytes"] >= 4 << 20
+    assert stages["outer"]["peak_bytes"] >= stages["inner"]["peak_bytes"]
+
+def test_nothing_is_recorded_without_a_profiler():
+    assert stage("texture") is _NULL
+    count("hits")   # no error, nowhere to go
+    with Profiler() as prof:
+        pass
+    with stage("after"):
+        count("late")
+    assert prof.stages == {} and prof.counters == {}
+
+def test_contexts_do_not_leak_into_each_other():
+    results = {}
+
+    def job(name):
+        with Profiler(label=name) as prof:
+            with stage(name):
+                count(name)
+                time.sleep(0.01)
+        results[name] = prof.report()
+
+    threads = [threading.Thread(target=job, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert set(results["a"]["stages"]) == {"a"} and results["a"]["counters"] == {"a": 1}
+    assert set(results["b"]["stages"]) == {"b"} and results["b"]["counters"] == {"b": 1}
+
+def test_helper_threads_report_to_the_callers_profiler():
+    with Profiler() as prof:
+        context = contextvars.copy_context()
+        helper = threading.Thread(target=context.run, args=(lambda: count("helper"),))
+        helper.start()
+        helper.join()
+        other = threading.Thread(target=lambda: count("stray"))   # a fresh context sees no profiler
+        other.start()
+        other.join()
+    assert prof.counters == {"helper": 1}
+
+def test_a_render_reports_its_stages_and_aggregates():
+    reports = []
+    for _ in range(2):
+        with Profiler() as prof:
+            render_inscription("𓏙𓋹", size=24, shen=True, output="bytes")
+        reports.append(prof.report())
+    assert {"texture", "encode"} <= set(reports[0]["stages"])
+    total = aggregate(reports)
+    assert total["renders"] == 2
+    assert total["stages"]["encode"]["calls"] == 2
+    assert total["counters"]["glyphs"] == reports[0]["counters"]["glyphs"] * 2
+    walls = [entry["wall_ms"] for entry in total["stages"].values()]
+    assert walls == sorted(walls, reverse=True)
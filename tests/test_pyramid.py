@@ -0,0 +1,74 @@
+import math
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pyramid import dzi_tiles, downsample_chain, level_filename, main, write_dzi, write_xyz
+
+DZI = "{http://schemas.microsoft.com/deepzoom/2008}"
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, size=(150, 300, 3), dtype=np.uint8), mode="RGB")
+
+def test_chain_halves_rounding_up(image):
+    assert [level.size for level in downsample_chain(image, 4)] == [(300, 150), (150, 75), (75, 38), (38, 19)]
+    assert downsample_chain(image)[-1].size == (1, 1)
+    assert level_filename("plaque.png", 0) == "plaque.png" and level_filename("plaque.webp", 2) == "plaque_2.webp"
+
+def test_dzi_tiles_overlap_their_neighbours():
+    boxes = {(c, r): box for c, r, box in dzi_tiles(300, 150, 64, 2)}
+    assert len(boxes) == math.ceil(300 / 64) * math.ceil(150 / 64) == 15
+    assert boxes[0, 0] == (0, 0, 66, 66)
+    assert boxes[1, 1] == (62, 62, 130, 130)
+    assert boxes[4, 2] == (254, 126, 300, 150)
+
+def test_deep_zoom_levels_tiles_and_xml(image, tmp_path):
+    path = str(tmp_path / "plaque.dzi")
+    count = write_dzi(image, path, tile_size=64, overlap=1, encoder="default")
+
+    # Levels run from 0 (1x1) to ceil(log2(300)) = 9 (full size), each ceil(size / 2**(9 - level))
+    levels = sorted(int(name) for name in os.listdir(tmp_path / "plaque_files"))
+    assert levels == list(range(10))
+    expected = 0
+    for level in levels:
+        w, h = (math.ceil(side / 2 ** (9 - level)) for side in image.size)
+        tiles = os.listdir(tmp_path / "plaque_files" / str(level))
+        columns, rows = math.ceil(w / 64), math.ceil(h / 64)
+        assert sorted(tiles) == sorted(f"{c}_{r}.png" for c in range(columns) for r in range(rows))
+        expected += columns * rows
+    assert count == expected
+
+    tile = np.asarray(Image.open(tmp_path / "plaque_files" / "9" / "1_1.png"))
+    assert (tile == np.asarray(image)[63:129, 63:129]).all()
+
+    root = ET.parse(path).getroot()
+    assert root.tag == f"{DZI}Image"
+    assert (root.get("Format"), root.get("Overlap"), root.get("TileSize")) == ("png", "1", "64")
+    size = root.find(f"{DZI}Size")
+    assert (size.get("Width"), size.get("Height")) == ("300", "150")
+
+def test_xyz_layout(image, tmp_path):
+    count = write_xyz(image, str(tmp_path / "tiles"), tile_size=128, encoder="default")
+    # Zoom 0 holds the whole image in one tile; each zoom doubles it
+    expected = {2: (3, 2), 1: (2, 1), 0: (1, 1)}
+    assert sorted(int(z) for z in os.listdir(tmp_path / "tiles")) == sorted(expected)
+    for z, (columns, rows) in expected.items():
+        for x in range(columns):
+            assert sorted(os.listdir(tmp_path / "tiles" / str(z) / str(x))) == [f"{y}.png" for y in range(rows)]
+    assert count == 3 * 2 + 2 + 1
+    edge = Image.open(tmp_path / "tiles" / "2" / "2" / "1.png")
+    assert edge.size == (300 - 256, 150 - 128)
+    assert (np.asarray(edge) == np.asarray(image)[128:, 256:]).all()
+
+def test_cli_writes_levels_and_tiles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    main(["Plaque.png", "--glyphs", "𓏙𓋹", "--size", "24", "--levels", "3", "--tiles", "xyz"])
+    sizes = [Image.open(name).size for name in ("plaque.png", "plaque_1.png", "plaque_2.png")]
+    assert sizes[1] == tuple(math.ceil(s / 2) for s in sizes[0])
+    assert sizes[2] == tuple(math.ceil(s / 2) for s in sizes[1])
+    assert os.listdir(tmp_path / "plaque_tiles") == ["0"]
@@ -0,0 +1,85 @@
+import os
+
+from inscription import render_inscription
+from render_cache import RenderCache, render_key
+from texture import DEFAULT_SEED
+
+def test_key_covers_every_pixel_changing_input():
+    base = render_key("𓏙𓋹")
+    assert render_key(["𓏙", "𓋹"]) == render_key(f"{ord('𓏙'):X} {ord('𓋹'):X}") == base
+    assert render_key("𓏙𓋹", seed=DEFAULT_SEED) == base
+    changed = [
+        render_key("𓋹𓏙"),
+        render_key("𓏙𓋹", "vertical"),
+        render_key("𓏙𓋹", size=64),
+        render_key("𓏙𓋹", padding=30),
+        render_key("𓏙𓋹", shen=True),
+        render_key("𓏙𓋹", seed=1),
+        render_key("𓏙𓋹", format="webp"),
+        render_key("𓏙𓋹", encoder="fastest"),
+        render_key("𓏙𓋹", base_color=(200, 180, 150)),
+        render_key("𓏙𓋹", light_angle=135),
+        render_key("𓏙𓋹", carve_depth=2),
+    ]
+    assert len({base, *changed}) == len(changed) + 1
+
+def test_ring_settings_only_count_with_the_ring():
+    assert render_key("𓏙", line_width=9) == render_key("𓏙")
+    assert render_key("𓏙", shen=True, line_width=9) != render_key("𓏙", shen=True)
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = RenderCache(max_memory_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"    # a is now the most recent
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.memory_bytes == 8
+    cache.put("huge", b"x" * 11)        # larger than the whole tier: not kept
+    assert cache.get("huge") is None and len(cache) == 2
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 2
+
+def test_disk_tier_evicts_and_survives_a_restart(tmp_path):
+    cache = RenderCache(tmp_path, max_memory_bytes=0, max_disk_bytes=12)
+    for key in ("aa", "bb", "cc"):
+        cache.put(key * 32, key.encode() * 2)
+    cache.get("aa" * 32)                # touch aa, so bb is the oldest
+    cache.put("dd" * 32, b"dddd")
+    assert cache.disk_bytes == 12
+    assert not os.path.exists(cache._path("bb" * 32))
+
+    reopened = RenderCache(tmp_path, max_disk_bytes=12)
+    assert reopened.stats()["disk_entries"] == 3
+    assert reopened.get("aa" * 32) == b"aaaa" and reopened.get("bb" * 32) is None
+    assert reopened.disk_hits == 1
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files if name.startswith(".tmp-")]
+
+def test_render_stores_and_reuses_bytes(tmp_path):
+    cache = RenderCache(tmp_path)
+    data = cache.render("𓏙𓋹", size=32, shen=True, seed=4)
+    assert data == render_inscription("𓏙𓋹", size=32, shen=True, seed=4, output="bytes")
+    cache.clear()
+    assert cache.render("𓏙𓋹", size=32, shen=True, seed=4) == data
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_a_file_removed_by_another_process_is_a_miss(tmp_path):
+    cache = RenderCache(tmp_path, max_memory_bytes=0)
+    cache.put("ab" * 32, b"data")
+    os.unlink(cache._path("ab" * 32))
+    assert cache.get("ab" * 32) is None
+    assert cache.disk_bytes == 0
+
+def disk_usage(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(directory) for name in files)
+
+def test_caches_sharing_a_directory_keep_to_the_cap_together(tmp_path):
+    first = RenderCache(tmp_path, max_memory_bytes=0, max_disk_bytes=12)
+    second = RenderCache(tmp_path, max_memory_bytes=0, max_disk_bytes=12)
+    for cache, key in ((first, "aa"), (first, "bb"), (second, "cc"), (second, "dd"), (first, "ee"), (second, "ff")):
+        cache.put(key * 32, key.encode() * 2)
+        assert disk_usage(tmp_path) <= 12
+        assert cache.disk_bytes == disk_usage(tmp_path)
+    # Each evicts the other's files before its own, oldest first
+    assert first.get("bb" * 32) == b"bbbb" and second.get("dd" * 32) == b"dddd"
+    assert second.get("ee" * 32) is None and first.get("cc" * 32) is None
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+import server
+from render_cache import RenderCache
+from server import HTTPError, RenderServer, parse_render_params
+
+GLYPH = "%F0%93%8F%99"   # 𓏙, URL-encoded
+
+@pytest.fixture
+def release(monkeypatch):
+    """Make renders block until the returned event is set."""
+    event = threading.Event()
+
+    def render_image(key, size):
+        event.wait(5)
+        return "".join(key[0]).encode()
+
+    monkeypatch.setattr(server, "render_image", render_image)
+    yield event
+    event.set()
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_identical_requests_share_one_render(release):
+    app = RenderServer(2, use_threads=True)
+
+    async def scenario():
+        requests = [app.handle("GET", f"/render?glyphs={GLYPH}", b"", client=f"10.0.0.{i}") for i in range(3)]
+        tasks = [asyncio.ensure_future(r) for r in requests]
+        await asyncio.sleep(0.05)
+        assert len(app.inflight) == 1
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    try:
+        results = run(scenario())
+    finally:
+        app.close()
+    assert results == [(200, "image/png", "𓏙".encode())] * 3
+    assert app.stats["renders"] == 1 and app.stats["coalesced"] == 2
+    assert not app.inflight
+
+def test_full_queue_answers_503(release):
+    app = RenderServer(1, max_pending=1, use_threads=True)
+
+    async def scenario():
+        first = asyncio.ensure_future(app.handle("GET", f"/render?glyphs={GLYPH}", b""))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPError) as e:
+            await app.handle("GET", "/render?glyphs=13000", b"")
+        release.set()
+        await first
+        return e.value.status
+
+    try:
+        assert run(scenario()) == 503
+    finally:
+        app.close()
+    assert app.stats["rejected"] == 1
+
+def test_busy_client_answers_429(release):
+    app = RenderServer(1, max_per_client=1, use_threads=True)
+
+    async def scenario():
+        first = asyncio.ensure_future(app.handle("GET", f"/render?glyphs={GLYPH}", b"", client="a"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPError) as e:
+            await app.handle("GET", f"/render?glyphs={GLYPH}", b"", client="a")
+        release.set()
+        await first
+        return e.value.status
+
+    try:
+        assert run(scenario()) == 429
+    finally:
+        app.close()
+    assert not app.clients
+
+@pytest.mark.parametrize("params, message", [
+    ({}, "Missing 'glyphs'"),
+    ({"glyphs": "abc"}, "Unexpected character 'a'"),
+    ({"glyphs": "𓏙" * (server.MAX_GLYPHS + 1)}, "At most"),
+    ({"glyphs": "𓏙", "direction": "diagonal"}, "'V' for vertical"),
+    ({"glyphs": "𓏙", "seed": "x"}, "'seed' must be a non-negative integer"),
+    ({"glyphs": "𓏙", "seed": -1}, "'seed' must be a non-negative integer"),
+    ({"glyphs": "𓏙", "seed": "-5"}, "'seed' must be a non-negative integer"),
+    ({"glyphs": "𓏙", "seed": True}, "'seed' must be a non-negative integer"),
+    ({"glyphs": "𓏙", "encoder": "avif"}, "'encoder' must be one of"),
+])
+def test_bad_parameters_answer_400(params, message):
+    with pytest.raises(HTTPError, match=message) as e:
+        parse_render_params(params)
+    assert e.value.status == 400
+
+def test_params_are_normalized():
+    assert parse_render_params({"glyphs": "13000 𓏙", "direction": "v", "shen": "yes", "seed": "7"}) == (
+        ("𓀀", "𓏙"), "vertical", True, 7, "default")
+
+async def exchange(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return data
+
+def test_http_statuses_and_disconnects(tmp_path):
+    app = RenderServer(1, use_threads=True, size=24, cache=RenderCache(tmp_path))
+
+    async def scenario():
+        listener = await app.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        get = f"GET /render?glyphs={GLYPH} HTTP/1.1\r\n\r\n".encode()
+        replies = [await exchange(port, get), await exchange(port, get)]
+        for raw in (b"NONSENSE\r\n\r\n",
+                    b"POST /render HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+                    b"POST /render HTTP/1.1\r\nContent-Length: 5\r\n\r\n[1,2]",
+                    b"POST /render HTTP/1.1\r\nContent-Length: 4\r\n\r\n{\"gl",
+                    b"DELETE /render HTTP/1.1\r\n\r\n",
+                    b"GET /nowhere HTTP/1.1\r\n\r\n"):
+            replies.append(await exchange(port, raw))
+        # A client that hangs up mid-body gets no reply and is not counted as an error
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /render HTTP/1.1\r\nContent-Length: 100\r\n\r\n{\"gl")
+        await writer.drain()
+        writer.close()
+        await asyncio.sleep(0.1)
+        health = await exchange(port, b"GET /health HTTP/1.1\r\n\r\n")
+        listener.close()
+        await listener.wait_closed()
+        return replies, health
+
+    try:
+        replies, health = run(scenario())
+    finally:
+        app.close()
+    statuses = [int(reply.split(b" ", 2)[1]) for reply in replies]
+    assert statuses == [200, 200, 400, 400, 400, 400, 405, 404]
+    assert replies[0].split(b"\r\n\r\n", 1)[1].startswith(b"\x89PNG")
+    assert replies[0].split(b"\r\n\r\n", 1)[1] == replies[1].split(b"\r\n\r\n", 1)[1]
+    stats = json.loads(health.split(b"\r\n\r\n", 1)[1])
+    assert stats["renders"] == 1 and stats["cached"] == 1 and stats["errors"] == 0
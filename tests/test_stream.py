@@ -0,0 +1,53 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import stream
+from inscription import render_inscription
+from stream import PNGStreamWriter, stream_inscription
+
+GLYPHS = "𓏙𓋹𓎃𓀀𓁐𓃀"
+
+def streamed(glyphs, **kwargs):
+    buffer = io.BytesIO()
+    W, H = stream_inscription(glyphs, buffer, **kwargs)
+    img = Image.open(io.BytesIO(buffer.getvalue()))
+    assert img.size == (W, H)
+    return np.asarray(img.convert("RGB"))
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+@pytest.mark.parametrize("band_rows", [7, None])
+def test_stream_matches_full_render(direction, shen, band_rows):
+    full = render_inscription(GLYPHS, direction, 48, shen=shen, seed=3, output="array")
+    assert (streamed(GLYPHS, direction=direction, size=48, shen=shen, seed=3, band_rows=band_rows) == full).all()
+
+def test_wide_bands_are_tiled_exactly(monkeypatch):
+    # A tiny pixel budget forces minimum-height bands split into column tiles
+    monkeypatch.setattr(stream, "BAND_PIXELS", 64 * 64)
+    full = render_inscription(GLYPHS * 3, size=48, shen=True, seed=3, output="array")
+    assert (streamed(GLYPHS * 3, size=48, shen=True, seed=3) == full).all()
+
+def test_writer_checks_the_row_count():
+    writer = PNGStreamWriter(io.BytesIO(), 4, 2)
+    writer.write_rows(np.zeros((1, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError, match="expects 2 rows, got 1"):
+        writer.close()
+    with pytest.raises(ValueError, match="More rows"):
+        writer.write_rows(np.zeros((2, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError, match="channels"):
+        PNGStreamWriter(io.BytesIO(), 4, 2, channels=2)
+
+@pytest.mark.parametrize("channels", [1, 3, 4])
+def test_writer_round_trips(channels):
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 256, size=(9, 13, channels), dtype=np.uint8)
+    buffer = io.BytesIO()
+    writer = PNGStreamWriter(buffer, 13, 9, channels)
+    writer.write_rows(pixels[:4])
+    writer.write_rows(pixels[4:])
+    writer.close()
+    decoded = np.asarray(Image.open(io.BytesIO(buffer.getvalue())))
+    assert (decoded.reshape(pixels.shape) == pixels).all()
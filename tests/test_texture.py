@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+import texture
+from texture import (BLUR_RADIUS, TILE_SIZE, grain_strip, lut_exact, sandstone_texture, sandstone_tile,
+                     tile_strip)
+
+STONE = (198, 158, 109)
+
+def test_tile_is_seamless():
+    tile = sandstone_tile(STONE, seed=3).astype(np.uint8)
+    th, tw = tile.shape[:2]
+    # Rebuild the unblurred tile and blur it inside a 3x3 mosaic of itself: a seamless tile is
+    # exactly the middle of that, so its right edge runs into its left and its bottom into its top
+    rng = np.random.default_rng(3)
+    noise = rng.integers(0, 15, (th, tw), dtype=np.uint8).astype(np.int16)
+    noise[:, ::40] -= 15 // 4
+    raw = np.clip(np.stack([noise + c for c in STONE], axis=-1), 0, 255).astype(np.uint8)
+    mosaic = Image.fromarray(np.tile(raw, (3, 3, 1)), mode="RGB")
+    blurred = np.asarray(mosaic.filter(ImageFilter.GaussianBlur(radius=BLUR_RADIUS)))
+    assert (blurred[th:2 * th, tw:2 * tw] == tile).all()
+
+    # Across the seams neighbouring pixels differ no more than inside the tile
+    inside = np.abs(np.diff(tile.astype(int), axis=1)).mean()
+    assert np.abs(tile[:, -1].astype(int) - tile[:, 0]).mean() < 1.5 * inside
+    inside = np.abs(np.diff(tile.astype(int), axis=0)).mean()
+    assert np.abs(tile[-1].astype(int) - tile[0]).mean() < 1.5 * inside
+
+def test_canvas_repeats_the_tile_across():
+    tw = TILE_SIZE[0]
+    canvas = sandstone_texture((2 * tw + 17, 90), STONE, seed=3)
+    assert (canvas[:, :tw] == canvas[:, tw:2 * tw]).all()
+    assert (canvas[:, :17] == canvas[:, 2 * tw:]).all()
+
+def test_same_seed_same_stone():
+    a = sandstone_texture((200, 120), STONE, seed=7)
+    assert (a == sandstone_texture((200, 120), STONE, seed=7)).all()
+    assert (a != sandstone_texture((200, 120), STONE, seed=8)).any()
+    assert (sandstone_texture((200, 120), STONE) == sandstone_texture((200, 120), STONE, seed=0)).all()
+
+def test_regions_and_out_match_the_full_texture():
+    full = sandstone_texture((500, 300), STONE, seed=2)
+    region = (130, 40, 470, 210)
+    assert (sandstone_texture((500, 300), STONE, seed=2, region=region) == full[40:210, 130:470]).all()
+    out = np.zeros((170, 340, 3), dtype=np.uint8)
+    sandstone_texture((500, 300), STONE, seed=2, region=region, out=out)
+    assert (out == full[40:210, 130:470]).all()
+
+def test_tall_canvases_shade_rows_on_request(monkeypatch):
+    cached = sandstone_texture((60, 300), STONE, seed=2, region=(0, 100, 60, 220))
+    monkeypatch.setattr(texture, "MAX_STRIP_ROWS", 50)
+    assert (sandstone_texture((60, 300), STONE, seed=2, region=(0, 100, 60, 220)) == cached).all()
+
+@pytest.mark.parametrize("color", [STONE, (60, 60, 64), (240, 230, 200)])
+def test_grain_strip_reproduces_any_exact_colour(color):
+    assert lut_exact(color)
+    expected = sandstone_texture((333, 80), color, seed=5)
+    offsets = tile_strip(grain_strip(80, seed=5)[..., None], 0, 333, out=np.empty((80, 333, 1), dtype=np.int16))
+    assert (np.clip(np.array(color) + offsets, 0, 255) == expected).all()
+    assert not lut_exact((250, 250, 250))
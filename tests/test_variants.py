@@ -0,0 +1,39 @@
+import pytest
+
+from height_map import render_height_mapped
+from inscription import render_inscription
+from variants import STONES, main, render_variants, stone_color
+
+GLYPHS = "𓏙𓋹𓎃"
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+def test_lookup_variants_match_full_renders(direction):
+    stones = ("sandstone", "granite", "limestone", (250, 250, 250))  # the last is too pale for the lookup
+    angles = (45, 135)
+    variants = render_variants(GLYPHS, stones, angles, direction, size=40, shen=True, seed=5, output="array")
+    assert set(variants) == {(stone, angle) for stone in stones for angle in angles}
+    for (stone, angle), canvas in variants.items():
+        full = render_inscription(GLYPHS, direction, 40, shen=True, seed=5, output="array",
+                                  base_color=stone_color(stone), light_angle=angle)
+        assert (canvas == full).all(), (stone, angle)
+
+def test_height_variants_match_full_renders():
+    variants = render_variants(GLYPHS, ("basalt", "red_granite"), (45, 300), size=40, seed=5, height=True,
+                               output="array")
+    for (stone, angle), canvas in variants.items():
+        full = render_height_mapped(GLYPHS, size=40, seed=5, output="array", base_color=STONES[stone],
+                                    light_angle=angle)
+        assert (canvas == full).all(), (stone, angle)
+
+def test_stone_colours_are_checked():
+    assert stone_color([1, 2, 3]) == (1, 2, 3)
+    with pytest.raises(ValueError, match="Unknown stone"):
+        stone_color("marble")
+    with pytest.raises(ValueError, match="0-255"):
+        stone_color((1, 2, 300))
+
+def test_shen_with_height_is_refused():
+    with pytest.raises(ValueError, match="shen"):
+        render_variants(GLYPHS, shen=True, height=True)
+    with pytest.raises(SystemExit):
+        main(["plaque.png", "--glyphs", GLYPHS, "--shen", "--height"])
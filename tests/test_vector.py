@@ -0,0 +1,55 @@
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+pytest.importorskip("fontTools")
+
+from inscription import plan_inscription
+from vector import VectorPlan, main, render_vector
+
+SVG = "{http://www.w3.org/2000/svg}"
+GLYPHS = "𓏙𓋹𓎃"
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+def test_plan_matches_the_raster_layout(direction, shen):
+    vector_plan = VectorPlan(GLYPHS, direction, 40, shen=shen)
+    raster_plan = plan_inscription(GLYPHS, direction, 40, shen=shen)
+    assert (vector_plan.W, vector_plan.H) == (raster_plan.W, raster_plan.H)
+    assert vector_plan.placements == raster_plan.placements
+    assert set(vector_plan.outlines) == set(GLYPHS)
+    assert (vector_plan.ring is not None) == shen
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+@pytest.mark.parametrize("texture", [False, True])
+def test_svg_output(direction, shen, texture):
+    plan = plan_inscription(GLYPHS, direction, 40, shen=shen)
+    root = ET.fromstring(render_vector(GLYPHS, direction, 40, shen=shen, texture=texture))
+    assert (root.get("width"), root.get("height")) == (str(plan.W), str(plan.H))
+    carve = root.find(f"{SVG}defs/{SVG}g[@id='carve']")
+    assert len(carve.findall(f"{SVG}use")) == len(GLYPHS)
+    assert len(carve.findall(f"{SVG}path")) == (1 if shen else 0)
+    assert len(root.findall(f"{SVG}use")) == 3   # shadow, highlight and fill layers
+    assert (root.find(f"{SVG}defs/{SVG}pattern") is not None) == texture
+
+@pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+@pytest.mark.parametrize("shen", [False, True])
+def test_pdf_output(direction, shen):
+    plan = plan_inscription(GLYPHS, direction, 40, shen=shen)
+    data = render_vector(GLYPHS, direction, 40, shen=shen, format="pdf")
+    assert data.startswith(b"%PDF-1.4") and data.rstrip().endswith(b"%%EOF")
+    assert re.findall(rb"/MediaBox \[([^\]]*)\]", data) == [f"0 0 {plan.W} {plan.H}".encode()]
+    # The cross-reference offset points at the xref table
+    start = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    assert data[start:start + 4] == b"xref"
+
+def test_cli_and_bad_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    main(["Banner.svg", "--glyphs", GLYPHS, "--shen", "--size", "40"])
+    assert ET.parse(tmp_path / "banner.svg").getroot().tag == f"{SVG}svg"
+    with pytest.raises(SystemExit):
+        main(["banner.png", "--glyphs", GLYPHS])
+    with pytest.raises(ValueError, match="format must be one of"):
+        render_vector(GLYPHS, format="eps")
@@ -0,0 +1,114 @@
+"""Seeded, tileable sandstone texture.
+
+The grain, tool marks and blur are generated once per (base_color,
+grain_intensity, tool_mark_freq, seed) as a seamless tile. The vertical
+shading is baked into a cached strip per canvas height, so building a
+canvas is just copying that strip across, block by block.
+"""
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# --- Parameters ---
+TILE_SIZE = (320, 256)  # (W, H); W is rounded up to a multiple of tool_mark_freq
+BLUR_RADIUS = 0.7
+DEFAULT_SEED = 0
+MAX_STRIP_ROWS = 4096   # taller canvases are shaded per request instead of cached
+
+# --- Functions ---
+
+@lru_cache(maxsize=32)
+def sandstone_tile(base_color=(198, 158, 109), grain_intensity=15, tool_mark_freq=40, seed=DEFAULT_SEED,
+                   tile_size=TILE_SIZE):
+    """Return a seamless (TH, TW, 3) int16 grain tile, without the vertical shading."""
+    tw, th = tile_size
+    tw = -(-tw // tool_mark_freq) * tool_mark_freq  # keep tool marks periodic across tiles
+    rng = np.random.default_rng(seed)
+
+    noise = rng.integers(0, grain_intensity, (th, tw), dtype=np.uint8).astype(np.int16)
+    noise[:, ::tool_mark_freq] -= grain_intensity // 4
+
+    texture = np.stack([noise + c for c in base_color], axis=-1)
+    texture = np.clip(texture, 0, 255).astype(np.uint8)
+
+    # Blur with wrap-around padding so opposite edges still meet seamlessly
+    pad = int(np.ceil(BLUR_RADIUS * 3)) + 1
+    padded = np.pad(texture, ((pad, pad), (pad, pad), (0, 0)), mode="wrap")
+    blurred = Image.fromarray(padded, mode="RGB").filter(ImageFilter.GaussianBlur(radius=BLUR_RADIUS))
+    tile = np.asarray(blurred)[pad:-pad, pad:-pad].astype(np.int16)
+    tile.setflags(write=False)
+    return tile
+
+def shaded_rows(height, y0, y1, base_color=(198, 158, 109), grain_intensity=15, tool_mark_freq=40,
+                seed=DEFAULT_SEED, tile_size=TILE_SIZE):
+    """Return rows [y0, y1) of the (height, TW, 3) strip with the vertical shading applied."""
+    tile = sandstone_tile(base_color, grain_intensity, tool_mark_freq, seed, tile_size)
+    rows = tile[np.arange(y0, y1) % tile.shape[0]]
+
+    # Rows y0..y1 of np.linspace(lo, hi, height), without building the whole ramp
+    lo, hi = -grain_intensity//2, grain_intensity//2
+    y_gradient = np.arange(y0, y1) * ((hi - lo) / max(height - 1, 1)) + lo
+    if y1 == height > 1:
+        y_gradient[-1] = hi
+    y_gradient = y_gradient.astype(np.int16)
+    return np.clip(rows + y_gradient[:, None, None], 0, 255).astype(np.uint8)
+
+@lru_cache(maxsize=16)
+def sandstone_strip(height, base_color=(198, 158, 109), grain_intensity=15, tool_mark_freq=40, seed=DEFAULT_SEED,
+                    tile_size=TILE_SIZE):
+    """Return a (height, TW, 3) uint8 strip with the vertical shading for that canvas height."""
+    strip = shaded_rows(height, 0, height, base_color, grain_intensity, tool_mark_freq, seed, tile_size)
+    strip.setflags(write=False)
+    return strip
+
+def sandstone_texture(size, base_color=(198, 158, 109), grain_intensity=15, tool_mark_freq=40, seed=None,
+                      region=None, out=None):
+    """Return the (H, W, 3) uint8 sandstone for a canvas of `size`.
+
+    region=(x0, y0, x1, y1) returns just that window of the canvas, identical
+    to slicing the full texture, so bands and tiles line up seamlessly. out may
+    be a preallocated array of the region's shape to fill in place.
+    """
+    W, H = size
+    seed = DEFAULT_SEED if seed is None else seed
+    x0, y0, x1, y1 = region if region is not None else (0, 0, W, H)
+    if H <= MAX_STRIP_ROWS:
+        strip = sandstone_strip(H, tuple(base_color), grain_intensity, tool_mark_freq, seed)[y0:y1]
+    else:
+        # Very tall canvases (long vertical friezes) shade just the requested rows
+        strip = shaded_rows(H, y0, y1, tuple(base_color), grain_intensity, tool_mark_freq, seed)
+    return tile_strip(strip, x0, x1, out)
+
+def tile_strip(strip, x0, x1, out=None):
+    """Repeat a (h, TW, C) strip across columns [x0, x1) of the canvas, block by block."""
+    tw = strip.shape[1]
+    if out is None:
+        out = np.empty((strip.shape[0], x1 - x0, strip.shape[2]), dtype=np.uint8)
+    x = x0
+    while x < x1:
+        offset = x % tw
+        n = min(tw - offset, x1 - x)
+        out[:, x - x0:x - x0 + n] = strip[:, offset:offset + n]
+        x += n
+    return out
+
+def grain_strip(height, grain_intensity=15, tool_mark_freq=40, seed=None):
+    """Return the (height, TW) int16 grain and shading that sandstone_texture adds to the base colour.
+
+    Grain, tool marks, blur and shading are the same for every channel and
+    colour, so for any base colour within lut_exact's range the texture is
+    clip(colour + offsets), repeated across the canvas with tile_strip: a new
+    stone colour is a lookup table away.
+    """
+    seed = DEFAULT_SEED if seed is None else seed
+    neutral = (128, 128, 128)
+    if height <= MAX_STRIP_ROWS:
+        strip = sandstone_strip(height, neutral, grain_intensity, tool_mark_freq, seed)
+    else:
+        strip = shaded_rows(height, 0, height, neutral, grain_intensity, tool_mark_freq, seed)
+    return strip[..., 0].astype(np.int16) - 128
+
+def lut_exact(base_color, grain_intensity=15) -> bool:
+    """Whether grain_strip reproduces this colour exactly (no channel clipped before the blur)."""
+    return all(grain_intensity // 4 <= c <= 256 - grain_intensity for c in base_color)
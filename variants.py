@@ -0,0 +1,167 @@
+"""Colour and lighting variants of one inscription from shared layers.
+
+    python variants.py plaque.png --glyphs "𓏙𓋹𓎃" --shen --stones sandstone granite limestone --angles 45 135
+
+The layout, glyph coverage, stone grain and carve weights are computed once.
+Each stone colour is then a per-channel lookup table over the grain (the
+grain and shading are the same offsets for every colour), and each light
+angle only re-weights the shared coverage, or re-lights the shared height
+map with --height. Every variant matches a full render with that
+base_color and light_angle pixel for pixel; colours too close to black or
+white for the lookup are rendered in full instead.
+"""
+import argparse
+
+import numpy as np
+from PIL import Image
+
+from carving import LIGHT_ANGLE, apply_carve_layer, carve_weights, paint_weights
+from encoding import encode_image
+from glyph_input import PROFILE_SUFFIXES, output_filename, split_image_name
+from height_map import LIGHT_ELEVATION, height_map, render_height_mapped, shade_from_height
+from inscription import (BG, PADDING, SIZE, carve_colors, parse_glyph_input, plan_inscription, region_coverage,
+                         render_inscription)
+from profiling import stage
+from texture import grain_strip, lut_exact, tile_strip
+
+# --- Parameters ---
+STONES = {
+    "sandstone": BG,
+    "granite": (118, 114, 112),
+    "limestone": (214, 204, 178),
+    "basalt": (72, 70, 68),
+    "red_granite": (164, 96, 82),
+}
+
+def stone_color(stone) -> tuple:
+    """An RGB tuple for a stone name from STONES, or an RGB triple as given."""
+    if isinstance(stone, str):
+        if stone not in STONES:
+            raise ValueError(f"Unknown stone '{stone}', expected one of {', '.join(STONES)} or an RGB triple.")
+        return STONES[stone]
+    color = tuple(int(c) for c in stone)
+    if len(color) != 3 or not all(0 <= c <= 255 for c in color):
+        raise ValueError(f"Stone colour must be three 0-255 values, got {stone!r}.")
+    return color
+
+# --- Lookup tables ---
+
+class StoneLUT:
+    """The stone grain strip as small indexes, recoloured by one lookup per colour."""
+
+    def __init__(self, plan):
+        offsets = grain_strip(plan.H, seed=plan.seed)
+        self.W = plan.W
+        self.index = (offsets - offsets.min()).astype(np.uint8)  # the grain spans a few dozen levels
+        self.levels = np.arange(offsets.min(), offsets.max() + 1, dtype=np.int16)
+
+    def table(self, base_color):
+        """(levels, 3) uint8 table: the stone colour at each grain level."""
+        return np.clip(self.levels[:, None] + np.array(base_color, dtype=np.int16), 0, 255).astype(np.uint8)
+
+    def stone(self, base_color):
+        """The (H, W, 3) sandstone_texture of this colour."""
+        return tile_strip(np.take(self.table(base_color), self.index, axis=0), 0, self.W)
+
+# --- Variants ---
+
+def render_variants(glyphs, stones=("sandstone",), light_angles=(LIGHT_ANGLE,), direction="horizontal", size=SIZE,
+                    padding=PADDING, shen=False, seed=None, height=False, elevation=LIGHT_ELEVATION,
+                    output="image") -> dict:
+    """Render every (stone, light angle) pair. Returns {(stone, light_angle): image or array}.
+
+    stones are names from STONES or RGB triples. height=True lights a V-cut
+    height map as render_height_mapped does, which draws no shen ring.
+    """
+    if output not in ("image", "array"):
+        raise ValueError("output must be 'image' or 'array'")
+    if shen and height:
+        raise ValueError("The height-map carving has no shen ring; use shen or height, not both.")
+    if isinstance(glyphs, str):
+        glyphs = parse_glyph_input(glyphs)
+    plan = plan_inscription(glyphs, direction, size, padding, shen, seed)
+    colors = {stone: stone_color(stone) for stone in stones}
+    lut = StoneLUT(plan)
+
+    # Layers shared by every variant
+    if height:
+        with stage("height_map"):
+            surface = height_map(plan)
+    else:
+        with stage("coverage"):
+            coverage = region_coverage(plan, (0, 0, plan.W, plan.H))
+
+    results = {}
+    for angle in light_angles:
+        with stage("lighting"):
+            if height:
+                light = shade_from_height(surface, angle, elevation)[..., None]
+            else:
+                touched, keep, weights = carve_weights(coverage, angle, plan.carve_depth)
+        for stone, color in colors.items():
+            if not lut_exact(color):
+                # The grain clips on this colour, so the lookup would drift: render it in full
+                if height:
+                    canvas = render_height_mapped(glyphs, direction, size, padding, seed, "array", base_color=color,
+                                                  light_angle=angle, elevation=elevation)
+                else:
+                    canvas = render_inscription(glyphs, direction, size, padding, shen, seed, "array",
+                                                base_color=color, light_angle=angle)
+            else:
+                with stage("lut"):
+                    canvas = lut.stone(color)
+                with stage("carve"):
+                    if height:
+                        canvas = np.clip(canvas * light + 0.5, 0, 255).astype(np.uint8)
+                    else:
+                        shadow, highlight, _ = carve_colors(color)
+                        apply_carve_layer(canvas, (touched, keep, paint_weights(weights, shadow, highlight, color)))
+            results[stone, angle] = canvas if output == "array" else Image.fromarray(canvas, mode="RGB")
+    return results
+
+def variant_filename(file_name, stone, angle) -> str:
+    base, suffix = split_image_name(file_name)
+    name = stone if isinstance(stone, str) else "-".join(str(c) for c in stone)
+    return f"{base}_{name}_{angle:g}{suffix}"
+
+# --- Entry point ---
+
+def parse_stone(value):
+    """A --stones entry: a name from STONES, or R,G,B."""
+    try:
+        if "," in value:
+            return stone_color(value.split(","))
+        stone_color(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+    return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render one inscription in several stones and light angles.")
+    parser.add_argument("output", help="base file name; each variant adds _<stone>_<angle>")
+    parser.add_argument("--glyphs", required=True, help="glyphs or Unicode hex, as at the prompt")
+    parser.add_argument("--direction", default="H", choices=("H", "V"), help="horizontal or vertical")
+    parser.add_argument("--shen", action="store_true", help="draw the shen ring")
+    parser.add_argument("--size", type=int, default=SIZE, help="glyph height in pixels")
+    parser.add_argument("--seed", type=int, help="stone texture seed")
+    parser.add_argument("--stones", nargs="+", type=parse_stone, default=["sandstone"],
+                        help=f"stone names ({', '.join(STONES)}) or R,G,B colours")
+    parser.add_argument("--angles", nargs="+", type=float, default=[LIGHT_ANGLE], help="light angles in degrees")
+    parser.add_argument("--height", action="store_true", help="V-cut carving lit from the height map (no shen ring)")
+    parser.add_argument("--encoder", choices=tuple(PROFILE_SUFFIXES),
+                        help="encoder profile (default: from the file suffix)")
+    args = parser.parse_args(argv)
+    if args.shen and args.height:
+        parser.error("--shen and --height can't be combined: the height-map carving has no shen ring")
+
+    output_file, encoder = output_filename(args.output, args.encoder)
+    direction = "vertical" if args.direction == "V" else "horizontal"
+    variants = render_variants(parse_glyph_input(args.glyphs), args.stones, args.angles, direction, args.size,
+                               shen=args.shen, seed=args.seed, height=args.height)
+    for (stone, angle), img in variants.items():
+        name = variant_filename(output_file, stone, angle)
+        encode_image(img, name, encoder)
+        print(f"Image saved as {name}")
+
+if __name__ == "__main__":
+    main()
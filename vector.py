@@ -0,0 +1,359 @@
+"""Vector (SVG and PDF) output for stencils and large-format prints.
+
+    python vector.py banner.svg --glyphs "𓏙𓋹𓎃" --shen --size 2000
+    python vector.py stencil.pdf --glyphs "𓏙𓋹𓎃" --shen --texture
+
+Glyph outlines come straight from the bundled font (through fontTools, an
+optional dependency only this module needs), the shen ring from the same
+geometry the rasterizer uses, and the carving is the raster's three layers:
+the outlines shifted away from the light in the shadow colour, towards it in
+the highlight colour, and in place in the stone colour. Nothing is
+rasterized, so file size and render time follow the glyph count, not the
+pixel area. --texture fills the stone with the small seamless grain tile as
+a repeating pattern instead of a flat colour.
+"""
+import argparse
+import base64
+import io
+import math
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from cartouche import shen_geometry
+from carving import CARVE_DEPTH, LIGHT_ANGLE, carve_offsets
+from corpus import read_glyph_file
+from glyph_input import is_valid_filename, parse_glyph_input
+from inscription import (BG, EXTRA_PADDING, FONT_PATH, LINE_WIDTH, PADDING, SIZE, carve_colors, layout_glyphs,
+                         load_font)
+from profiling import count, stage
+from texture import DEFAULT_SEED, sandstone_tile
+
+# --- Parameters ---
+FORMATS = {".svg": "svg", ".pdf": "pdf"}
+KAPPA = 0.5522847498   # control-point distance of a cubic quarter circle, as a fraction of the radius
+
+_outline_fonts = {}
+
+# --- Outlines ---
+
+def load_outline_font(font_path=FONT_PATH):
+    """Return (glyph set, cmap, units per em) for the font, loading it once per path."""
+    entry = _outline_fonts.get(font_path)
+    if entry is None:
+        try:
+            from fontTools.ttLib import TTFont
+        except ImportError as e:
+            raise ImportError("Vector output needs fontTools for the glyph outlines: pip install fonttools") from e
+        with stage("font_load"):
+            font = TTFont(font_path)
+            entry = _outline_fonts[font_path] = (font.getGlyphSet(), font.getBestCmap(), font["head"].unitsPerEm)
+    return entry
+
+@lru_cache(maxsize=1)
+def _pen_class():
+    from fontTools.pens.basePen import BasePen
+
+    class PathPen(BasePen):
+        """Records an outline as M/L/C/Z path commands; quadratic curves are converted to cubics."""
+
+        def __init__(self, glyph_set):
+            super().__init__(glyph_set)
+            self.commands = []
+
+        def _moveTo(self, pt):
+            self.commands.append(("M", pt))
+
+        def _lineTo(self, pt):
+            self.commands.append(("L", pt))
+
+        def _curveToOne(self, pt1, pt2, pt3):
+            self.commands.append(("C", pt1, pt2, pt3))
+
+        def _closePath(self):
+            self.commands.append(("Z",))
+
+    return PathPen
+
+def glyph_outline(glyph, size, font_path=FONT_PATH) -> list:
+    """Return a glyph's outline as path commands in pixels, relative to its draw.text origin (y down)."""
+    glyph_set, cmap, units_per_em = load_outline_font(font_path)
+    from fontTools.pens.transformPen import TransformPen
+
+    name = cmap.get(ord(glyph))
+    if name is None:
+        raise ValueError(f"The font has no glyph for {glyph!r} (U+{ord(glyph):X})")
+    scale = size / units_per_em
+    ascent = load_font(size, font_path).getmetrics()[0]  # draw.text puts the ascender line at y
+
+    pen = _pen_class()(glyph_set)
+    glyph_set[name].draw(TransformPen(pen, (scale, 0, 0, -scale, 0, ascent)))
+    return pen.commands
+
+def rounded_rect(x0, y0, x1, y1, radius, reverse=False) -> list:
+    """Path commands for a rounded rectangle, clockwise on screen (counter-clockwise with reverse)."""
+    k = radius * (1 - KAPPA)
+    r = radius
+    commands = [("M", (x0 + r, y0)), ("L", (x1 - r, y0)), ("C", (x1 - k, y0), (x1, y0 + k), (x1, y0 + r)),
+                ("L", (x1, y1 - r)), ("C", (x1, y1 - k), (x1 - k, y1), (x1 - r, y1)),
+                ("L", (x0 + r, y1)), ("C", (x0 + k, y1), (x0, y1 - k), (x0, y1 - r)),
+                ("L", (x0, y0 + r)), ("C", (x0, y0 + k), (x0 + k, y0), (x0 + r, y0)), ("Z",)]
+    return reverse_path(commands) if reverse else commands
+
+def reverse_path(commands) -> list:
+    """The same closed path walked backwards, so it winds the other way."""
+    # Each segment ends where the previous one started
+    points = [c[-1] for c in commands[:-1]]
+    reversed_commands = [("M", points[-1])]
+    for i in range(len(commands) - 2, 0, -1):
+        kind = commands[i][0]
+        start = points[i - 1]
+        reversed_commands.append(("C", commands[i][2], commands[i][1], start) if kind == "C" else ("L", start))
+    return reversed_commands + [("Z",)]
+
+def arc_to(cx, cy, r, a0, a1):
+    """A cubic along the circle (cx, cy, r) from angle a0 to a1, in radians, at most a quarter turn."""
+    k = 4 / 3 * math.tan((a1 - a0) / 4) * r
+    x0, y0 = cx + r * math.cos(a0), cy + r * math.sin(a0)
+    x3, y3 = cx + r * math.cos(a1), cy + r * math.sin(a1)
+    return ("C", (x0 - k * math.sin(a0), y0 + k * math.cos(a0)), (x3 + k * math.sin(a1), y3 - k * math.cos(a1)),
+            (x3, y3))
+
+def strip_outline(x0, x1, rect) -> list:
+    """Path commands for the columns [x0, x1] of a rounded rect=(x0, y0, x1, y1, radius), clockwise on screen."""
+    rx0, ry0, rx1, ry1, r = rect
+    x0, x1 = max(x0, rx0), min(x1, rx1)
+
+    def corner(x):
+        """Centre x of the corner arc over column x, or None where the edge is straight."""
+        if x < rx0 + r:
+            return rx0 + r
+        if x > rx1 - r:
+            return rx1 - r
+        return None
+
+    def edge(xs, cy, sign):
+        # Along the top (sign -1) or bottom (sign +1) edge through xs, an arc per corner it crosses
+        commands = []
+        for a, b in zip(xs, xs[1:]):
+            cx = corner((a + b) / 2)
+            if cx is None:
+                commands.append(("L", (b, cy + sign * r)))
+            else:
+                angle = [math.atan2(sign * math.sqrt(max(r * r - (x - cx) ** 2, 0)), x - cx) for x in (a, b)]
+                commands.append(arc_to(cx, cy, r, *angle))
+        return commands
+
+    def y(x, cy, sign):
+        cx = corner(x)
+        return cy + sign * (r if cx is None else math.sqrt(max(r * r - (x - cx) ** 2, 0)))
+
+    xs = sorted({x0, x1, *(x for x in (rx0 + r, rx1 - r) if x0 < x < x1)})
+    top, bottom = ry0 + r, ry1 - r
+    return ([("M", (x0, y(x0, top, -1)))] + edge(xs, top, -1) + [("L", (x1, y(x1, bottom, 1)))]
+            + edge(xs[::-1], bottom, 1) + [("Z",)])
+
+def shen_outline(direction, W, H, line_width, padding) -> list:
+    """Path commands for the shen ring and crossbar, to be filled with the nonzero rule."""
+    geometry = shen_geometry(direction, W, H, line_width, padding)
+    outer = geometry["outer"]
+    x0, y0, x1, y1 = geometry["bar"]
+    if direction == "horizontal":
+        bar = strip_outline(x0, x1, outer)
+    else:
+        # A row strip is a column strip of the transposed rect; swapping back flips the winding
+        ox0, oy0, ox1, oy1, r = outer
+        transposed = strip_outline(y0, y1, (oy0, ox0, oy1, ox1, r))
+        bar = reverse_path([(c[0], *[(py, px) for px, py in c[1:]]) for c in transposed])
+    # The hole winds the other way, so nonzero filling leaves it open; the bar winds with the ring
+    return rounded_rect(*outer) + rounded_rect(*geometry["inner"], reverse=True) + bar
+
+# --- Layout ---
+
+class VectorPlan:
+    """The pieces of a vector inscription: canvas size, glyph outlines and where each one goes."""
+
+    def __init__(self, glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                 base_color=BG, line_width=LINE_WIDTH, extra_padding=EXTRA_PADDING, font_path=FONT_PATH,
+                 light_angle=LIGHT_ANGLE, carve_depth=CARVE_DEPTH):
+        if isinstance(glyphs, str):
+            glyphs = parse_glyph_input(glyphs)
+        font = load_font(size, font_path)
+        with stage("layout"):
+            # Same boxes and layout as the raster path, without rasterizing anything
+            self.W, self.H, self.placements = layout_glyphs(glyphs, [font.getbbox(g) for g in glyphs], direction,
+                                                            padding, extra_padding if shen else 0)
+        count("glyphs", len(glyphs))
+        with stage("outlines"):
+            self.outlines = {g: glyph_outline(g, size, font_path) for g in dict.fromkeys(glyphs)}
+            self.ring = shen_outline(direction, self.W, self.H, line_width, padding) if shen else None
+        self.base_color = tuple(base_color)
+        self.seed = DEFAULT_SEED if seed is None else seed
+        self.offset = carve_offsets(light_angle, carve_depth)
+
+    def layers(self):
+        """(dx, dy, colour) of the shadow, highlight and fill layers, in painting order."""
+        shadow, highlight, _ = carve_colors(self.base_color)
+        dx, dy = self.offset
+        return [(-dx, -dy, shadow), (dx, dy, highlight), (0, 0, self.base_color)]
+
+def texture_tile(plan) -> Image.Image:
+    """The seamless grain tile (without the canvas-height shading) as an RGB image."""
+    tile = sandstone_tile(plan.base_color, seed=plan.seed)
+    return Image.fromarray(np.clip(tile, 0, 255).astype(np.uint8), mode="RGB")
+
+def _num(v):
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+# --- SVG ---
+
+def svg_path(commands) -> str:
+    return " ".join(c[0] + " ".join(f"{_num(x)} {_num(y)}" for x, y in c[1:]) for c in commands)
+
+def render_svg(plan, texture=False) -> bytes:
+    """Write the plan as an SVG document."""
+    def rgb(color):
+        return "#%02x%02x%02x" % tuple(color)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+             f'width="{plan.W}" height="{plan.H}" viewBox="0 0 {plan.W} {plan.H}">', "<defs>"]
+    for i, commands in enumerate(plan.outlines.values()):
+        parts.append(f'<path id="g{i}" d="{svg_path(commands)}"/>')
+
+    # Everything carved, once; the three layers reuse it
+    ids = {g: f"g{i}" for i, g in enumerate(plan.outlines)}
+    parts.append('<g id="carve">')
+    parts += [f'<use xlink:href="#{ids[g]}" x="{x}" y="{y}"/>' for g, x, y, _ in plan.placements]
+    if plan.ring is not None:
+        parts.append(f'<path d="{svg_path(plan.ring)}"/>')
+    parts.append("</g>")
+
+    stone = rgb(plan.base_color)
+    if texture:
+        tile = texture_tile(plan)
+        buffer = io.BytesIO()
+        tile.save(buffer, format="PNG")
+        data = base64.b64encode(buffer.getvalue()).decode("ascii")
+        parts.append(f'<pattern id="stone" patternUnits="userSpaceOnUse" width="{tile.width}" '
+                     f'height="{tile.height}"><image width="{tile.width}" height="{tile.height}" '
+                     f'xlink:href="data:image/png;base64,{data}"/></pattern>')
+        stone = "url(#stone)"
+    parts.append("</defs>")
+
+    parts.append(f'<rect width="{plan.W}" height="{plan.H}" fill="{stone}"/>')
+    for dx, dy, color in plan.layers():
+        parts.append(f'<use xlink:href="#carve" transform="translate({dx} {dy})" fill="{rgb(color)}"/>')
+    parts.append("</svg>\n")
+    return "\n".join(parts).encode("utf-8")
+
+# --- PDF ---
+
+def pdf_path(commands) -> str:
+    ops = {"M": "m", "L": "l", "C": "c", "Z": "h"}
+    return "\n".join(" ".join(f"{_num(x)} {_num(y)}" for x, y in c[1:]) + (" " if len(c) > 1 else "") + ops[c[0]]
+                     for c in commands)
+
+def render_pdf(plan, texture=False) -> bytes:
+    """Write the plan as a one-page PDF, one point per pixel."""
+    objects = []
+
+    def add(dictionary, stream=None):
+        """Append an object (a stream when stream is given) and return its number."""
+        if stream is not None:
+            stream = zlib.compress(stream)
+            dictionary = f"<< {dictionary} /Length {len(stream)} /Filter /FlateDecode >>"
+            objects.append(dictionary.encode("latin-1") + b"\nstream\n" + stream + b"\nendstream")
+        else:
+            objects.append(dictionary.encode("latin-1"))
+        return len(objects)
+
+    def rgb(color):
+        return " ".join(_num(c / 255) for c in color)
+
+    # The carved shapes once, as a form each layer paints in its own colour
+    paths = {g: pdf_path(commands) for g, commands in plan.outlines.items()}
+    carve = [f"q 1 0 0 1 {x} {y} cm\n{paths[g]}\nf Q" for g, x, y, _ in plan.placements]
+    if plan.ring is not None:
+        carve.append(pdf_path(plan.ring) + "\nf")
+    carve_form = add(f"/Type /XObject /Subtype /Form /BBox [-16 -16 {plan.W + 16} {plan.H + 16}]",
+                     "\n".join(carve).encode("latin-1"))
+
+    resources = f"/XObject << /Carve {carve_form} 0 R >>"
+    if texture:
+        tile = texture_tile(plan)
+        image = add(f"/Type /XObject /Subtype /Image /Width {tile.width} /Height {tile.height} "
+                    "/ColorSpace /DeviceRGB /BitsPerComponent 8", tile.tobytes())
+        pattern = add(f"/Type /Pattern /PatternType 1 /PaintType 1 /TilingType 1 "
+                      f"/BBox [0 0 {tile.width} {tile.height}] /XStep {tile.width} /YStep {tile.height} "
+                      f"/Resources << /XObject << /Tile {image} 0 R >> >>",
+                      f"q {tile.width} 0 0 {tile.height} 0 0 cm /Tile Do Q".encode("latin-1"))
+        resources += f" /Pattern << /Stone {pattern} 0 R >>"
+        stone = "/Pattern cs /Stone scn"
+    else:
+        stone = f"{rgb(plan.base_color)} rg"
+
+    # Flip to image coordinates (y down) so every path uses canvas pixels
+    content = [f"1 0 0 -1 0 {plan.H} cm", f"{stone} 0 0 {plan.W} {plan.H} re f"]
+    for dx, dy, color in plan.layers():
+        content.append(f"q {rgb(color)} rg 1 0 0 1 {dx} {dy} cm /Carve Do Q")
+    contents = add("", "\n".join(content).encode("latin-1"))
+    page = add(f"<< /Type /Page /Parent {len(objects) + 2} 0 R /MediaBox [0 0 {plan.W} {plan.H}] "
+               f"/Resources << {resources} >> /Contents {contents} 0 R >>")
+    pages = add(f"<< /Type /Pages /Kids [{page} 0 R] /Count 1 >>")
+    catalog = add(f"<< /Type /Catalog /Pages {pages} 0 R >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+# --- Entry points ---
+
+def render_vector(glyphs, direction="horizontal", size=SIZE, padding=PADDING, shen=False, seed=None,
+                  format="svg", texture=False, base_color=BG, font_path=FONT_PATH) -> bytes:
+    """Render an inscription as SVG or PDF bytes."""
+    if format not in FORMATS.values():
+        raise ValueError(f"format must be one of {', '.join(FORMATS.values())}")
+    plan = VectorPlan(glyphs, direction, size, padding, shen, seed, base_color, font_path=font_path)
+    with stage("encode"):
+        return render_svg(plan, texture) if format == "svg" else render_pdf(plan, texture)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render an inscription as SVG or PDF.")
+    parser.add_argument("output", help="file name (.svg or .pdf)")
+    parser.add_argument("--glyphs", required=True, help="glyphs or Unicode hex, as at the prompt")
+    parser.add_argument("--glyph-file", action="store_true", help="treat --glyphs as a text file (glyphs, hex or MdC codes, see corpus.py)")
+    parser.add_argument("--direction", default="H", choices=("H", "V"), help="horizontal or vertical")
+    parser.add_argument("--shen", action="store_true", help="draw the shen ring")
+    parser.add_argument("--size", type=int, default=SIZE, help="glyph height in output units (px or pt)")
+    parser.add_argument("--seed", type=int, help="stone texture seed")
+    parser.add_argument("--texture", action="store_true", help="fill the stone with the grain pattern")
+    args = parser.parse_args(argv)
+
+    name = args.output.strip().lower()
+    suffix = next((s for s in FORMATS if name.endswith(s)), None)
+    if suffix is None:
+        parser.error("output must end in .svg or .pdf")
+    valid, msg = is_valid_filename(name.removesuffix(suffix))
+    if not valid:
+        parser.error(f"Invalid file name: {msg}")
+
+    glyphs = read_glyph_file(args.glyphs) if args.glyph_file else parse_glyph_input(args.glyphs)
+    direction = "vertical" if args.direction == "V" else "horizontal"
+    data = render_vector(glyphs, direction, args.size, shen=args.shen, seed=args.seed,
+                         format=FORMATS[suffix], texture=args.texture)
+    with open(name, "wb") as f:
+        f.write(data)
+    print(f"Saved {name} ({len(data)} bytes)")
+
+if __name__ == "__main__":
+    main()